@@ -0,0 +1,95 @@
+"""
+Benchmark: GeoDataFrame construction, legacy per-stop loops vs railnet.geometry.
+
+    python benchmarks/bench_geometry.py [--scales 1 10 100]
+
+Each scale replicates the real routes (all five services) with jittered
+coordinates and renamed stations, so both the route and station counts grow.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import geopandas as gpd  # noqa: E402
+from shapely.geometry import LineString, Point  # noqa: E402
+
+from railnet.geometry import build_geodataframes  # noqa: E402
+from railnet.loader import RouteData, load_services  # noqa: E402
+from railnet.network import Network  # noqa: E402
+
+
+def replicate(data, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    parts = []
+    for k in range(scale):
+        jitter = rng.normal(0, 0.05, size=(data.n_stops, 2)) if k else np.zeros((data.n_stops, 2))
+        parts.append(RouteData(**{
+            **vars(data),
+            "name": np.char.add(data.name, f" #{k}"),
+            "stop_name": np.char.add(data.stop_name, f" #{k}"),
+            "stop_lat": data.stop_lat + jitter[:, 0],
+            "stop_lon": data.stop_lon + jitter[:, 1],
+        }))
+    return RouteData.concat(parts)
+
+
+def legacy(routes):
+    """The loops the network scripts used before railnet.geometry."""
+    stations_data, routes_data = [], []
+    for route in routes:
+        route_stations = []
+        for station in route["stations"]:
+            stations_data.append({
+                'name': station['name'],
+                'geometry': Point(station['lon'], station['lat']),
+                'route': route["name"],
+                'status': route["status"],
+            })
+            route_stations.append(Point(station['lon'], station['lat']))
+        if len(route_stations) > 1:
+            routes_data.append({
+                'name': route["name"],
+                'status': route["status"],
+                'geometry': LineString([(p.x, p.y) for p in route_stations]),
+            })
+    stations_gdf = gpd.GeoDataFrame(stations_data, crs='EPSG:4326').to_crs('EPSG:3857')
+    routes_gdf = gpd.GeoDataFrame(routes_data, crs='EPSG:4326').to_crs('EPSG:3857')
+    return stations_gdf, routes_gdf
+
+
+def vectorised(data):
+    return build_geodataframes(Network.from_routes(data))
+
+
+def best_of(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = load_services(verbose=False)
+    print(f"{'scale':>6} {'routes':>8} {'stops':>9} {'legacy s':>10} {'railnet s':>10} {'speed-up':>9}")
+    for scale in args.scales:
+        data = replicate(base, scale)
+        t_old = best_of(legacy, list(data.iter_routes()), args.repeat)
+        t_new = best_of(vectorised, data, args.repeat)
+        print(f"{scale:>5}x {len(data):>8} {data.n_stops:>9} {t_old:>10.3f} {t_new:>10.3f} {t_old / t_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
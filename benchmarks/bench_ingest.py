@@ -0,0 +1,119 @@
+"""
+Benchmark: peak RSS and time of ``json.load`` + ``routes_from_json`` vs streaming ingest.
+
+``stream`` rows build :class:`RouteData` (per-stop string columns);
+``network`` rows go straight to the deduplicated ``Network``.
+
+    python benchmarks/bench_ingest.py [--scales 10 100 400]
+
+Each scale replicates the real routes (all five services) with jittered
+coordinates and renamed stations into ``--workdir`` as one JSON array, NDJSON
+and per-stop CSV.  Every measurement runs in a fresh interpreter so
+``ru_maxrss`` is the peak of that loader alone.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from railnet.ingest import write_csv  # noqa: E402
+from railnet.loader import load_services  # noqa: E402
+
+LEGACY = """
+import json, sys, time
+from railnet.ingest import peak_rss_mb
+from railnet.loader import routes_from_json
+t0 = time.perf_counter()
+with open(sys.argv[1]) as f:
+    routes = json.load(f)
+data = routes_from_json({"routes": routes})
+print(time.perf_counter() - t0, peak_rss_mb(), data.n_stops)
+"""
+STREAM = """
+import sys, time
+from railnet.ingest import ingest, peak_rss_mb
+t0 = time.perf_counter()
+data = ingest(sys.argv[1])
+print(time.perf_counter() - t0, peak_rss_mb(), data.n_stops)
+"""
+NETWORK = """
+import sys, time
+from railnet.ingest import ingest_network, peak_rss_mb
+t0 = time.perf_counter()
+network = ingest_network(sys.argv[1])
+print(time.perf_counter() - t0, peak_rss_mb(), network.n_stops)
+"""
+
+
+def replicate_routes(data, scale, seed=0):
+    """Yield route dicts of ``scale`` jittered copies of ``data``."""
+    rng = np.random.default_rng(seed)
+    routes = list(data.iter_routes())
+    for k in range(scale):
+        for route in routes:
+            copy = dict(route, name=f"{route['name']} #{k}")
+            copy["stations"] = [
+                dict(s, name=f"{s['name']} {k}",
+                     lat=round(s["lat"] + rng.normal(0, 0.05), 5),
+                     lon=round(s["lon"] + rng.normal(0, 0.05), 5))
+                for s in route["stations"]]
+            yield copy
+
+
+def write_inputs(data, scale, workdir):
+    paths = {fmt: workdir / f"routes_x{scale}.{fmt}" for fmt in ("json", "ndjson", "csv")}
+    with open(paths["json"], "w") as fj, open(paths["ndjson"], "w") as fn:
+        fj.write("[\n")
+        for i, route in enumerate(replicate_routes(data, scale)):
+            line = json.dumps(route)
+            fj.write(("" if i == 0 else ",\n") + line)
+            fn.write(line + "\n")
+        fj.write("\n]\n")
+    from railnet.ingest import ingest
+
+    write_csv(ingest(paths["ndjson"]), paths["csv"])
+    return paths
+
+
+def measure(script, path):
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    out = subprocess.run([sys.executable, "-c", script, str(path)], env=env, check=True,
+                         capture_output=True, text=True).stdout.split()
+    return float(out[0]), float(out[1]), int(out[2])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--workdir", default=None, help="where to write generated inputs")
+    args = parser.parse_args()
+
+    data = load_services(verbose=False)
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="railnet-ingest-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    print(f"{'scale':>6} {'stops':>9} {'loader':<14} {'file MB':>8} {'time (s)':>9} "
+          f"{'peak RSS MB':>12}")
+    for scale in args.scales:
+        paths = write_inputs(data, scale, workdir)
+        runs = [("json.load", LEGACY, paths["json"])]
+        runs += [(f"stream {fmt}", STREAM, paths[fmt]) for fmt in ("json", "ndjson", "csv")]
+        runs += [(f"network {fmt}", NETWORK, paths[fmt]) for fmt in ("json", "ndjson")]
+        for label, script, path in runs:
+            seconds, rss, stops = measure(script, path)
+            size = path.stat().st_size / 2**20
+            print(f"{scale:>6} {stops:>9} {label:<14} {size:8.1f} {seconds:9.2f} {rss:12.0f}")
+        for path in paths.values():
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Benchmark suite: time and memory of every pipeline stage on synthetic networks.
+
+    python benchmarks/bench_pipeline.py --scales 10 100 --save baseline
+    python benchmarks/bench_pipeline.py --scales 10 100 --compare benchmarks/results/baseline.json
+
+Inputs come from :mod:`railnet.synth` (cached under ``build/synthetic/``).
+Each stage runs ``--repeat`` times for the best wall time, then once more
+under ``tracemalloc`` for its peak Python/numpy allocation (``--no-memory``
+skips that pass).  ``--save NAME`` writes ``benchmarks/results/NAME.json``;
+``--compare FILE`` prints the ratio per stage and exits 1 when a stage is
+slower than the baseline by more than ``--threshold``.
+
+``--render`` adds the map render (offline basemap, ``--dpi``) to the stages.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np  # noqa: E402
+
+from railnet.ingest import ingest  # noqa: E402
+from railnet.network import Network  # noqa: E402
+from railnet.synth import SYNTH_DIR, synthetic_routes, write_routes  # noqa: E402
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+# Stages faster than this are too noisy to flag as regressions
+NOISE_FLOOR_S = 0.02
+
+
+def stage_load(ctx):
+    ctx["data"] = ingest(ctx["path"])
+
+
+def stage_network(ctx):
+    ctx["network"] = Network.from_routes(ctx["data"])
+
+
+def stage_geodataframes(ctx):
+    from railnet.geometry import build_geodataframes
+
+    build_geodataframes(ctx["network"])
+
+
+def stage_transfers(ctx):
+    network = ctx["network"]
+    network.station_routes()
+    ctx["is_transfer"] = network.station_route_counts() > 1
+
+
+def stage_graph(ctx):
+    from railnet.routing import JourneyPlanner
+
+    JourneyPlanner(ctx["network"])
+
+
+def stage_stats(ctx):
+    from railnet.stats import segment_stats
+
+    segment_stats(ctx["network"])
+
+
+def stage_spatial(ctx):
+    from railnet.spatial import StationIndex
+
+    StationIndex.from_network(ctx["network"]).neighbours(k=1)
+
+
+def stage_corridors(ctx):
+    from railnet.corridors import corridors
+
+    corridors(ctx["network"])
+
+
+def stage_lod(ctx):
+    from railnet.geometry import WEB_MERCATOR, project_lonlat
+    from railnet.lod import RouteLOD, zoom_tolerance_m
+
+    network = ctx["network"]
+    x, y = project_lonlat(network.station_lon, network.station_lat, WEB_MERCATOR)
+    RouteLOD(network, x, y).segments(zoom_tolerance_m(5))
+
+
+def stage_interchanges(ctx):
+    from railnet.interchange import interchanges
+
+    interchanges(ctx["network"]).is_transfer(ctx["network"])
+
+
+def stage_centrality(ctx):
+    from railnet.centrality import station_importance
+
+    station_importance(ctx["network"], use_cache=False)
+
+
+def stage_dashboard(ctx):
+    from railnet.dashboard import Dashboard
+
+    board = Dashboard(ctx["network"])
+    groups = board.group_mask()
+    board.stats(groups)
+    board.map_paths(board.route_mask(groups))
+
+
+def stage_render(ctx):
+    import os
+
+    from railnet.maps import BASE_SPEC, MAJOR_CITIES
+    from railnet.render import render_map
+
+    os.environ.setdefault("RAILNET_OFFLINE", "1")
+    palette = ["#FF671F", "#CC0000", "#228B22", "#FF6600", "#227AB4", "#CC0234"]
+    services = [str(s) for s in ctx["network"].service.categories]
+    spec = {
+        **BASE_SPEC,
+        "map_title": f"Synthetic network x{ctx['scale']}",
+        "services": services,
+        "route_colors": dict(zip(services, palette * 2)),
+        "route_labels": {s: s for s in services},
+        "major_cities": MAJOR_CITIES,
+        "output_file_name": ctx["workdir"] / f"render_x{ctx['scale']}.png",
+    }
+    render_map(spec, ctx["network"], dpi=ctx["dpi"], verbose=False)
+
+
+STAGES = {
+    "load": stage_load,
+    "network": stage_network,
+    "geodataframes": stage_geodataframes,
+    "transfers": stage_transfers,
+    "graph": stage_graph,
+    "stats": stage_stats,
+    "spatial": stage_spatial,
+    "corridors": stage_corridors,
+    "lod": stage_lod,
+    "interchanges": stage_interchanges,
+    "centrality": stage_centrality,
+    "dashboard": stage_dashboard,
+    "render": stage_render,
+}
+
+
+def synthetic_file(scale, seed=0):
+    path = SYNTH_DIR / f"routes_x{scale}-seed{seed}.json"
+    if not path.exists():
+        write_routes(synthetic_routes(scale=scale, seed=seed), path)
+    return path
+
+
+def run_stage(fn, ctx, repeat, memory):
+    best = cpu = np.inf
+    for _ in range(repeat):
+        t0, c0 = time.perf_counter(), time.process_time()
+        fn(ctx)
+        best = min(best, time.perf_counter() - t0)
+        cpu = min(cpu, time.process_time() - c0)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn(ctx)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return best, cpu, peak
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    baseline = json.loads(Path(baseline_path).read_text())
+    old = {(r["scale"], r["stage"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} ({baseline.get('commit')}, {baseline.get('created')})")
+    print(f"{'scale':>6} {'stage':<14} {'old s':>8} {'new s':>8} {'ratio':>7}")
+    regressions = 0
+    for r in results:
+        o = old.get((r["scale"], r["stage"]))
+        if o is None:
+            continue
+        ratio = r["seconds"] / o["seconds"] if o["seconds"] else np.inf
+        slower = ratio > 1 + threshold and r["seconds"] - o["seconds"] > NOISE_FLOOR_S
+        regressions += slower
+        print(f"{r['scale']:>5}x {r['stage']:<14} {o['seconds']:8.3f} {r['seconds']:8.3f} "
+              f"{ratio:6.2f}x{'  REGRESSION' if slower else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES),
+                        default=[s for s in STAGES if s != "render"])
+    parser.add_argument("--render", action="store_true", help="include the render stage")
+    parser.add_argument("--dpi", type=int, default=100, help="render DPI")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="NAME", help="write benchmarks/results/NAME.json")
+    parser.add_argument("--compare", metavar="FILE", help="baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slow-down counted as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    stages = list(args.stages) + (["render"] if args.render and "render" not in args.stages
+                                  else [])
+    workdir = ROOT / "build" / "bench"
+    workdir.mkdir(parents=True, exist_ok=True)
+    results = []
+    print(f"{'scale':>6} {'routes':>8} {'stops':>9} {'stage':<14} {'wall s':>8} {'cpu s':>8} "
+          f"{'peak MB':>8}")
+    for scale in args.scales:
+        ctx = {"path": synthetic_file(scale, args.seed), "scale": scale,
+               "workdir": workdir, "dpi": args.dpi}
+        for name in ["load", "network"] + [s for s in stages if s not in ("load", "network")]:
+            wall, cpu, peak = run_stage(STAGES[name], ctx, args.repeat, not args.no_memory)
+            data = ctx["data"]
+            row = {"scale": scale, "stage": name, "seconds": wall, "cpu_seconds": cpu,
+                   "peak_mb": peak, "routes": len(data), "stops": data.n_stops}
+            results.append(row)
+            peak_s = f"{peak:8.1f}" if peak is not None else f"{'-':>8}"
+            print(f"{scale:>5}x {len(data):>8} {data.n_stops:>9} {name:<14} {wall:8.3f} "
+                  f"{cpu:8.3f} {peak_s}")
+
+    record = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        out = RESULTS_DIR / f"{args.save}.json"
+        out.write_text(json.dumps(record, indent=1))
+        print(f"\n✅ Results saved to {out}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
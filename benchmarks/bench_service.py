@@ -0,0 +1,146 @@
+"""
+Load test: requests per second and latency of ``railnet.service`` on localhost.
+
+    python benchmarks/bench_service.py                    # starts its own server
+    python benchmarks/bench_service.py --connections 128 --requests 50000
+    python benchmarks/bench_service.py --url http://127.0.0.1:8765 --distinct 200
+
+``--connections`` keep-alive clients send ``--requests`` GETs in total, drawn
+from ``--distinct`` different queries (station lookups, routes through a
+station, nearest stations, paths; a fixed seed keeps the mix reproducible).
+The first pass over the distinct queries fills the service's response cache
+and is reported separately from the cached run.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+
+def query_mix(names, n, seed=0):
+    """``n`` distinct request targets over all endpoints."""
+    rng = random.Random(seed)
+    targets = set()
+    while len(targets) < n:
+        kind = rng.random()
+        a, b = rng.choice(names), rng.choice(names)
+        if kind < 0.3:
+            targets.add(f"/stations?q={quote(a[:rng.randint(3, max(3, len(a)))])}")
+        elif kind < 0.6:
+            targets.add(f"/routes?station={quote(a)}")
+        elif kind < 0.8:
+            lat, lon = rng.uniform(8, 32), rng.uniform(70, 92)
+            targets.add(f"/nearest?lat={lat:.3f}&lon={lon:.3f}&k={rng.choice([1, 5, 10])}")
+        else:
+            targets.add(f"/path?from={quote(a)}&to={quote(b)}")
+    return sorted(targets)
+
+
+async def _client(host, port, queue, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                target = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            request = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+            t0 = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            length = next(int(line.split(":", 1)[1]) for line in lines
+                          if line.lower().startswith("content-length:"))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+            status = lines[0].split(" ", 2)[1]
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, targets, connections):
+    """Send every target once over ``connections`` clients; ``(seconds, latencies, statuses)``."""
+    queue = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+    latencies, statuses = [], {}
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, queue, latencies, statuses)
+                           for _ in range(min(connections, len(targets)))))
+    return time.perf_counter() - t0, np.array(latencies), statuses
+
+
+def report(label, seconds, latencies, statuses):
+    p50, p90, p99 = np.percentile(latencies * 1000, [50, 90, 99])
+    codes = " ".join(f"{k}:{v}" for k, v in sorted(statuses.items()))
+    print(f"{label:<8} {len(latencies):>8} {seconds:>7.2f} {len(latencies) / seconds:>9.0f} "
+          f"{p50:>7.2f} {p90:>7.2f} {p99:>7.2f}  {codes}")
+
+
+def start_server(args):
+    argv = [sys.executable, "-m", "railnet.service", "--port", "0"]
+    if args.routes:
+        argv += ["--routes", str(Path(args.routes).resolve())]
+    proc = subprocess.Popen(argv, cwd=SRC, stdout=subprocess.PIPE, text=True,
+                            env={**os.environ, "PYTHONPATH": str(SRC)})
+    line = proc.stdout.readline()
+    if "http://" not in line:
+        proc.kill()
+        raise SystemExit(f"❌ Error: server did not start: {line.strip()}")
+    print(line.strip())
+    return proc, line.strip().rsplit(" ", 1)[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="running service (default: start one on a free port)")
+    parser.add_argument("--routes", help="route file for the started service")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--distinct", type=int, default=1000,
+                        help="distinct queries in the mix (the rest are cache hits)")
+    args = parser.parse_args()
+
+    from railnet.network import Network
+
+    if args.routes:
+        from railnet.ingest import ingest_network
+
+        network = ingest_network(args.routes)
+    else:
+        network = Network.load(verbose=False)
+    names = [str(s) for s in network.station_name]
+    targets = query_mix(names, args.distinct)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args)
+    host, port = urlsplit(url).hostname, urlsplit(url).port
+    try:
+        rng = random.Random(1)
+        repeated = [rng.choice(targets) for _ in range(args.requests)]
+        print(f"{'run':<8} {'requests':>8} {'seconds':>7} {'req/s':>9} "
+              f"{'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7}  status")
+        report("cold", *asyncio.run(run(host, port, targets, args.connections)))
+        report("cached", *asyncio.run(run(host, port, repeated, args.connections)))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: CLI startup time, ``railnet`` subcommands vs the full GIS/plotting stack.
+
+    python benchmarks/bench_startup.py [--repeat 5]
+
+Each command runs in a fresh interpreter; the best of ``--repeat`` runs is
+reported, so the numbers are cold-import cost without disk-cache noise.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+COMMANDS = {
+    "railnet --help": ["-m", "railnet", "--help"],
+    "railnet analyse station": ["-m", "railnet", "analyse", "station", "Varanasi Jn"],
+    "railnet analyse summary": ["-m", "railnet", "analyse", "summary"],
+    "railnet route --help": ["-m", "railnet", "route", "--help"],
+    "import geo/plot stack": ["-c", "import geopandas, matplotlib.pyplot, contextily, networkx"],
+    "import railnet.render": ["-c", "import railnet.render"],
+}
+
+
+def best_of(argv, repeat):
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *argv], env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'command':<26} {'best (s)':>9}")
+    for label, argv in COMMANDS.items():
+        print(f"{label:<26} {best_of(argv, args.repeat):9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: rail graph build and map matching of ``railnet.tracks`` on a synthetic extract.
+
+    python benchmarks/bench_tracks.py                          # real routes, ~0.1 km track nodes
+    python benchmarks/bench_tracks.py --routes build/synthetic/routes_x10.json --workers 4
+    python benchmarks/bench_tracks.py --spacing-km 0.05 --noise-ways 20000
+
+No OSM extract ships with the repo, so a GeoJSON one is generated: every
+station has a track junction a few hundred metres away, every distinct
+station pair of the network gets a curving track between the two
+junctions (vertices every ``--spacing-km``), and ``--noise-ways`` random
+sidings pad the graph.  Matching runs cold (empty snap cache, in a temporary
+``RAILNET_CACHE_DIR``) and again warm, and snapped lengths are compared with
+the generated tracks.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+
+def synthetic_extract(network, path, spacing_km=0.1, noise_ways=5000, seed=0):
+    """Write a GeoJSON rail extract along ``network``'s station pairs; returns track km."""
+    from railnet.corridors import corridors
+    from railnet.geodesy import haversine_km
+
+    rng = np.random.default_rng(seed)
+    lat, lon = network.station_lat, network.station_lon
+    # Junction of each station: 100-400 m away in a random direction
+    angle = rng.uniform(0, 2 * np.pi, network.n_stations)
+    offset = rng.uniform(0.001, 0.004, network.n_stations)
+    j_lat, j_lon = lat + offset * np.sin(angle), lon + offset * np.cos(angle)
+    shared = corridors(network, split=False)
+    features, track_km = [], np.zeros(len(shared))
+    for i, (u, v) in enumerate(zip(shared.u.tolist(), shared.v.tolist())):
+        if u == v:
+            continue
+        km = float(haversine_km(j_lat[u], j_lon[u], j_lat[v], j_lon[v]))
+        t = np.linspace(0, 1, max(2, int(km / spacing_km)))
+        # Lateral bends of up to 5% of the length
+        bend = 0.05 * np.sin(np.pi * t * rng.integers(1, 4)) * rng.choice([-1, 1])
+        dlat, dlon = j_lat[v] - j_lat[u], j_lon[v] - j_lon[u]
+        p_lat = j_lat[u] + t * dlat - bend * dlon
+        p_lon = j_lon[u] + t * dlon + bend * dlat
+        track_km[i] = haversine_km(p_lat[:-1], p_lon[:-1], p_lat[1:], p_lon[1:]).sum()
+        features.append({"type": "Feature", "properties": {"railway": "rail"},
+                         "geometry": {"type": "LineString",
+                                      "coordinates": np.column_stack([p_lon, p_lat])
+                                      .round(7).tolist()}})
+    for _ in range(noise_ways):
+        a = rng.integers(network.n_stations)
+        n = rng.integers(5, 30)
+        p_lat = lat[a] + np.cumsum(rng.normal(0, 0.002, n)) + rng.uniform(-0.2, 0.2)
+        p_lon = lon[a] + np.cumsum(rng.normal(0, 0.002, n)) + rng.uniform(-0.2, 0.2)
+        kind = "rail" if rng.random() < 0.8 else "abandoned"
+        features.append({"type": "Feature", "properties": {"railway": kind},
+                         "geometry": {"type": "LineString",
+                                      "coordinates": np.column_stack([p_lon, p_lat])
+                                      .round(7).tolist()}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+    return track_km
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--routes", help="route file (default: all services in data/)")
+    parser.add_argument("--spacing-km", type=float, default=0.1)
+    parser.add_argument("--noise-ways", type=int, default=5000)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["RAILNET_CACHE_DIR"] = tmp
+        from railnet.corridors import corridors
+        from railnet.network import Network
+        from railnet.tracks import rail_graph, track_geometry
+
+        if args.routes:
+            from railnet.ingest import ingest_network
+
+            network = ingest_network(args.routes)
+        else:
+            network = Network.load(verbose=False)
+        extract = Path(tmp) / "rail.geojson"
+        t0 = time.perf_counter()
+        truth = synthetic_extract(network, extract, args.spacing_km, args.noise_ways)
+        print(f"extract: {extract.stat().st_size / 2**20:.0f} MB in "
+              f"{time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        rail = rail_graph(extract)
+        print(f"rail graph: {rail.n_nodes} nodes, {len(rail.u)} edges in "
+              f"{time.perf_counter() - t0:.2f}s")
+        for run in ("cold", "warm"):
+            t0 = time.perf_counter()
+            tracks = track_geometry(network, extract, args.workers)
+            seconds = time.perf_counter() - t0
+            print(f"{run}: {len(tracks)} station pairs in {seconds:.2f}s "
+                  f"({tracks.snapped.mean():.1%} snapped)")
+        km = tracks.km()
+        gc = corridors(network, split=False).km(network)
+        ok = tracks.snapped & (truth > 0)
+        error = np.abs(km[ok] - truth[ok]) / truth[ok]
+        print(f"km vs generated track: median error {np.median(error):.1%}, "
+              f"within 5%: {(error < 0.05).mean():.1%}; "
+              f"track/great-circle {km[ok].sum() / gc[ok].sum():.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Entry point for ``python main.py ...`` (Replit); same as ``railnet ...``."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from railnet.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    raise SystemExit(main())
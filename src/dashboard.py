@@ -0,0 +1,4 @@
+# Streamlit dashboard over all services: streamlit run src/dashboard.py
+from railnet.dashboard import app
+
+app()
@@ -0,0 +1,13 @@
+"""
+Shared building blocks for the Indian Railways network scripts.
+
+The scripts in ``src/`` (``VB_Network.py``, ``Rajdhani_Network.py`` …) import
+from this package; run them from ``src/`` as before.
+
+Setting ``RAILNET_TRACE=trace.json`` records per-stage timings for any entry
+point (see :mod:`railnet.trace`).
+"""
+
+from railnet import trace as _trace
+
+_trace.from_env()
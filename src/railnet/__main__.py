@@ -0,0 +1,3 @@
+from railnet.cli import main
+
+raise SystemExit(main())
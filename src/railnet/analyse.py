@@ -0,0 +1,92 @@
+"""
+Quick network queries that only need numpy (no GIS or plotting imports).
+
+    cd src && python -m railnet.analyse station Bengaluru
+    cd src && python -m railnet.analyse summary --services rajdhani duronto humsafar
+    cd src && python -m railnet.analyse stats
+"""
+
+import argparse
+
+import numpy as np
+
+from railnet.loader import SERVICES
+from railnet.network import Network
+
+
+def match_stations(network, name):
+    """Station ids in ``network`` that are ``name``: the exact station, else every
+    station the registry resolves to the same canonical station."""
+    try:
+        return np.array([network.station_id(name)])
+    except KeyError:
+        pass
+    from railnet.stations import default_registry
+
+    registry = default_registry()
+    target = registry.lookup(name)
+    if target < 0:
+        return np.empty(0, dtype=np.int64)
+    ids = registry.resolve(network.station_name, network.station_lat, network.station_lon)
+    return np.flatnonzero(ids == target)
+
+
+def routes_through(network, station_ids):
+    """Route ids calling at any of ``station_ids`` (sorted, unique)."""
+    offsets, routes = network.station_routes()
+    return np.unique(np.concatenate(
+        [routes[offsets[s]:offsets[s + 1]] for s in station_ids] or [np.empty(0, np.int32)]))
+
+
+def _station(args):
+    network = Network.load(*args.services, verbose=False)
+    stations = match_stations(network, args.name)
+    if not len(stations):
+        print(f"❌ Error: no station matches '{args.name}'")
+        return 1
+    routes = routes_through(network, stations)
+    names = ", ".join(str(network.station_name[s]) for s in stations)
+    print(f"{len(routes)} routes through {names}:")
+    for i in routes:
+        number = f" ({network.train_number[i]})" if network.train_number[i] else ""
+        print(f"  {network.service_label(i):<14} {network.name[i]}{number}")
+    return 0
+
+
+def _summary(args):
+    network = Network.load(*args.services, verbose=False)
+    print("📊 Route Summary:")
+    for key in args.services or SERVICES:
+        print(f"   • {SERVICES[key][2]}: {(network.service == key).sum()} routes")
+    print(f"   • Total Stations: {network.n_stations} unique stations ({network.n_stops} stops)")
+    print(f"   • Total Routes: {network.n_routes} routes")
+    return 0
+
+
+def _stats(args):
+    from railnet.stats import main as stats_main
+
+    stats_main(args.rest)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.analyse",
+                                     description="Query the route network.")
+    sub = parser.add_subparsers(dest="query", required=True)
+    station = sub.add_parser("station", help="list routes through a station")
+    station.add_argument("name")
+    station.set_defaults(run=_station)
+    summary = sub.add_parser("summary", help="route/station counts per service")
+    summary.set_defaults(run=_summary)
+    for p in (station, summary):
+        p.add_argument("--services", nargs="+", default=[], choices=sorted(SERVICES))
+    stats = sub.add_parser("stats", help="write segment statistics (see railnet.stats)")
+    stats.add_argument("rest", nargs=argparse.REMAINDER)
+    stats.set_defaults(run=_stats)
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+Offline-capable basemap tiles.
+
+Tiles live in a directory pyramid (``<tile dir>/<provider>/<z>/<x>/<y>.png``)
+that can be pre-warmed for the India extent and copied to air-gapped
+machines.  With ``RAILNET_OFFLINE=1`` (or ``offline=True``) the network is
+never touched and a missing tile raises :class:`BasemapUnavailable`.  The
+stitched raster for each (extent, zoom, CRS) is cached as ``.npz`` next to
+the tiles, so repeat renders skip PNG decoding and warping as well.
+
+    python -m railnet.basemap prewarm --zoom 4 5 6 7
+"""
+
+import argparse
+import io
+import math
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from railnet import trace
+from railnet.loader import cache_dir, content_hash
+
+PROVIDERS = {
+    "CartoDB.Positron": "https://a.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png",
+    "OpenStreetMap.Mapnik": "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+}
+DEFAULT_PROVIDER = "CartoDB.Positron"
+MAX_ZOOM = 18
+
+# lon/lat box comfortably covering every station we map
+INDIA_BOUNDS = (67.0, 5.0, 98.0, 38.0)
+
+EARTH_HALF_CIRCUMFERENCE = 20037508.342789244
+USER_AGENT = "Indian-Railways-Network/0.1 (+basemap cache)"
+
+
+class BasemapUnavailable(RuntimeError):
+    """The basemap could not be produced (offline miss or download failure)."""
+
+
+def is_offline(offline=None):
+    if offline is not None:
+        return offline
+    return os.environ.get("RAILNET_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def tile_dir():
+    return Path(os.environ.get("RAILNET_TILE_DIR", cache_dir() / "tiles"))
+
+
+# ───────────────────────────── tile arithmetic ──────────────────────────────
+def lonlat_to_tile(lon, lat, z):
+    lat = max(min(lat, 85.0511), -85.0511)
+    n = 2 ** z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_range(bounds, z):
+    """Inclusive ``(x0, y0, x1, y1)`` tile indices covering lon/lat ``bounds``."""
+    west, south, east, north = bounds
+    x0, y0 = lonlat_to_tile(west, north, z)
+    x1, y1 = lonlat_to_tile(east, south, z)
+    return x0, y0, x1, y1
+
+
+def tile_extent_merc(z, x0, y0, x1, y1):
+    """``(left, right, bottom, top)`` in EPSG:3857 metres for a tile block."""
+    size = 2 * EARTH_HALF_CIRCUMFERENCE / 2 ** z
+    left = -EARTH_HALF_CIRCUMFERENCE + x0 * size
+    right = -EARTH_HALF_CIRCUMFERENCE + (x1 + 1) * size
+    top = EARTH_HALF_CIRCUMFERENCE - y0 * size
+    bottom = EARTH_HALF_CIRCUMFERENCE - (y1 + 1) * size
+    return left, right, bottom, top
+
+
+def auto_zoom(bounds):
+    """Same rule as ``contextily`` so maps keep their current look."""
+    west, south, east, north = bounds
+    zoom_lon = math.ceil(math.log2(360 * 2.0 / max(east - west, 1e-9)))
+    zoom_lat = math.ceil(math.log2(360 * 2.0 / max(north - south, 1e-9)))
+    return int(min(zoom_lon, zoom_lat, MAX_ZOOM))
+
+
+# ─────────────────────────────── tile store ─────────────────────────────────
+class TileStore:
+    """Directory pyramid of PNG tiles for one provider."""
+
+    def __init__(self, provider=DEFAULT_PROVIDER, root=None, offline=None, url=None):
+        self.provider = provider
+        self.url = url or os.environ.get("RAILNET_TILE_URL") or PROVIDERS[provider]
+        self.root = Path(root or tile_dir()) / provider.replace("/", "_")
+        self.offline = is_offline(offline)
+        self.fetched = 0
+
+    def path(self, z, x, y):
+        return self.root / str(z) / str(x) / f"{y}.png"
+
+    def has(self, z, x, y):
+        return self.path(z, x, y).exists()
+
+    def covers(self, bounds, z):
+        """Whether every tile of lon/lat ``bounds`` at zoom ``z`` is stored locally."""
+        x0, y0, x1, y1 = tile_range(bounds, z)
+        return all(self.has(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+
+    def get(self, z, x, y):
+        """PNG bytes for a tile, downloading it unless offline."""
+        path = self.path(z, x, y)
+        if path.exists():
+            trace.count("tiles_read")
+            return path.read_bytes()
+        if self.offline:
+            raise BasemapUnavailable(f"tile {z}/{x}/{y} not in {self.root} (offline mode)")
+        request = urllib.request.Request(self.url.format(z=z, x=x, y=y),
+                                         headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=20) as response:
+                blob = response.read()
+        except (urllib.error.URLError, OSError) as e:
+            raise BasemapUnavailable(f"could not fetch tile {z}/{x}/{y}: {e}") from e
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+        self.fetched += 1
+        trace.count("tiles_fetched")
+        return blob
+
+    def prewarm(self, zooms, bounds=INDIA_BOUNDS, workers=8):
+        """Download every missing tile of ``bounds`` at ``zooms``; returns the count."""
+        if self.offline:
+            raise BasemapUnavailable("cannot pre-warm the tile store in offline mode")
+        missing = []
+        for z in zooms:
+            x0, y0, x1, y1 = tile_range(bounds, z)
+            missing += [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)
+                        if not self.has(z, x, y)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda t: self.get(*t), missing))
+        return len(missing)
+
+
+# ──────────────────────────── stitched rasters ──────────────────────────────
+def _decode_png(blob):
+    from PIL import Image
+
+    with Image.open(io.BytesIO(blob)) as im:
+        return np.asarray(im.convert("RGBA"))
+
+
+def stitch(store, bounds, z):
+    """Mosaic the tiles covering lon/lat ``bounds``; returns ``(img, extent_3857)``."""
+    x0, y0, x1, y1 = tile_range(bounds, z)
+    rows = []
+    for y in range(y0, y1 + 1):
+        rows.append(np.concatenate([_decode_png(store.get(z, x, y))
+                                    for x in range(x0, x1 + 1)], axis=1))
+    return np.concatenate(rows, axis=0), tile_extent_merc(z, x0, y0, x1, y1)
+
+
+def basemap_raster(bounds, zoom="auto", crs="EPSG:3857", provider=DEFAULT_PROVIDER,
+                   offline=None, store=None):
+    """Cached stitched (and, for non-Mercator ``crs``, warped) basemap raster.
+
+    Returns ``(img, (left, right, bottom, top))`` with the extent in ``crs``.
+    """
+    store = store or TileStore(provider, offline=offline)
+    z = auto_zoom(bounds) if zoom == "auto" else int(zoom)
+    crs_key = str(crs)
+    key = content_hash(repr((store.url, z, tile_range(bounds, z), crs_key)).encode())
+    cache_file = store.root / "rasters" / f"{key}.npz"
+    if cache_file.exists():
+        trace.count("basemap_cache_hits")
+        with np.load(cache_file, allow_pickle=False) as npz:
+            return npz["img"], tuple(npz["extent"])
+
+    img, extent = stitch(store, bounds, z)
+    if crs_key not in ("EPSG:3857", "3857", "epsg:3857"):
+        import contextily
+
+        img, extent = contextily.warp_tiles(img, extent, t_crs=crs)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(tmp, img=img, extent=np.asarray(extent, dtype=np.float64))
+    os.replace(tmp, cache_file)
+    return img, tuple(extent)
+
+
+def axes_bounds_lonlat(ax, crs="EPSG:3857"):
+    """Current axes limits as a lon/lat box."""
+    from pyproj import Transformer
+
+    (xmin, xmax), (ymin, ymax) = ax.get_xlim(), ax.get_ylim()
+    transformer = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+    west, south, east, north = transformer.transform_bounds(xmin, ymin, xmax, ymax)
+    return west, south, east, north
+
+
+def add_basemap(ax, crs="EPSG:3857", zoom="auto", provider=DEFAULT_PROVIDER,
+                alpha=1.0, offline=None, zorder=0):
+    """Drop-in for ``contextily.add_basemap`` backed by the local tile store.
+
+    Raises :class:`BasemapUnavailable` if the tiles cannot be obtained.
+    """
+    img, extent = basemap_raster(axes_bounds_lonlat(ax, crs), zoom=zoom, crs=crs,
+                                 provider=provider, offline=offline)
+    draw_raster(ax, img, extent, alpha=alpha, zorder=zorder)
+    return img, extent
+
+
+def draw_raster(ax, img, extent, alpha=1.0, zorder=0):
+    """Show a prepared basemap raster without changing the axes limits."""
+    xlim, ylim = ax.get_xlim(), ax.get_ylim()
+    ax.imshow(img, extent=tuple(extent), interpolation="bilinear",
+              alpha=alpha, zorder=zorder, aspect=ax.get_aspect())
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.basemap",
+                                     description="Manage the local basemap tile store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("prewarm", help="download tiles for the India extent")
+    warm.add_argument("--zoom", type=int, nargs="+", default=[4, 5, 6, 7])
+    warm.add_argument("--provider", default=DEFAULT_PROVIDER, choices=sorted(PROVIDERS))
+    warm.add_argument("--bounds", type=float, nargs=4, default=INDIA_BOUNDS,
+                      metavar=("WEST", "SOUTH", "EAST", "NORTH"))
+    warm.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    store = TileStore(args.provider)
+    try:
+        n = store.prewarm(args.zoom, tuple(args.bounds), workers=args.workers)
+    except BasemapUnavailable as e:
+        print(f"❌ Error: {e}")
+        raise SystemExit(1)
+    print(f"✅ Downloaded {n} tiles into {store.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Batch renderer: every configured map from one process pool.
+
+The route table and the basemap rasters are loaded once in the parent and
+published through shared memory; workers attach to those buffers as
+zero-copy numpy views, build their (small) per-map networks and render.
+Each map gets the raster of its own extent and zoom (maps that cover the
+same tiles share one).  Nothing larger than a map name crosses the pool per
+task.
+
+    cd src && python -m railnet.batch --workers 4 --dpi 500
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from railnet import trace
+from railnet.basemap import BasemapUnavailable, basemap_raster, tile_range
+from railnet.loader import RouteData, load_services
+from railnet.maps import MAP_SPECS
+from railnet.render import map_basemap_tiles, network_for_spec, render_map
+
+
+class SharedArrays:
+    """A dict of numpy arrays copied once into named shared-memory blocks."""
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.descriptors = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.descriptors[key] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def attach(descriptors):
+    """Zero-copy views onto arrays published by :class:`SharedArrays`."""
+    arrays, blocks = {}, []
+    for key, (name, shape, dtype) in descriptors.items():
+        # Pool workers share the parent's resource tracker, so the parent's
+        # unlink in SharedArrays.close() is the only cleanup needed.
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+_WORKER = {}
+
+
+def _init_worker(route_descriptors, basemap_descriptors, basemap_extents, trace_config):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    if trace_config:
+        trace.enable(**trace_config)
+    else:
+        trace.disable()
+    routes, blocks = attach(route_descriptors)
+    _WORKER["data"] = RouteData(**routes)
+    _WORKER["blocks"] = blocks
+    rasters, blocks = attach(basemap_descriptors)
+    _WORKER["basemaps"] = {key: (img, basemap_extents[key]) for key, img in rasters.items()}
+    _WORKER["blocks"] += blocks
+
+
+def _render_one(name, dpi, basemap_key):
+    t0 = time.perf_counter()
+    spec = MAP_SPECS[name]
+    with trace.span("map", map=name):
+        network = network_for_spec(spec, _WORKER["data"])
+        output = render_map(spec, network, basemap=_WORKER["basemaps"].get(basemap_key),
+                            dpi=dpi, verbose=False)
+    tracer = trace.active()
+    return name, output, time.perf_counter() - t0, tracer.drain() if tracer else None
+
+
+def shared_basemaps(networks, specs, offline=None, zoom="auto"):
+    """One basemap raster per distinct (zoom, tile range) of the maps.
+
+    Returns ``({key: img}, {key: extent}, [key per map])``; maps whose tiles
+    are unavailable get no raster (``render_map`` then reports it).
+    """
+    rasters, extents, keys = {}, {}, []
+    for network, spec in zip(networks, specs):
+        bounds, z = map_basemap_tiles(network, spec, zoom)
+        key = "z{}-{}-{}-{}-{}".format(z, *tile_range(bounds, z))
+        keys.append(key)
+        if key in extents:
+            continue
+        try:
+            rasters[key], extents[key] = basemap_raster(bounds, zoom=z, offline=offline)
+        except BasemapUnavailable as e:
+            print(f"Could not load basemap ({e}), continuing without it...")
+            extents[key] = None
+    return rasters, extents, keys
+
+
+def render_all(names=None, workers=None, dpi=None, offline=None, zoom="auto"):
+    """Render ``names`` (all of ``MAP_SPECS`` by default) in parallel.
+
+    Returns ``{map name: output path}``.
+    """
+    names = list(names or MAP_SPECS)
+    unknown = set(names) - set(MAP_SPECS)
+    if unknown:
+        raise KeyError(f"Unknown map(s): {', '.join(sorted(unknown))}")
+    workers = min(workers or os.cpu_count() or 1, len(names))
+
+    data = load_services(verbose=False)
+    networks = [network_for_spec(MAP_SPECS[n], data) for n in names]
+    with trace.span("basemap", shared=True):
+        rasters, extents, keys = shared_basemaps(networks, [MAP_SPECS[n] for n in names],
+                                                 offline=offline, zoom=zoom)
+        trace.count("basemap_rasters", len(rasters))
+
+    shared_routes = SharedArrays(vars(data))
+    shared_basemap = SharedArrays(rasters)
+    outputs = {}
+    try:
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(shared_routes.descriptors, shared_basemap.descriptors,
+                          extents, trace.config())) as pool:
+            futures = [pool.submit(_render_one, name, dpi, key)
+                       for name, key in zip(names, keys)]
+            for future in as_completed(futures):
+                name, output, seconds, events = future.result()
+                if events:
+                    trace.active().extend(events)
+                outputs[name] = output
+                print(f"Map saved as {output} ({name}, {seconds:.1f}s)")
+    finally:
+        shared_routes.close()
+        shared_basemap.close()
+    return outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.batch",
+                                     description="Render every network map in parallel.")
+    parser.add_argument("--maps", nargs="+", choices=sorted(MAP_SPECS),
+                        help="maps to render (default: all)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--dpi", type=int, help="override each map's output_dpi")
+    parser.add_argument("--offline", action="store_true", default=None,
+                        help="never download basemap tiles")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    outputs = render_all(args.maps, workers=args.workers, dpi=args.dpi, offline=args.offline)
+    print(f"✅ Rendered {len(outputs)} maps in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
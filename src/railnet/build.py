@@ -0,0 +1,285 @@
+"""
+Incremental map builds driven by a content-hash manifest.
+
+Each map is built in stages::
+
+    tables   route files           -> normalised RouteData   (tables.npz)
+    network  tables                -> deduplicated Network   (network.npz)
+    render   network, map spec,    -> PNG
+             basemap, station
+             registry, track
+             extract
+
+plus one ``stats`` stage over all route files (``data/segment_stats.csv``
+and friends, see :mod:`railnet.stats`).
+
+``build/manifest.json`` records, per stage, the hash of its inputs and of
+every output it wrote.  A stage reruns only when its input hash changes or
+an output is missing/modified, and downstream stages key on the *content*
+hash of upstream artifacts, so an edit that does not change the normalised
+data (reformatting a JSON file, touching another service) stops early.
+Paths are recorded relative to the repository, so the manifest survives
+moving the checkout.  A render that fell back to no basemap (tiles missing
+offline) is not recorded, so it is redrawn once the tiles are available.
+
+    cd src && python -m railnet.build            # all maps
+    cd src && python -m railnet.build --maps premium_express --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import fields
+from pathlib import Path
+
+import numpy as np
+
+from railnet import trace
+from railnet.basemap import DEFAULT_PROVIDER, PROVIDERS, TileStore
+from railnet.loader import (CACHE_VERSION, DATA_DIR, SERVICES, RouteData, content_hash, file_hash,
+                            load_services)
+from railnet.maps import MAP_SPECS
+from railnet.network import Network
+from railnet.stations import REGISTRY_FILE
+
+ROOT = DATA_DIR.parent
+BUILD_DIR = ROOT / "build"
+# Bump when a stage's code changes in a way that must invalidate old artifacts.
+MANIFEST_VERSION = 3
+
+
+def hash_file(path):
+    return file_hash(path)
+
+
+def relative(path):
+    """``path`` relative to the repository when inside it (POSIX form), else absolute."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(ROOT.resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _portable(obj):
+    """``obj`` with paths (``Path`` values, absolute path strings) made repo-relative."""
+    if isinstance(obj, dict):
+        return {k: _portable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_portable(v) for v in obj]
+    if isinstance(obj, Path) or (isinstance(obj, str) and os.path.isabs(obj)):
+        return relative(obj)
+    return obj
+
+
+def hash_json(obj):
+    """Hash of a JSON-able object (keys sorted, paths repo-relative, other values via ``str``)."""
+    return content_hash(json.dumps(_portable(obj), sort_keys=True, default=str).encode())
+
+
+def hash_arrays(arrays):
+    """Hash of a ``{name: ndarray}`` mapping by content (``.npz`` bytes are not stable)."""
+    h = hashlib.sha1()
+    for key in sorted(arrays):
+        a = np.ascontiguousarray(arrays[key])
+        h.update(f"{key}:{a.dtype.str}:{a.shape}".encode())
+        h.update(a.tobytes())
+    return h.hexdigest()[:16]
+
+
+def artifact_hash(path):
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as npz:
+            return hash_arrays({key: npz[key] for key in npz.files})
+    return hash_file(path)
+
+
+def _save_npz(path, arrays):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def _load_npz(path):
+    with np.load(path, allow_pickle=False) as npz:
+        return {key: npz[key] for key in npz.files}
+
+
+class Manifest:
+    """``{stage: {"inputs": hash, "outputs": {path: hash}}}`` persisted as JSON."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.stages = {}
+        if self.path.exists():
+            raw = json.loads(self.path.read_text())
+            if raw.get("version") == MANIFEST_VERSION:
+                self.stages = raw["stages"]
+
+    def outputs(self, stage, inputs):
+        """Recorded output hashes if ``stage`` is up to date for ``inputs``, else ``None``."""
+        record = self.stages.get(stage)
+        if not record or record["inputs"] != inputs:
+            return None
+        for path, digest in record["outputs"].items():
+            path = ROOT / path
+            if not path.exists() or artifact_hash(path) != digest:
+                return None
+        return record["outputs"]
+
+    def record(self, stage, inputs, paths):
+        outputs = {relative(p): artifact_hash(p) for p in paths}
+        self.stages[stage] = {"inputs": inputs, "outputs": outputs}
+        return outputs
+
+    def forget(self, stage):
+        self.stages.pop(stage, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "stages": self.stages},
+                                  indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+class Builder:
+    """Runs the stages of one or more maps against a :class:`Manifest`."""
+
+    def __init__(self, build_dir=BUILD_DIR, force=False, dpi=None, verbose=True):
+        self.build_dir = Path(build_dir)
+        self.manifest = Manifest(self.build_dir / "manifest.json")
+        self.force = force
+        self.dpi = dpi
+        self.verbose = verbose
+        self.ran, self.skipped = [], []
+
+    def stage(self, name, inputs, outputs, run):
+        """Run ``run()`` (which writes ``outputs``) unless ``name`` is up to date.
+
+        If ``run()`` returns False the outputs are incomplete and the stage
+        is not recorded (it reruns next time).
+        """
+        inputs = hash_json([MANIFEST_VERSION, inputs])
+        recorded = None if self.force else self.manifest.outputs(name, inputs)
+        if recorded is not None:
+            self.skipped.append(name)
+            return recorded
+        t0 = time.perf_counter()
+        kind, _, target = name.partition(":")
+        with trace.span(f"build:{kind}", target=target):
+            complete = run() is not False
+        self.ran.append(name)
+        if not complete:
+            self.manifest.forget(name)
+            if self.verbose:
+                print(f"  {name} ({time.perf_counter() - t0:.2f}s, incomplete: not recorded)")
+            return None
+        recorded = self.manifest.record(name, inputs, outputs)
+        if self.verbose:
+            print(f"  {name} ({time.perf_counter() - t0:.2f}s)")
+        return recorded
+
+    def build_map(self, map_name):
+        """Bring every stage of ``map_name`` up to date; returns the output PNG path."""
+        spec = MAP_SPECS[map_name]
+        out = self.build_dir / "artifacts" / map_name
+        tables_npz, network_npz = out / "tables.npz", out / "network.npz"
+
+        if spec["services"] is None:
+            import railnet.northern as northern
+
+            sources = {"northern.py": hash_file(northern.__file__)}
+        else:
+            files = dict.fromkeys(SERVICES[s][0] for s in spec["services"])
+            sources = {f: hash_file(DATA_DIR / f) for f in files}
+
+        def tables():
+            if spec["services"] is None:
+                from railnet.northern import northern_route_data
+
+                data = northern_route_data()
+            else:
+                data = load_services(*spec["services"], verbose=False)
+            _save_npz(tables_npz, {f.name: getattr(data, f.name) for f in fields(RouteData)})
+
+        def network():
+            Network.from_routes(RouteData(**_load_npz(tables_npz))).save(network_npz)
+
+        def render():
+            from railnet.render import map_basemap_tiles, render_map
+
+            net = Network.open(network_npz)
+            render_map(spec, net, dpi=self.dpi, verbose=False)
+            # Tiles missing after the render: it fell back to no basemap
+            return TileStore(DEFAULT_PROVIDER).covers(*map_basemap_tiles(net, spec))
+
+        h = self.stage(f"tables:{map_name}", [sources, CACHE_VERSION], [tables_npz], tables)
+        h = self.stage(f"network:{map_name}", h, [network_npz], network)
+        output = Path(spec["output_file_name"])
+        basemap = {"provider": DEFAULT_PROVIDER, "url": PROVIDERS[DEFAULT_PROVIDER],
+                   "tile_url": os.environ.get("RAILNET_TILE_URL")}
+        registry = hash_file(REGISTRY_FILE)
+        tracks = None
+        if spec.get("track_geometry"):
+            from railnet.tracks import TRACKS_VERSION
+
+            # The spec only names the extract: key on its content
+            tracks = [hash_file(spec["track_geometry"]), TRACKS_VERSION]
+        self.stage(f"render:{map_name}",
+                   [h, hash_json(spec), self.dpi, basemap, registry, tracks], [output], render)
+        return output
+
+    def build_stats(self):
+        """Segment/route/service statistics over every service."""
+        from railnet.stats import STATS_FILE, write_stats
+
+        stem = STATS_FILE.with_suffix("")
+        outputs = [STATS_FILE, stem.with_name("route_stats.csv"),
+                   stem.with_name("service_stats.csv"), stem.with_suffix(".npz")]
+        files = dict.fromkeys(f for f, _, _ in SERVICES.values())
+        sources = {f: hash_file(DATA_DIR / f) for f in files}
+        self.stage("stats", [sources, CACHE_VERSION], outputs,
+                   lambda: write_stats(Network.load(verbose=False), STATS_FILE))
+
+    def build(self, names=None, stats=True):
+        names = list(names or MAP_SPECS)
+        try:
+            for name in names:
+                if self.verbose:
+                    print(f"[{name}]")
+                self.build_map(name)
+            if stats:
+                if self.verbose:
+                    print("[stats]")
+                self.build_stats()
+        finally:
+            self.manifest.save()
+        return self.ran, self.skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.build",
+                                     description="Rebuild only the map stages whose inputs changed.")
+    parser.add_argument("--maps", nargs="+", choices=sorted(MAP_SPECS),
+                        help="maps to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest")
+    parser.add_argument("--dpi", type=int, help="override each map's output_dpi")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help="manifest/artifact directory")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    builder = Builder(args.build_dir, force=args.force, dpi=args.dpi)
+    # Network-wide statistics only on full builds
+    ran, skipped = builder.build(args.maps, stats=not args.maps)
+    print(f"✅ {len(ran)} stages run, {len(skipped)} up to date "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
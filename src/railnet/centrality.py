@@ -0,0 +1,293 @@
+"""
+Station importance: degree, route count, betweenness and closeness centrality.
+
+All metrics are computed on the combined station graph of the network
+(undirected, one edge per adjacent station pair, weighted by great-circle
+km):
+
+* ``degree``: distinct neighbouring stations,
+* ``route_count``: distinct routes calling at the station,
+* ``betweenness``: share of shortest paths through the station (Brandes,
+  normalised to 0..1),
+* ``closeness``: inverse mean distance to reachable stations
+  (Wasserman-Faust scaling for disconnected graphs).
+
+Both centralities run on scipy's batched Dijkstra.  Graphs up to
+``EXACT_MAX_STATIONS`` use every station as a source.  Larger graphs use
+``samples`` random sources (betweenness scaled by n/k, closeness by the
+Eppstein-Wang estimate).  Betweenness source batches are split across
+worker processes.  Results are cached in
+``data/.cache`` keyed by a hash of the graph and the parameters.
+
+    cd src && python -m railnet.centrality        # data/station_importance.csv
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from railnet import trace
+from railnet.geodesy import haversine_km
+from railnet.loader import DATA_DIR, cache_dir, content_hash
+from railnet.network import Network
+
+EXACT_MAX_STATIONS = 2000
+DEFAULT_SAMPLES = 512
+# Bump when the metric definitions change
+CENTRALITY_VERSION = 2
+IMPORTANCE_FILE = DATA_DIR / "station_importance.csv"
+METRICS = ("degree", "route_count", "betweenness", "closeness")
+
+
+def station_graph(network):
+    """Undirected station edges ``(u, v, km)`` with ``u < v``, each pair once."""
+    u, v, _ = network.edges()
+    a, b = np.minimum(u, v).astype(np.int64), np.maximum(u, v).astype(np.int64)
+    keep = a != b
+    key = np.unique(a[keep] * network.n_stations + b[keep])
+    a, b = np.divmod(key, network.n_stations)
+    lat, lon = network.station_lat, network.station_lon
+    return a, b, haversine_km(lat[a], lon[a], lat[b], lon[b])
+
+
+def graph_hash(u, v, km, n, *params):
+    arrays = (np.asarray(u, np.int64), np.asarray(v, np.int64), np.asarray(km, np.float64))
+    blob = b"".join(a.tobytes() for a in arrays)
+    return content_hash(blob + repr((CENTRALITY_VERSION, n) + params).encode())
+
+
+def _adjacency(u, v, km, n):
+    from scipy.sparse import csr_matrix
+
+    # Zero-length edges would vanish from a sparse matrix
+    w = np.maximum(km, 1e-6)
+    rows, cols = np.concatenate([u, v]), np.concatenate([v, u])
+    return csr_matrix((np.concatenate([w, w]), (rows, cols)), shape=(n, n))
+
+
+_WORKER = {}
+
+
+def _init_worker(u, v, km, n):
+    _WORKER["graph"] = _adjacency(u, v, km, n)
+
+
+def _dependencies(sources):
+    """Summed Brandes dependencies of ``sources`` on every station (length n).
+
+    Each source's shortest-path DAG is its Dijkstra tree plus every other
+    edge that reaches a station at exactly its distance (ties: name variants
+    of one station share coordinates, so paths through either are equally
+    short).  Stations are levelled by their longest hop count in the DAG,
+    from the tree depth (pointer jumping, log(depth) rounds) raised along
+    the tie edges; path counts then flow down and dependencies back up one
+    level at a time, over all sources of the batch at once.
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    graph = _WORKER["graph"]
+    n = graph.shape[0]
+    sources = np.asarray(sources)
+    k = len(sources)
+    dist, pred = dijkstra(graph, directed=False, indices=sources, return_predecessors=True)
+    base = (np.arange(k, dtype=np.int64) * n)[:, None]
+    parent = np.where(pred >= 0, pred + base, -1).ravel()
+    depth = (parent >= 0).astype(np.int64)
+    anc = parent.copy()
+    while (has := anc >= 0).any():
+        up = np.where(has, anc, 0)
+        depth = depth + np.where(has, depth[up], 0)
+        anc = np.where(has, anc[up], -1)
+
+    # DAG edges a -> b of every source (flat ``source * n + station`` ids)
+    degree = np.diff(graph.indptr)
+    a = np.repeat(np.arange(n), degree)
+    b = graph.indices.astype(np.int64)
+    reach = np.repeat(dist, degree, axis=1)
+    reach += graph.data
+    on = reach == np.take(dist, b, axis=1)
+    on &= reach < np.inf
+    row, edge = np.nonzero(on)
+    head, tail = row * n + a[edge], row * n + b[edge]
+    while True:
+        raised = depth.copy()
+        np.maximum.at(raised, tail, depth[head] + 1)
+        if np.array_equal(raised, depth):
+            break
+        depth = raised
+
+    order = np.argsort(depth[tail], kind="stable")
+    head, tail = head[order], tail[order]
+    levels = np.flatnonzero(np.diff(depth[tail])) + 1
+    groups = list(zip(np.split(head, levels), np.split(tail, levels)))
+    sigma = np.zeros(k * n)
+    sigma[base.ravel() + sources] = 1.0
+    for h, t in groups:
+        np.add.at(sigma, t, sigma[h])
+    delta = np.zeros(k * n)
+    for h, t in reversed(groups):
+        np.add.at(delta, h, sigma[h] / sigma[t] * (1.0 + delta[t]))
+    delta = delta.reshape(k, n)
+    delta[np.arange(k), sources] = 0.0
+    return delta.sum(axis=0)
+
+
+def betweenness(u, v, km, n, sources=None, workers=None):
+    """Normalised betweenness; from ``sources`` only (scaled by n/k) when given."""
+    if n < 3:
+        return np.zeros(n)
+    sources = np.arange(n) if sources is None else np.asarray(sources)
+    # Batches of sources bounded to ~8M station and edge entries each
+    batch = max(1, min(len(sources), (1 << 23) // (n + 2 * len(u))))
+    chunks = [sources[i:i + batch] for i in range(0, len(sources), batch)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks)))
+    if workers == 1:
+        _init_worker(u, v, km, n)
+        total = sum(map(_dependencies, chunks), np.zeros(n))
+        _WORKER.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(u, v, km, n)) as pool:
+            total = sum(pool.map(_dependencies, chunks), np.zeros(n))
+    total *= n / len(sources)
+    # Each undirected pair is counted from both ends
+    return total / ((n - 1) * (n - 2))
+
+
+def closeness(u, v, km, n, pivots=None, batch=256):
+    """Wasserman-Faust closeness, exact or estimated from distances to ``pivots``."""
+    from scipy.sparse.csgraph import dijkstra
+
+    if n < 2:
+        return np.zeros(n)
+    graph = _adjacency(u, v, km, n)
+    rows = np.arange(n) if pivots is None else np.asarray(pivots)
+    total = np.zeros(n)
+    reached = np.zeros(n)
+    for start in range(0, len(rows), batch):
+        dist = dijkstra(graph, directed=False, indices=rows[start:start + batch])
+        finite = np.isfinite(dist)
+        total += np.where(finite, dist, 0.0).sum(axis=0)
+        reached += finite.sum(axis=0)
+    # Distances are symmetric: column sums over sources are each station's sums
+    scale = n / len(rows)
+    others = np.maximum(reached * scale - 1, 0)
+    mean_km = np.divide(total * scale, others, out=np.zeros(n), where=others > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(mean_km > 0, (others / (n - 1)) / mean_km, 0.0)
+
+
+@dataclass
+class StationImportance:
+    """Per-station importance metrics (rows follow ``network.station_name``)."""
+
+    station_name: np.ndarray
+    degree: np.ndarray
+    route_count: np.ndarray
+    betweenness: np.ndarray
+    closeness: np.ndarray
+    exact: bool
+
+    def ranking(self, metric="betweenness"):
+        """Station ids from most to least important by ``metric``."""
+        return np.argsort(-getattr(self, metric), kind="stable")
+
+    def marker_sizes(self, metric="betweenness", min_size=20.0, max_size=300.0):
+        """Scatter sizes (area) growing with ``metric``: sqrt scaling keeps hubs legible."""
+        values = np.sqrt(np.maximum(getattr(self, metric).astype(np.float64), 0))
+        top = values.max(initial=0)
+        if top <= 0:
+            return np.full(len(values), min_size)
+        return min_size + (max_size - min_size) * values / top
+
+    def to_csv(self, path, network):
+        """Write the table, busiest (by betweenness) first."""
+        from railnet.stations import default_registry
+        from railnet.stats import fixed_cells, text_cells, write_csv
+
+        registry = default_registry()
+        ids = registry.resolve(network.station_name, network.station_lat, network.station_lon)
+        order = self.ranking()
+        write_csv(path, {
+            "rank": text_cells(np.arange(1, len(order) + 1)),
+            "station": text_cells(self.station_name[order]),
+            "code": text_cells(registry.codes(ids)[order]),
+            "lat": fixed_cells(network.station_lat[order], 4),
+            "lon": fixed_cells(network.station_lon[order], 4),
+            "degree": text_cells(self.degree[order]),
+            "routes": text_cells(self.route_count[order]),
+            "betweenness": fixed_cells(self.betweenness[order], 5),
+            "closeness": fixed_cells(self.closeness[order], 7),
+        })
+        return path
+
+
+def station_importance(network, exact=None, samples=DEFAULT_SAMPLES, workers=None, seed=0,
+                       use_cache=True):
+    """All metrics for ``network``; exact when ``exact`` or the graph is small."""
+    n = network.n_stations
+    u, v, km = station_graph(network)
+    exact = n <= EXACT_MAX_STATIONS if exact is None else exact
+    key = graph_hash(u, v, km, n, exact, samples, seed)
+    cache_file = cache_dir() / f"centrality-{key}.npz"
+    if use_cache and cache_file.exists():
+        with np.load(cache_file, allow_pickle=False) as npz:
+            return StationImportance(station_name=network.station_name, exact=exact,
+                                     **{m: npz[m] for m in METRICS})
+
+    with trace.span("centrality", stations=n, exact=exact):
+        degree = np.bincount(np.concatenate([u, v]), minlength=n)
+        sample = None
+        if not exact:
+            sample = np.sort(np.random.default_rng(seed).choice(n, min(samples, n),
+                                                                replace=False))
+        result = StationImportance(
+            station_name=network.station_name,
+            degree=degree,
+            route_count=network.station_route_counts(),
+            betweenness=betweenness(u, v, km, n, sample, workers),
+            closeness=closeness(u, v, km, n, sample),
+            exact=exact,
+        )
+    if use_cache:
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp, **{m: getattr(result, m) for m in METRICS})
+        os.replace(tmp, cache_file)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.centrality",
+                                     description="Station importance over all services.")
+    parser.add_argument("--services", nargs="+", default=[], help="default: all")
+    parser.add_argument("--exact", action="store_true", default=None,
+                        help="force exact betweenness/closeness")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help="sampled sources for large graphs")
+    parser.add_argument("--workers", type=int, help="processes for betweenness")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--top", type=int, default=15, help="print the N most central stations")
+    parser.add_argument("--out", default=IMPORTANCE_FILE, help="CSV path")
+    args = parser.parse_args(argv)
+
+    network = Network.load(*args.services, verbose=False)
+    t0 = time.perf_counter()
+    importance = station_importance(network, exact=args.exact, samples=args.samples,
+                                    workers=args.workers, use_cache=not args.no_cache)
+    seconds = time.perf_counter() - t0
+    importance.to_csv(args.out, network)
+    mode = "exact" if importance.exact else f"sampled, k={args.samples}"
+    print(f"✅ {network.n_stations} stations ({mode}) in {seconds:.2f}s -> {args.out}")
+    print(f"{'station':<28} {'degree':>6} {'routes':>6} {'betweenness':>11} {'closeness':>9}")
+    for i in importance.ranking()[:args.top]:
+        print(f"{importance.station_name[i]:<28} {importance.degree[i]:>6} "
+              f"{importance.route_count[i]:>6} {importance.betweenness[i]:>11.4f} "
+              f"{importance.closeness[i]:>9.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+``railnet`` command line: one entry point for every tool in the package.
+
+Each subcommand is a module with its own ``main(argv)``; the module is
+imported only when its subcommand runs, so ``railnet analyse station ...``
+never loads matplotlib, GeoPandas or scipy.
+
+    railnet render --maps vande_bharat --dpi 300
+    railnet analyse station "Varanasi Jn"
+    railnet route "New Delhi" "Chennai Central"
+    railnet export tiles premium_express --out build/tiles
+    railnet export html --services rajdhani duronto
+    railnet --trace trace.json render --maps vande_bharat
+"""
+
+import argparse
+import importlib
+import sys
+
+# command -> module, or {subcommand: module} for commands with several targets
+COMMANDS = {
+    "render": "railnet.batch",
+    "analyse": "railnet.analyse",
+    "importance": "railnet.centrality",
+    "corridors": "railnet.corridors",
+    "tracks": "railnet.tracks",
+    "route": "railnet.routing",
+    "serve": "railnet.service",
+    "dashboard": "railnet.dashboard",
+    "export": {"tiles": "railnet.tiles", "html": "railnet.webmap"},
+    "build": "railnet.build",
+    "ingest": "railnet.ingest",
+    "synth": "railnet.synth",
+    "stations": "railnet.stations",
+    "nearest": "railnet.spatial",
+    "interchanges": "railnet.interchange",
+    "basemap": "railnet.basemap",
+}
+HELP = {
+    "render": "render maps in parallel (railnet.batch)",
+    "analyse": "station queries, summaries, segment statistics",
+    "importance": "rank stations by degree, routes, betweenness, closeness",
+    "corridors": "per-segment route/service counts and weekly trains",
+    "tracks": "snap routes to rail geometry from a local OSM extract",
+    "route": "plan journeys across all services",
+    "serve": "JSON query service for stations, routes and paths",
+    "dashboard": "Streamlit dashboard with filters, search and statistics",
+    "export": "export maps for the web (tiles, interactive html)",
+    "build": "incremental rebuild of maps and statistics",
+    "ingest": "stream a large JSON/NDJSON/CSV route file into arrays",
+    "synth": "generate a synthetic network N times the real data",
+    "stations": "resolve stop names against the station registry",
+    "nearest": "nearest-station queries",
+    "interchanges": "group nearby stations into interchange complexes",
+    "basemap": "pre-warm the offline basemap tile store",
+}
+
+
+def _usage():
+    width = max(map(len, COMMANDS))
+    lines = [f"  {name:<{width}}  {HELP[name]}" for name in COMMANDS]
+    return "commands:\n" + "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(
+        prog="railnet", description="Indian railway network maps and analysis.",
+        epilog=_usage(), formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record per-stage timings as Chrome trace JSON and print a summary")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="per-stage peak allocations via tracemalloc (slower)")
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the command")
+    # Only the options before the command belong to railnet itself
+    split = next((i for i, a in enumerate(argv) if a in COMMANDS), len(argv))
+    args = parser.parse_args(argv[:split + 1] if split < len(argv) else argv or ["--help"])
+    rest = argv[split + 1:]
+
+    target = COMMANDS[args.command]
+    if isinstance(target, dict):
+        if not rest or rest[0] not in target:
+            parser.exit(2, f"usage: railnet {args.command} {{{','.join(target)}}} ...\n")
+        target, rest = target[rest[0]], rest[1:]
+    if not args.trace:
+        return importlib.import_module(target).main(rest)
+
+    from railnet import trace
+
+    trace.enable("tracemalloc" if args.trace_memory else "rss")
+    try:
+        with trace.span(args.command):
+            return importlib.import_module(target).main(rest)
+    finally:
+        trace.finish(args.trace)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
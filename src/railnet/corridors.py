@@ -0,0 +1,365 @@
+"""
+Shared corridors: every station-to-station segment once, however many routes use it.
+
+Consecutive stop pairs of all routes are keyed by their undirected station
+pair (``min(u, v) * n_stations + max(u, v)``, an int64 that doubles as a
+perfect hash), so Delhi -> Ambala on one route and Ambala -> Delhi on
+another are the same segment.
+
+Routes that run over the same track but stop at different stations would
+still overlap (a non-stop Delhi -> Kanpur pair on top of the Delhi ->
+Aligarh -> Tundla -> Kanpur pairs of a stopping train).  Before keying,
+each stop pair ``u``-``v`` therefore searches the segments of the other
+pairs, breadth first from ``u``, for a path to ``v`` of at most
+``SPLIT_DETOUR`` times their great-circle distance whose every hop is
+shorter than the pair and gets further from ``u`` and closer to ``v``.
+The pair is replaced by the shortest path of the first round that reaches
+``v`` (and the hops of that path are split in turn); pairs without one
+are kept as they are.  All pairs search together, one hop per vectorised
+round.  Per segment:
+
+* ``route_count``: distinct routes running over it,
+* ``service_count``: distinct services (Rajdhani, Vande Bharat …),
+* ``weekly_trains``: summed runs per week of those routes (from the
+  ``frequency`` text; routes without one are counted in
+  ``unknown_frequency`` instead).
+
+Map specs with ``"merge_corridors": True`` draw each segment once, coloured
+by its busiest service and with the line width growing with ``route_count``.
+
+    cd src && python -m railnet.corridors     # data/corridor_stats.csv
+"""
+
+import argparse
+import re
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from railnet.geodesy import haversine_km
+from railnet.loader import DATA_DIR
+from railnet.network import Network
+
+CORRIDOR_FILE = DATA_DIR / "corridor_stats.csv"
+RUNS_PER_WEEK = {
+    "daily": 7,
+    "six days a week": 6,
+    "five days a week": 5,
+    "four days a week": 4,
+    "tri-weekly": 3,
+    "bi-weekly": 2,
+    "weekly": 1,
+}
+_EXCEPT = re.compile(r"except\s+(\w+(?:\s*(?:,|and|&)\s*\w+)*)")
+# Merged lines are at most this many times the spec's route_line_width
+MAX_WIDTH_FACTOR = 4.0
+# A stop pair is split along intermediate stations whose path is at most this much longer
+SPLIT_DETOUR = 1.05
+
+
+def _runs(text):
+    text = text.strip().lower()
+    if text in RUNS_PER_WEEK:
+        return RUNS_PER_WEEK[text]
+    m = _EXCEPT.fullmatch(text)
+    if m:
+        return 7 - len(re.split(r"\s*(?:,|and|&)\s*", m.group(1)))
+    return np.nan
+
+
+def runs_per_week(network):
+    """Runs per week of every route (NaN when the frequency is missing or unknown)."""
+    per_category = np.array([_runs(str(c)) for c in network.frequency.categories],
+                            dtype=np.float64)
+    return per_category[network.frequency.codes]
+
+
+def corridor_widths(route_count, base, max_factor=MAX_WIDTH_FACTOR):
+    """Line widths growing with the square root of ``route_count``."""
+    return base * np.minimum(np.sqrt(route_count), max_factor)
+
+
+def edge_keys(u, v, n_stations):
+    """Undirected segment keys: the same for ``(u, v)`` and ``(v, u)``."""
+    u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+    return np.minimum(u, v) * n_stations + np.maximum(u, v)
+
+
+@dataclass
+class Corridors:
+    """Unique undirected segments ``u < v`` and their usage."""
+
+    key: np.ndarray
+    u: np.ndarray
+    v: np.ndarray
+    route_count: np.ndarray
+    service_count: np.ndarray
+    weekly_trains: np.ndarray
+    unknown_frequency: np.ndarray
+    # Busiest service of each segment and a route of that service (for colours)
+    main_service: np.ndarray
+    main_route: np.ndarray
+    # Segment and route of every (split) consecutive stop pair that was aggregated
+    segment_of_edge: np.ndarray
+    route_of_edge: np.ndarray
+
+    def __len__(self):
+        return len(self.key)
+
+    def km(self, network):
+        lat, lon = network.station_lat, network.station_lon
+        return haversine_km(lat[self.u], lon[self.u], lat[self.v], lon[self.v])
+
+    def widths(self, base, max_factor=MAX_WIDTH_FACTOR):
+        return corridor_widths(self.route_count, base, max_factor)
+
+    def to_csv(self, path, network):
+        """Write the segment table, busiest first."""
+        from railnet.stats import fixed_cells, text_cells, write_csv
+
+        order = np.lexsort((self.key, -self.weekly_trains, -self.route_count))
+        stations = network.station_name
+        write_csv(path, {
+            "from_station": text_cells(stations, self.u[order]),
+            "to_station": text_cells(stations, self.v[order]),
+            "gc_km": fixed_cells(self.km(network)[order], 2),
+            "routes": text_cells(self.route_count[order]),
+            "services": text_cells(self.service_count[order]),
+            "main_service": text_cells(network.service.categories, self.main_service[order]),
+            "weekly_trains": text_cells(self.weekly_trains[order].astype(np.int64)),
+            "unknown_frequency": text_cells(self.unknown_frequency[order]),
+        })
+        return path
+
+
+def _expand(u, v, n, keys, offsets, stations):
+    """Hops ``(a, b)`` along the paths of the pairs ``(u, v)`` and the pair of each hop.
+
+    ``keys``/``offsets``/``stations`` are the sorted segment keys and their
+    CSR station paths (``u < v`` order); pairs running ``v -> u`` walk them
+    backwards.
+    """
+    seg = np.searchsorted(keys, edge_keys(u, v, n))
+    hops = np.diff(offsets)[seg] - 1
+    pair = np.repeat(np.arange(len(u)), hops)
+    rank = np.arange(hops.sum()) - np.repeat(np.cumsum(hops) - hops, hops)
+    reverse = np.repeat(u > v, hops)
+    first, last = offsets[seg][pair], offsets[seg + 1][pair] - 1
+    a = np.where(reverse, last - rank, first + rank)
+    b = np.where(reverse, a - 1, a + 1)
+    return stations[a], stations[b], pair
+
+
+def _paths(owner, a, b, n_seg):
+    """CSR station paths from hops ``(a, b)`` grouped (in order) by segment ``owner``."""
+    offsets = np.zeros(n_seg + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=n_seg) + 1, out=offsets[1:])
+    rank = np.arange(len(owner)) - np.searchsorted(owner, owner)
+    stations = np.empty(offsets[-1], dtype=np.int64)
+    stations[offsets[owner] + rank] = a
+    stations[offsets[1:] - 1] = b[np.searchsorted(owner, np.arange(n_seg), side="right") - 1]
+    return offsets, stations
+
+
+def _split_paths(seg_u, seg_v, lat, lon, detour=SPLIT_DETOUR, max_rounds=8):
+    """Sorted keys and CSR ``(offsets, stations)`` path of every segment ``seg_u <= seg_v``.
+
+    A path is ``[u, v]`` unless a search over the other segments reaches ``v``
+    within ``detour`` times the direct distance (see the module docstring).
+    Every hop of a found path is itself a segment, whose own path replaces
+    it until nothing changes (at most ``max_rounds`` times).
+    """
+    n_seg, n = len(seg_u), len(lat)
+    keys = seg_u.astype(np.int64) * n + seg_v
+    km = haversine_km(lat[seg_u], lon[seg_u], lat[seg_v], lon[seg_v])
+    ends = np.concatenate([seg_u, seg_v])
+    order = np.argsort(ends, kind="stable")
+    neighbour = np.concatenate([seg_v, seg_u])[order].astype(np.int64)
+    step_km = np.concatenate([km, km])[order]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=n), out=offsets[1:])
+
+    # Search states (station, parent state) of all segments, one block per round
+    budget = detour * km
+    at_of, parent_of = [seg_u.astype(np.int64)], [np.full(n_seg, -1, dtype=np.int64)]
+    state = np.arange(n_seg)
+    f_seg, f_at = np.arange(n_seg), seg_u.astype(np.int64)
+    f_km, f_left, f_gone = np.zeros(n_seg), km, np.zeros(n_seg)
+    seen = np.sort(f_seg * n + f_at)
+    last_state = np.full(n_seg, -1, dtype=np.int64)
+    n_states, first_round = n_seg, True
+    while len(f_seg):
+        degree = offsets[f_at + 1] - offsets[f_at]
+        owner = np.repeat(np.arange(len(f_seg)), degree)
+        idx = np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+        idx += np.repeat(offsets[f_at], degree)
+        seg = f_seg[owner]
+        # Hops shorter than the segment (so splitting terminates) within the budget
+        cheap = (step_km[idx] < km[seg]) & (f_km[owner] + step_km[idx] <= budget[seg])
+        owner, idx, seg = owner[cheap], idx[cheap], seg[cheap]
+        w = neighbour[idx]
+        rest = haversine_km(lat[w], lon[w], lat[seg_v[seg]], lon[seg_v[seg]])
+        away = haversine_km(lat[w], lon[w], lat[seg_u[seg]], lon[seg_u[seg]])
+        via = f_km[owner] + step_km[idx] + rest
+        # ... including the rest of the way, closer to the target and further from
+        # the origin at every step
+        ok = (via <= budget[seg]) & (rest < f_left[owner]) & (away > f_gone[owner])
+        if first_round:
+            ok &= w != seg_v[seg]
+            first_round = False
+        # Segments reaching their target stop at their most direct arrival this round
+        arrive = np.flatnonzero(ok & (w == seg_v[seg]))
+        arrive = arrive[np.lexsort((via[arrive], seg[arrive]))]
+        if len(arrive):
+            arrive = arrive[np.r_[True, seg[arrive][1:] != seg[arrive][:-1]]]
+        last_state[seg[arrive]] = state[owner[arrive]]
+        # The others continue from every (segment, station) not reached before
+        go = np.flatnonzero(ok & (w != seg_v[seg]))
+        go = go[last_state[seg[go]] < 0]
+        key = seg[go] * n + w[go]
+        new = seen[np.minimum(np.searchsorted(seen, key), len(seen) - 1)] != key
+        go, key = go[new], key[new]
+        order = np.lexsort((via[go], key))
+        go, key = go[order], key[order]
+        if len(go):
+            first = np.r_[True, key[1:] != key[:-1]]
+            go, key = go[first], key[first]
+        seen = np.sort(np.concatenate([seen, key]), kind="mergesort")
+        at_of.append(w[go])
+        parent_of.append(state[owner[go]])
+        state = n_states + np.arange(len(go))
+        n_states += len(go)
+        f_seg, f_at = seg[go], w[go]
+        f_km, f_left, f_gone = f_km[owner[go]] + step_km[idx[go]], rest[go], away[go]
+
+    # Inner stations of every found path, walked back from its last state
+    at_of, parent_of = np.concatenate(at_of), np.concatenate(parent_of)
+    inner_seg, inner, depth = [], [], []
+    found = np.flatnonzero(last_state >= n_seg)
+    cursor, level = last_state[found], 0
+    while len(found):
+        inner_seg.append(found)
+        inner.append(at_of[cursor])
+        depth.append(np.full(len(found), level))
+        cursor, level = parent_of[cursor], level - 1
+        more = cursor >= n_seg
+        found, cursor = found[more], cursor[more]
+    inner_seg = np.concatenate(inner_seg) if inner_seg else np.zeros(0, dtype=np.int64)
+    inner = np.concatenate(inner) if inner else np.zeros(0, dtype=np.int64)
+    depth = np.concatenate(depth) if depth else np.zeros(0, dtype=np.int64)
+    order = np.lexsort((depth, inner_seg))
+    inner_seg, inner = inner_seg[order], inner[order]
+    path_offsets = np.zeros(n_seg + 1, dtype=np.int64)
+    np.cumsum(np.bincount(inner_seg, minlength=n_seg) + 2, out=path_offsets[1:])
+    stations = np.empty(path_offsets[-1], dtype=np.int64)
+    stations[path_offsets[:-1]] = seg_u
+    stations[path_offsets[1:] - 1] = seg_v
+    rank = np.arange(len(inner_seg)) - np.searchsorted(inner_seg, inner_seg)
+    stations[path_offsets[inner_seg] + 1 + rank] = inner
+
+    hop = np.ones(len(stations) - 1, dtype=bool)
+    hop[path_offsets[1:-1] - 1] = False
+    a, b = stations[:-1][hop], stations[1:][hop]
+    owner = np.repeat(np.arange(n_seg), np.diff(path_offsets) - 1)
+    for _ in range(max_rounds):
+        a2, b2, pair = _expand(a, b, n, keys, path_offsets, stations)
+        if len(a2) == len(a):
+            break
+        a, b, owner = a2, b2, owner[pair]
+        path_offsets, stations = _paths(owner, a, b, n_seg)
+    return keys, path_offsets, stations
+
+
+def split_edges(network, route_mask=None, detour=SPLIT_DETOUR):
+    """``(u, v, route_ids)`` of the consecutive stop pairs, each split along the
+    stations other routes stop at on the same stretch (see :func:`_split_paths`)."""
+    u, v, route_ids = network.edges()
+    if route_mask is not None:
+        keep = route_mask[route_ids]
+        u, v, route_ids = u[keep], v[keep], route_ids[keep]
+    n = network.n_stations
+    keys = np.unique(edge_keys(u, v, n))
+    _, offsets, stations = _split_paths(keys // n, keys % n, network.station_lat,
+                                        network.station_lon, detour)
+    a, b, edge = _expand(u, v, n, keys, offsets, stations)
+    return a, b, route_ids[edge]
+
+
+def corridors(network, route_mask=None, split=True):
+    """:class:`Corridors` of ``network`` (routes in ``route_mask`` only, when given).
+
+    ``split`` merges stop pairs that run along other routes' stations
+    (:func:`split_edges`); without it only identical station pairs merge.
+    """
+    if split:
+        u, v, route_ids = split_edges(network, route_mask)
+    else:
+        u, v, route_ids = network.edges()
+        if route_mask is not None:
+            keep = route_mask[route_ids]
+            u, v, route_ids = u[keep], v[keep], route_ids[keep]
+    n = network.n_stations
+    keys, segment_of_edge = np.unique(edge_keys(u, v, n), return_inverse=True)
+    n_segments = len(keys)
+
+    # One row per (segment, route): a route looping over a segment counts once
+    pairs = np.unique(segment_of_edge.astype(np.int64) * network.n_routes + route_ids)
+    seg, route = np.divmod(pairs, network.n_routes)
+    runs = runs_per_week(network)[route]
+    known = np.isfinite(runs)
+    service = network.service.codes[route].astype(np.int64)
+
+    k = len(network.service.categories)
+    by_service, per_service = np.unique(seg * k + service, return_counts=True)
+    service_seg, service_code = np.divmod(by_service, k)
+    # Busiest service per segment: last of each segment after sorting by count
+    order = np.lexsort((per_service, service_seg))
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = service_seg[order][1:] != service_seg[order][:-1]
+    main_service = np.empty(n_segments, dtype=np.int64)
+    main_service[service_seg[order][last]] = service_code[order][last]
+    # First route (lowest id) of the main service on each segment
+    main = np.flatnonzero(service == main_service[seg])
+    _, first = np.unique(seg[main], return_index=True)
+    main_route = route[main[first]]
+
+    return Corridors(
+        key=keys,
+        u=keys // n,
+        v=keys % n,
+        route_count=np.bincount(seg, minlength=n_segments),
+        service_count=np.bincount(service_seg, minlength=n_segments),
+        weekly_trains=np.bincount(seg[known], weights=runs[known], minlength=n_segments),
+        unknown_frequency=np.bincount(seg[~known], minlength=n_segments),
+        main_service=main_service,
+        main_route=main_route,
+        segment_of_edge=segment_of_edge,
+        route_of_edge=route_ids,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.corridors",
+                                     description="Per-segment usage across all routes.")
+    parser.add_argument("--services", nargs="+", default=[], help="default: all")
+    parser.add_argument("--top", type=int, default=10, help="print the N busiest segments")
+    parser.add_argument("--out", default=CORRIDOR_FILE, help="CSV path")
+    args = parser.parse_args(argv)
+
+    network = Network.load(*args.services, verbose=False)
+    t0 = time.perf_counter()
+    result = corridors(network)
+    seconds = time.perf_counter() - t0
+    result.to_csv(args.out, network)
+    edges = network.n_stops - network.n_routes
+    print(f"✅ {edges} route segments -> {len(result)} corridor segments "
+          f"({edges / max(len(result), 1):.1f}x fewer) in {seconds:.2f}s -> {args.out}")
+    names = network.station_name
+    for i in np.lexsort((result.key, -result.route_count))[:args.top]:
+        print(f"  {names[result.u[i]]:>24} – {names[result.v[i]]:<24} "
+              f"{result.route_count[i]:>3} routes {result.weekly_trains[i]:>5.0f}/week")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Streamlit dashboard: service/status filters, station search, route highlight, statistics.
+
+Everything that depends only on the dataset is built once per dataset hash
+by :class:`Dashboard` and kept with ``st.cache_resource``: the network
+(through the hashed ``.npz`` loader cache), Web Mercator projection, the
+level-of-detail chains of the overview map (:class:`railnet.lod.RouteLOD`),
+the (segment, route) pairs of the shared corridors and a stations x
+(service, status) route-count matrix.  Filters, search and highlighting
+then only index into those arrays: a filter is a boolean mask over the
+few (service, status) groups, broadcast to routes, chains and stations.
+
+    streamlit run src/dashboard.py
+    railnet dashboard                                  # same, via the CLI
+    cd src && python -m railnet.dashboard --bench --routes ../build/synthetic/routes_x10.json
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from railnet.geodesy import haversine_km
+from railnet.loader import DATA_DIR, SERVICES, content_hash, file_hash
+from railnet.network import Network
+from railnet.synth import SYNTH_DIR
+
+# Overview map detail: LOD level of a zoom-7 web map (~600 m tolerance)
+DASHBOARD_ZOOM = 7
+ALL_SERVICES = "All services (data/)"
+APP_FILE = Path(__file__).resolve().parents[1] / "dashboard.py"
+_HASHES = {}
+
+
+def dataset_hash(path=None):
+    """Content hash of a route file, or of all service files for ``None``.
+
+    Hashes are remembered per (path, mtime, size), so reruns only ``stat``.
+    """
+    paths = [Path(path)] if path else sorted({DATA_DIR / f for f, _, _ in SERVICES.values()})
+    stamp = tuple((str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in paths)
+    if stamp not in _HASHES:
+        _HASHES[stamp] = content_hash("".join(file_hash(p) for p in paths).encode())
+    return _HASHES[stamp]
+
+
+def datasets():
+    """Selectable datasets: label -> route file (``None``: the service files in data/)."""
+    found = {ALL_SERVICES: None}
+    for path in sorted(SYNTH_DIR.glob("*.json")):
+        found[f"Synthetic {path.stem}"] = path
+    return found
+
+
+def _rgb(color):
+    color = color.lstrip("#")
+    return [int(color[i:i + 2], 16) for i in (0, 2, 4)]
+
+
+class Dashboard:
+    """Per-dataset arrays; every method after ``__init__`` only slices them."""
+
+    def __init__(self, network: Network, zoom=DASHBOARD_ZOOM):
+        from railnet.geometry import WEB_MERCATOR, project_lonlat
+        from railnet.lod import RouteLOD
+        from railnet.webmap import SERVICE_COLORS
+
+        self.network = network
+        net = network
+        n, n_routes = net.n_stations, net.n_routes
+        self.services = [str(s) for s in net.service.categories]
+        self.statuses = [str(s) for s in net.status.categories]
+        n_status = len(self.statuses)
+        self.n_groups = len(self.services) * n_status
+        self.route_group = net.service.codes.astype(np.int64) * n_status + net.status.codes
+        # One shared [r, g, b] list per service, so slices need no conversion
+        palette = np.empty(len(self.services), dtype=object)
+        palette[:] = [_rgb(SERVICE_COLORS.get(s, "#555555")) for s in self.services]
+        self.route_color = palette[net.service.codes]
+
+        u, v, route_ids = net.edges()
+        lat, lon = net.station_lat, net.station_lon
+        self.route_km = np.bincount(route_ids, weights=haversine_km(lat[u], lon[u], lat[v], lon[v]),
+                                    minlength=n_routes)
+        self.route_stops = net.route_lengths()
+        self.station_offsets, self.station_route_ids = net.station_routes()
+        # Routes per station and (service, status) group; a looping route counts once
+        calls = np.unique(net.stop_route_ids().astype(np.int64) * n + net.route_stops)
+        call_route, call_station = np.divmod(calls, n)
+        self.station_groups = np.bincount(
+            call_station * self.n_groups + self.route_group[call_route],
+            minlength=n * self.n_groups).reshape(n, self.n_groups)
+        self._lower = np.char.lower(net.station_name.astype(str))
+
+        x, y = project_lonlat(lon, lat, WEB_MERCATOR)
+        lod = RouteLOD(net, x, y)
+        self.corridors = lod.corridors
+        kept = lod.kept(zoom)
+        bounds = np.searchsorted(kept, lod.chain_offsets)
+        stations = lod.vertex_station[kept]
+        lonlat = np.column_stack([lon[stations], lat[stations]]).round(5).tolist()
+        self.chain_paths = np.empty(lod.n_chains, dtype=object)
+        self.chain_paths[:] = [lonlat[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        self.pair_chain, self.pair_route = lod.pair_chain, lod.pair_route
+        self.n_chains = lod.n_chains
+        pairs = np.unique(self.corridors.segment_of_edge.astype(np.int64) * n_routes
+                          + self.corridors.route_of_edge)
+        self.corridor_segment, self.corridor_route = np.divmod(pairs, n_routes)
+
+    @classmethod
+    def load(cls, path=None):
+        """Dashboard of a route file, or of every service in data/ for ``None``."""
+        if path is None:
+            return cls(Network.load(verbose=False))
+        from railnet.loader import load_file
+
+        return cls(Network.from_routes(load_file(path)))
+
+    def group_mask(self, services=None, statuses=None):
+        """Selected (service, status) groups; ``None`` selects everything."""
+        service_ok = np.isin(self.services, self.services if services is None else services)
+        status_ok = np.isin(self.statuses, self.statuses if statuses is None else statuses)
+        return (service_ok[:, None] & status_ok[None, :]).ravel()
+
+    def route_mask(self, groups):
+        return groups[self.route_group]
+
+    def station_counts(self, groups):
+        """Selected routes calling at each station."""
+        return self.station_groups[:, groups].sum(axis=1)
+
+    def search(self, text, limit=20):
+        """Station ids whose name starts with, then contains, ``text`` (case-insensitive)."""
+        found = np.char.find(self._lower, text.strip().lower())
+        return np.concatenate([np.flatnonzero(found == 0), np.flatnonzero(found > 0)])[:limit]
+
+    def routes_at(self, station, routes):
+        """Ids of ``routes`` (mask) calling at ``station``."""
+        start, stop = self.station_offsets[station], self.station_offsets[station + 1]
+        ids = np.unique(self.station_route_ids[start:stop])
+        return ids[routes[ids]]
+
+    def map_paths(self, routes):
+        """Overview paths of the selected routes as columns, each shared chain once.
+
+        A chain is coloured by the service of its lowest selected route id and
+        its width counts the selected routes on it.
+        """
+        on = np.flatnonzero(routes[self.pair_route])
+        chain, route = self.pair_chain[on], self.pair_route[on]
+        counts = np.bincount(chain, minlength=self.n_chains)
+        # pair_route is sorted, so the first pair of each chain has its lowest route
+        visible, first = np.unique(chain, return_index=True)
+        return {"path": self.chain_paths[visible], "color": self.route_color[route[first]],
+                "routes": counts[visible]}
+
+    def route_detail(self, i):
+        """Stops of route ``i`` with cumulative great-circle km."""
+        net = self.network
+        ids = net.route_station_ids(i)
+        lat, lon = net.station_lat[ids], net.station_lon[ids]
+        km = np.concatenate([[0.0], np.cumsum(haversine_km(lat[:-1], lon[:-1], lat[1:], lon[1:]))])
+        return {
+            "name": str(net.name[i]),
+            "service": net.service_label(i),
+            "train_number": str(net.train_number[i]),
+            "stations": net.station_name[ids].tolist(),
+            "km": km.round(1).tolist(),
+            "path": np.column_stack([lon, lat]).tolist(),
+        }
+
+    def stats(self, groups, top=10):
+        """Summary, per-service table, busiest stations and corridors of the selection."""
+        net = self.network
+        routes = self.route_mask(groups)
+        counts = self.station_counts(groups)
+        per_group = self.station_groups[:, groups] > 0
+        service_of_group = np.repeat(np.arange(len(self.services)), len(self.statuses))[groups]
+        by_service = []
+        for s in np.unique(service_of_group).tolist():
+            on = routes & (net.service.codes == s)
+            speed = net.average_speed_kmph[on]
+            speed = speed[np.isfinite(speed)]
+            by_service.append({
+                "service": SERVICES[self.services[s]][2] if self.services[s] in SERVICES
+                else self.services[s],
+                "routes": int(on.sum()),
+                "stations": int(per_group[:, service_of_group == s].any(axis=1).sum()),
+                "route_km": round(float(self.route_km[on].sum())),
+                "avg_speed_kmph": round(float(speed.mean()), 1) if len(speed) else None,
+            })
+
+        busiest = np.argsort(-counts, kind="stable")[:top]
+        on = routes[self.corridor_route]
+        seg_routes = np.bincount(self.corridor_segment[on], minlength=len(self.corridors))
+        corridors = np.argsort(-seg_routes, kind="stable")[:top]
+        names = net.station_name
+        return {
+            "routes": int(routes.sum()),
+            "stations": int((counts > 0).sum()),
+            "stops": int(self.route_stops[routes].sum()),
+            "route_km": float(self.route_km[routes].sum()),
+            "by_service": by_service,
+            "top_stations": [{"station": str(names[i]), "routes": int(counts[i])}
+                             for i in busiest if counts[i] > 0],
+            "top_corridors": [{"from": str(names[self.corridors.u[i]]),
+                               "to": str(names[self.corridors.v[i]]),
+                               "routes": int(seg_routes[i])}
+                              for i in corridors if seg_routes[i] > 0],
+        }
+
+
+def load_dashboard(dataset_key, _path=None):
+    """:meth:`Dashboard.load`; ``dataset_key`` keys Streamlit's cache (``_path`` is not hashed)."""
+    return Dashboard.load(_path)
+
+
+def app():
+    """The Streamlit page (run with ``streamlit run src/dashboard.py``)."""
+    import pandas as pd
+    import pydeck as pdk
+    import streamlit as st
+
+    st.set_page_config(page_title="Indian Railways Network", layout="wide")
+    load = st.cache_resource(show_spinner="Indexing network…", max_entries=4)(load_dashboard)
+
+    sidebar = st.sidebar
+    choices = datasets()
+    label = sidebar.selectbox("Dataset", list(choices))
+    path = choices[label]
+    board = load(dataset_hash(path), path)
+    net = board.network
+
+    labels = {s: SERVICES[s][2] if s in SERVICES else s for s in board.services}
+    services = sidebar.multiselect("Services", board.services, default=board.services,
+                                   format_func=labels.get)
+    statuses = sidebar.multiselect("Status", board.statuses, default=board.statuses)
+    groups = board.group_mask(services, statuses)
+    routes = board.route_mask(groups)
+
+    query = sidebar.text_input("Station search")
+    station = None
+    if query:
+        found = board.search(query).tolist()
+        if found:
+            station = sidebar.selectbox("Station", found, format_func=lambda i: net.station_name[i])
+        else:
+            sidebar.caption("No station matches.")
+    candidates = board.routes_at(station, routes) if station is not None else np.flatnonzero(routes)
+    route = sidebar.selectbox("Highlight route", [None] + candidates.tolist(),
+                              format_func=lambda i: "—" if i is None
+                              else f"{net.service_label(i)}: {net.name[i]}")
+
+    stats = board.stats(groups)
+    cols = st.columns(4)
+    cols[0].metric("Routes", f"{stats['routes']:,}")
+    cols[1].metric("Stations", f"{stats['stations']:,}")
+    cols[2].metric("Stops", f"{stats['stops']:,}")
+    cols[3].metric("Route km", f"{stats['route_km']:,.0f}")
+
+    counts = board.station_counts(groups)
+    served = np.flatnonzero(counts > 0)
+    layers = [
+        pdk.Layer("PathLayer", pd.DataFrame(board.map_paths(routes)), get_path="path",
+                  get_color="color", get_width="routes", width_scale=2, width_min_pixels=1,
+                  width_max_pixels=8, pickable=True),
+        pdk.Layer("ScatterplotLayer", pd.DataFrame({
+            "name": net.station_name[served], "lon": net.station_lon[served],
+            "lat": net.station_lat[served], "routes": counts[served]}),
+            get_position=["lon", "lat"], get_radius="routes", radius_scale=1500,
+            radius_min_pixels=2, radius_max_pixels=10, get_fill_color=[255, 165, 0],
+            get_line_color=[51, 51, 51], stroked=True, line_width_min_pixels=1, pickable=True),
+    ]
+    detail = board.route_detail(route) if route is not None else None
+    if detail:
+        layers.append(pdk.Layer("PathLayer", [detail], get_path="path",
+                                get_color=[20, 20, 20], width_min_pixels=4))
+    if station is not None:
+        layers.append(pdk.Layer("ScatterplotLayer", [{
+            "lon": float(net.station_lon[station]), "lat": float(net.station_lat[station])}],
+            get_position=["lon", "lat"], get_fill_color=[0, 0, 0], radius_min_pixels=8))
+    st.pydeck_chart(pdk.Deck(
+        layers=layers, map_style=None,
+        initial_view_state=pdk.ViewState(latitude=22.5, longitude=80.0, zoom=4),
+        tooltip={"text": "{name}\n{routes} routes"}))
+
+    left, middle, right = st.columns(3)
+    left.subheader("By service")
+    left.dataframe(pd.DataFrame(stats["by_service"]), hide_index=True)
+    middle.subheader("Busiest stations")
+    middle.dataframe(pd.DataFrame(stats["top_stations"]), hide_index=True)
+    right.subheader("Busiest corridors")
+    right.dataframe(pd.DataFrame(stats["top_corridors"]), hide_index=True)
+    if detail:
+        st.subheader(f"{detail['service']}: {detail['name']} {detail['train_number']}")
+        st.dataframe(pd.DataFrame({"station": detail["stations"], "km": detail["km"]}),
+                     hide_index=True)
+
+
+def _bench(board, trials, seed=0):
+    """Worst-case seconds of each interaction over random filter selections."""
+    rng = np.random.default_rng(seed)
+    names = board.network.station_name
+    worst = {"filter + stats": 0.0, "map paths": 0.0, "search": 0.0, "highlight": 0.0}
+    for _ in range(trials):
+        services = [s for s in board.services if rng.random() < 0.7] or board.services[:1]
+        station = int(rng.integers(len(names)))
+        t0 = time.perf_counter()
+        groups = board.group_mask(services, None)
+        routes = board.route_mask(groups)
+        board.stats(groups)
+        t1 = time.perf_counter()
+        board.map_paths(routes)
+        t2 = time.perf_counter()
+        board.search(str(names[station])[:4])
+        t3 = time.perf_counter()
+        candidates = board.routes_at(station, routes)
+        if len(candidates):
+            board.route_detail(int(candidates[0]))
+        t4 = time.perf_counter()
+        for key, seconds in zip(worst, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            worst[key] = max(worst[key], seconds)
+    return worst
+
+
+def _app_env(environ=os.environ):
+    """``environ`` with the app's directory prepended to any existing ``PYTHONPATH``."""
+    paths = [str(APP_FILE.parent), environ.get("PYTHONPATH", "")]
+    return {**environ, "PYTHONPATH": os.pathsep.join(p for p in paths if p)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.dashboard",
+                                     description="Interactive Streamlit dashboard.")
+    parser.add_argument("--bench", action="store_true",
+                        help="time the dashboard's interactions instead of serving it")
+    parser.add_argument("--routes", help="route file for --bench (default: data/ services)")
+    parser.add_argument("--trials", type=int, default=50)
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    if args.bench:
+        t0 = time.perf_counter()
+        board = Dashboard.load(args.routes)
+        print(f"✅ {board.network.n_routes} routes, {board.network.n_stations} stations, "
+              f"{board.n_chains} map chains indexed in {time.perf_counter() - t0:.2f}s")
+        for name, seconds in _bench(board, args.trials).items():
+            print(f"  {name:<15} worst {seconds * 1000:7.1f} ms")
+        return 0
+
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("❌ Error: the dashboard needs streamlit (pip install streamlit)")
+        return 1
+    return subprocess.call([sys.executable, "-m", "streamlit", "run", str(APP_FILE),
+                            *streamlit_args], cwd=APP_FILE.parent,
+                           env=_app_env())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""
+Collection-based drawing primitives.
+
+Every route segment of a map goes into one ``LineCollection`` (colours and
+widths are per-segment arrays) and stations into at most two scatter
+collections, so the number of matplotlib artists does not grow with the
+number of routes or stations.
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+
+# Marker styles for interchange (served by >1 route) and ordinary stations
+TRANSFER_STYLE = dict(marker="s", s=120, facecolor="white", edgecolor="black", linewidth=0.8)
+STATION_STYLE = dict(marker="o", s=70, facecolor="white", edgecolor="black", linewidth=0.8)
+
+
+def route_segments(network, x, y, route_mask=None):
+    """Consecutive-stop segments as an ``(n, 2, 2)`` array plus their route ids."""
+    u, v, route_ids = network.edges()
+    if route_mask is not None:
+        keep = route_mask[route_ids]
+        u, v, route_ids = u[keep], v[keep], route_ids[keep]
+    segments = np.empty((len(u), 2, 2), dtype=np.float64)
+    segments[:, 0, 0], segments[:, 0, 1] = x[u], y[u]
+    segments[:, 1, 0], segments[:, 1, 1] = x[v], y[v]
+    return segments, route_ids
+
+
+def draw_segments(ax, segments, colors, linewidths=2, alpha=1.0, zorder=2):
+    """Add all ``segments`` to ``ax`` as a single ``LineCollection``."""
+    collection = LineCollection(segments, colors=to_rgba_array(colors),
+                                linewidths=linewidths, alpha=alpha, zorder=zorder,
+                                capstyle="round", joinstyle="round")
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def draw_stations(ax, x, y, sizes=50, color="#FFA500", edgecolor="black",
+                  linewidth=0.5, marker="o", zorder=3, label=None):
+    """All stations in one scatter collection."""
+    return ax.scatter(x, y, s=sizes, c=color, edgecolors=edgecolor, linewidths=linewidth,
+                      marker=marker, zorder=zorder, label=label)
+
+
+def draw_transfer_stations(ax, x, y, is_transfer, sizes=None, zorder=2):
+    """Squares for interchanges, circles otherwise: two collections in total.
+
+    ``sizes`` (one marker area per station) overrides the styles' fixed sizes.
+    """
+    artists = []
+    for mask, style in ((is_transfer, TRANSFER_STYLE), (~is_transfer, STATION_STYLE)):
+        if mask.any():
+            if sizes is not None:
+                style = {**style, "s": sizes[mask]}
+            artists.append(ax.scatter(x[mask], y[mask], zorder=zorder, **style))
+    return artists
@@ -0,0 +1,77 @@
+"""
+Bulk GeoDataFrame construction from a :class:`~railnet.network.Network`.
+
+Coordinates are projected once for the whole station table and the route
+``LineString``s are built with a single ``shapely.linestrings`` call using
+the CSR stop indices, so no per-stop ``Point`` objects are created.
+GeoPandas/shapely are imported on first use: callers that only need
+:func:`project_lonlat` (the renderer, tiles, builds) do not pay for them.
+"""
+
+import numpy as np
+from pyproj import Transformer
+
+WEB_MERCATOR = "EPSG:3857"
+
+
+def project_lonlat(lon, lat, crs=WEB_MERCATOR):
+    """Project lon/lat arrays (EPSG:4326) to ``crs`` in one vectorised call."""
+    if crs in ("EPSG:4326", 4326):
+        return np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+    transformer = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
+    return transformer.transform(np.asarray(lon, dtype=np.float64),
+                                 np.asarray(lat, dtype=np.float64))
+
+
+def build_stations_gdf(network, crs=WEB_MERCATOR, xy=None):
+    """One row per deduplicated station with its route count."""
+    import geopandas as gpd
+
+    x, y = xy if xy is not None else project_lonlat(network.station_lon, network.station_lat, crs)
+    return gpd.GeoDataFrame(
+        {
+            "station_id": np.arange(network.n_stations, dtype=np.int32),
+            "name": network.station_name.astype(object),
+            "lat": network.station_lat,
+            "lon": network.station_lon,
+            "route_count": network.station_route_counts(),
+        },
+        geometry=gpd.points_from_xy(x, y),
+        crs=crs,
+    )
+
+
+def build_routes_gdf(network, crs=WEB_MERCATOR, xy=None):
+    """One ``LineString`` per route with two or more stops."""
+    import geopandas as gpd
+    import shapely
+
+    x, y = xy if xy is not None else project_lonlat(network.station_lon, network.station_lat, crs)
+    keep = np.flatnonzero(network.route_lengths() > 1)
+    stop_route = network.stop_route_ids()
+    stop_mask = np.isin(stop_route, keep)
+    stops = network.route_stops[stop_mask]
+    lines = shapely.linestrings(np.column_stack([x[stops], y[stops]]),
+                                indices=np.searchsorted(keep, stop_route[stop_mask]))
+    service = network.service[keep]
+    return gpd.GeoDataFrame(
+        {
+            "route_id": keep.astype(np.int32),
+            "name": network.name[keep].astype(object),
+            "service": service.values.astype(object),
+            "type": [network.service_label(i) for i in keep],
+            "status": network.status[keep].values.astype(object),
+            "train_number": network.train_number[keep].astype(object),
+            "frequency": network.frequency[keep].values.astype(object),
+            "max_speed_kmph": network.max_speed_kmph[keep],
+            "distance_km": network.distance_km[keep],
+        },
+        geometry=lines,
+        crs=crs,
+    )
+
+
+def build_geodataframes(network, crs=WEB_MERCATOR):
+    """``(stations_gdf, routes_gdf)`` in ``crs``, projecting the station table once."""
+    xy = project_lonlat(network.station_lon, network.station_lat, crs)
+    return build_stations_gdf(network, crs, xy), build_routes_gdf(network, crs, xy)
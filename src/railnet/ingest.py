@@ -0,0 +1,370 @@
+"""
+Streaming ingestion of route files into columnar :class:`RouteData`.
+
+``json.loads`` on a whole file keeps the raw text, the parsed dict tree and
+the intermediate Python lists alive at once, so peak memory is several
+times the file size.  The readers here parse one route at a time and append
+it straight into growable numpy columns (strings interned to integer codes),
+so peak memory is the size of the compact output plus one read buffer,
+whatever the size of the input.
+
+Supported inputs:
+
+* ``.json``: the existing schemas (``{"routes": [...]}`` or
+  ``{"<service>_express_routes": {"routes": [...]}, ...}``) or a top-level
+  array of routes; routes are decoded one element at a time,
+* ``.ndjson`` / ``.jsonl``: one route object per line,
+* ``.csv``: one row per stop (see ``CSV_COLUMNS``); consecutive rows with
+  the same ``route_id`` form a route.
+
+Routes may carry a ``"service"`` key; otherwise the section (JSON) or the
+``service`` argument decides.
+
+For national-scale files :func:`ingest_network` skips the per-stop string
+columns of :class:`RouteData` altogether and builds the deduplicated
+:class:`~railnet.network.Network` from the interned codes.
+
+    cd src && python -m railnet.ingest ../data/national.ndjson --out national.npz
+"""
+
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from railnet.loader import _ROUTE_FIELDS, _STOP_FIELDS, ROUTE_COLUMNS, SERVICES, RouteData
+from railnet.trace import peak_rss_mb
+
+CHUNK_CHARS = 1 << 20
+CSV_COLUMNS = (("route_id", "service") + tuple(key for key, _, _ in ROUTE_COLUMNS.values())
+               + ("station", "lat", "lon", "stop_type"))
+FORMATS = {".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+
+_SECTIONS = {section: key for key, (_, section, _) in SERVICES.items()}
+
+
+class _Floats:
+    """Append-only float64 column with amortised doubling."""
+
+    def __init__(self, capacity=1024):
+        self.data = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+
+    def extend(self, values):
+        k = len(values)
+        if self.n + k > len(self.data):
+            grown = np.empty(max(2 * len(self.data), self.n + k), dtype=np.float64)
+            grown[:self.n] = self.data[:self.n]
+            self.data = grown
+        self.data[self.n:self.n + k] = values
+        self.n += k
+
+    def array(self):
+        return self.data[:self.n].copy()
+
+
+class _Strings:
+    """Append-only string column stored as int32 codes into a value table."""
+
+    def __init__(self, capacity=1024):
+        self.codes = np.empty(capacity, dtype=np.int32)
+        self.index = {}
+        self.n = 0
+
+    def extend(self, values):
+        index = self.index
+        codes = [index.setdefault(v, len(index)) for v in values]
+        k = len(codes)
+        if self.n + k > len(self.codes):
+            grown = np.empty(max(2 * len(self.codes), self.n + k), dtype=np.int32)
+            grown[:self.n] = self.codes[:self.n]
+            self.codes = grown
+        self.codes[self.n:self.n + k] = codes
+        self.n += k
+
+    def array(self):
+        table = np.array(list(self.index), dtype=str)
+        return table[self.codes[:self.n]] if len(table) else np.array([""] * self.n, dtype=str)
+
+    def sorted_codes(self):
+        """``(codes, table)`` with ``table`` sorted, as ``np.unique(..., return_inverse)``."""
+        table = np.array(list(self.index), dtype=str)
+        order = np.argsort(table, kind="stable")
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        return rank[self.codes[:self.n]], table[order]
+
+
+class RouteBuilder:
+    """Accumulates routes one at a time into the :class:`RouteData` columns."""
+
+    def __init__(self):
+        floats = {"stop_lat", "stop_lon"} | {c for c, (_, t, _) in ROUTE_COLUMNS.items()
+                                             if t is not str}
+        self.columns = {f: _Floats() if f in floats else _Strings()
+                        for f in _ROUTE_FIELDS + _STOP_FIELDS}
+        self.offsets = [0]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def add(self, service, route):
+        """Append one route dict (JSON schema) of ``service``."""
+        cols = self.columns
+        cols["service"].extend([route.get("service") or service])
+        for col, (key, dtype, missing) in ROUTE_COLUMNS.items():
+            value = route.get(key)
+            if value is None or value == "":
+                value = missing
+            cols[col].extend([str(value) if dtype is str else float(value)])
+        stations = route["stations"]
+        cols["stop_name"].extend([s["name"] for s in stations])
+        cols["stop_lat"].extend([s["lat"] for s in stations])
+        cols["stop_lon"].extend([s["lon"] for s in stations])
+        cols["stop_type"].extend([s.get("stop_type") or "" for s in stations])
+        self.offsets.append(self.offsets[-1] + len(stations))
+
+    def finish(self):
+        return RouteData(stop_offsets=np.array(self.offsets, dtype=np.int64),
+                         **{f: c.array() for f, c in self.columns.items()})
+
+    def network(self):
+        """:class:`Network` built from the interned codes, never materialising the
+        per-stop name array (same result as ``Network.from_routes(self.finish())``)."""
+        from railnet.network import Categorical, Network, parse_duration_min, station_coordinates
+
+        cols = self.columns
+
+        def categorical(field):
+            codes, categories = cols[field].sorted_codes()
+            return Categorical(codes.astype(np.int8 if len(categories) < 128 else np.int32),
+                               categories)
+
+        stops, names = cols["stop_name"].sorted_codes()
+        lat, lon = station_coordinates(names, stops, cols["stop_lat"].array(),
+                                       cols["stop_lon"].array())
+        return Network(
+            station_name=names,
+            station_lat=lat,
+            station_lon=lon,
+            route_offsets=np.array(self.offsets, dtype=np.int64),
+            route_stops=stops,
+            service=categorical("service"),
+            name=cols["name"].array(),
+            status=categorical("status"),
+            train_number=cols["train_number"].array(),
+            frequency=categorical("frequency"),
+            max_speed_kmph=cols["max_speed_kmph"].array(),
+            average_speed_kmph=cols["average_speed_kmph"].array(),
+            distance_km=cols["distance_km"].array(),
+            travel_time_min=np.array([parse_duration_min(t) for t in cols["travel_time"].array()],
+                                     dtype=np.float64),
+            stop_type=categorical("stop_type"),
+        )
+
+
+_SCALAR_END = " \t\r\n,]}"
+
+
+class _Stream:
+    """Character buffer over a text file with JSON-aware helpers."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, f, chunk_chars=CHUNK_CHARS):
+        self.f, self.chunk = f, chunk_chars
+        self.buf, self.pos = "", 0
+
+    def _fill(self):
+        more = self.f.read(self.chunk)
+        if not more:
+            return False
+        self.buf = self.buf[self.pos:] + more
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character without consuming it (``""`` at EOF)."""
+        while True:
+            n = len(self.buf)
+            while self.pos < n and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < n:
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected):
+        c = self.peek()
+        if c not in expected:
+            raise ValueError(f"expected one of {expected!r} at offset {self.pos}, got {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number is a prefix match ("1." decodes as 1): complete only once a
+            # delimiter or EOF follows it
+            if (not isinstance(obj, (dict, list, str))
+                    and (end == len(self.buf) or self.buf[end] not in _SCALAR_END)
+                    and self._fill()):
+                continue
+            self.pos = end
+            return obj
+
+
+def _array(stream, service):
+    stream.take("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+    while True:
+        yield service, stream.value()
+        if stream.take(",]") == "]":
+            return
+
+
+def iter_json(f, service=None, chunk_chars=CHUNK_CHARS):
+    """Yield ``(service, route)`` from a JSON route file, one route at a time."""
+    stream = _Stream(f, chunk_chars)
+    if stream.peek() == "[":
+        yield from _array(stream, service)
+        return
+    stream.take("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.take(":")
+        if key == "routes" and stream.peek() == "[":
+            yield from _array(stream, service or _SECTIONS["routes"])
+        elif stream.peek() == "{":
+            # Service section: {"routes": [...], other metadata}
+            section = _SECTIONS.get(key, key.removesuffix("_routes"))
+            stream.take("{")
+            if stream.peek() != "}":
+                while True:
+                    inner = stream.value()
+                    stream.take(":")
+                    if inner == "routes" and stream.peek() == "[":
+                        yield from _array(stream, section)
+                    else:
+                        stream.value()
+                    if stream.take(",}") == "}":
+                        break
+            else:
+                stream.pos += 1
+        else:
+            stream.value()
+        if stream.take(",}") == "}":
+            return
+
+
+def iter_ndjson(f, service=None):
+    for line in f:
+        if line.strip():
+            yield service, json.loads(line)
+
+
+def iter_csv(f, service=None):
+    """Group consecutive stop rows into routes by ``route_id``."""
+    route, current = None, None
+    for row in csv.DictReader(f):
+        rid = row.get("route_id") or (row.get("service"), row.get("name"),
+                                      row.get("train_number"))
+        if rid != current:
+            if route is not None:
+                yield service, route
+            current = rid
+            route = {key: row[key] for key in row
+                     if key not in CSV_COLUMNS[-4:] and key != "route_id" and row[key] != ""}
+            route["stations"] = []
+        route["stations"].append({"name": row["station"], "lat": float(row["lat"]),
+                                  "lon": float(row["lon"]), "stop_type": row.get("stop_type")})
+    if route is not None:
+        yield service, route
+
+
+def iter_routes(path, fmt=None, service=None, chunk_chars=CHUNK_CHARS):
+    """Yield ``(service, route dict)`` from any supported file, streaming."""
+    path = Path(path)
+    fmt = fmt or FORMATS.get(path.suffix.lower(), "json")
+    newline = "" if fmt == "csv" else None
+    with open(path, encoding="utf-8", newline=newline) as f:
+        if fmt == "json":
+            yield from iter_json(f, service, chunk_chars)
+        elif fmt == "ndjson":
+            yield from iter_ndjson(f, service)
+        elif fmt == "csv":
+            yield from iter_csv(f, service)
+        else:
+            raise ValueError(f"Unknown route format: {fmt}")
+
+
+def _build(path, fmt, service, chunk_chars):
+    builder = RouteBuilder()
+    for svc, route in iter_routes(path, fmt, service, chunk_chars):
+        builder.add(svc, route)
+    return builder
+
+
+def ingest(path, fmt=None, service=None, chunk_chars=CHUNK_CHARS):
+    """Stream a route file into a :class:`RouteData`."""
+    return _build(path, fmt, service, chunk_chars).finish()
+
+
+def ingest_network(path, fmt=None, service=None, chunk_chars=CHUNK_CHARS):
+    """Stream a route file straight into a :class:`~railnet.network.Network`."""
+    return _build(path, fmt, service, chunk_chars).network()
+
+
+def write_ndjson(data, path):
+    """Write ``data`` as NDJSON (one route per line, ``service`` included)."""
+    with open(path, "w", encoding="utf-8") as f:
+        for route in data.iter_routes():
+            f.write(json.dumps(route, ensure_ascii=False) + "\n")
+
+
+def write_csv(data, path):
+    """Write ``data`` as one CSV row per stop (``CSV_COLUMNS``)."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for i, route in enumerate(data.iter_routes()):
+            head = [i, route["service"]] + [route.get(key, "")
+                                            for key, _, _ in ROUTE_COLUMNS.values()]
+            writer.writerows(head + [s["name"], s["lat"], s["lon"], s.get("stop_type", "")]
+                             for s in route["stations"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.ingest",
+                                     description="Stream a route file into compact arrays.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())),
+                        help="input format (default: from the file extension)")
+    parser.add_argument("--service", help="service key for routes without one")
+    parser.add_argument("--out", help="write the Network arrays to this .npz")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    network = ingest_network(args.path, args.format, args.service)
+    print(f"✅ {network.n_routes} routes, {network.n_stops} stops, {network.n_stations} "
+          f"stations in {time.perf_counter() - t0:.2f}s (peak RSS {peak_rss_mb():.0f} MB)")
+    if args.out:
+        network.save(args.out)
+
+
+if __name__ == "__main__":
+    main()
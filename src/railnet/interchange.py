@@ -0,0 +1,164 @@
+"""
+Interchange complexes: stations close enough to change train on foot or by metro.
+
+Transfer detection by exact station ("served by more than one route") treats
+New Delhi, Hazrat Nizamuddin, Anand Vihar Tml and Delhi Jn as unrelated.
+Here every pair of stations within ``radius_km`` of each other is linked,
+found with the KD-tree of :class:`railnet.spatial.StationIndex` (a radius
+query per station, so the cost follows the number of close pairs rather
+than all n² pairs).  Complexes are grown around seeds: the station with the
+most links that is not yet in a complex takes every unassigned station
+within ``radius_km`` of it, and so on.  Every member is within
+``radius_km`` of its seed, so a complex is at most ``2 * radius_km`` across
+(connected components of the links would chain stations 10 km apart into
+complexes 40 km wide).  :class:`railnet.routing.JourneyPlanner` adds the
+links as transfer edges costing ``interchange_penalty_km`` plus the walking
+distance.
+
+    cd src && python -m railnet.interchange --radius 10
+    cd src && python -m railnet.interchange --bench 50000
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from railnet import trace
+from railnet.geodesy import haversine_km
+from railnet.spatial import StationIndex, km_to_chord
+
+# New Delhi - Hazrat Nizamuddin is 6.4 km, New Delhi - Anand Vihar 9 km
+INTERCHANGE_KM = 10.0
+
+
+@dataclass
+class Interchanges:
+    """Close station pairs ``(u, v, km)`` with ``u < v`` and a complex id per station.
+
+    The pairs are all links within ``radius_km``; a link can join two
+    stations of different complexes.
+    """
+
+    complex_id: np.ndarray
+    u: np.ndarray
+    v: np.ndarray
+    km: np.ndarray
+    radius_km: float
+
+    @property
+    def n_complexes(self):
+        return int(self.complex_id.max(initial=-1)) + 1
+
+    def sizes(self):
+        """Number of stations in each complex."""
+        return np.bincount(self.complex_id, minlength=self.n_complexes)
+
+    def complexes(self, min_size=2):
+        """Station ids of every complex with at least ``min_size`` stations."""
+        order = np.argsort(self.complex_id, kind="stable")
+        groups = np.split(order, np.cumsum(self.sizes())[:-1])
+        return [g for g in groups if len(g) >= min_size]
+
+    def route_counts(self, network):
+        """Distinct routes calling anywhere in each station's complex."""
+        pairs = np.unique(network.stop_route_ids().astype(np.int64) * self.n_complexes
+                          + self.complex_id[network.route_stops])
+        per_complex = np.bincount(pairs % self.n_complexes, minlength=self.n_complexes)
+        return per_complex[self.complex_id]
+
+    def is_transfer(self, network):
+        """Stations where passengers can change between routes within the complex."""
+        return self.route_counts(network) > 1
+
+
+def cluster_stations(lat, lon, radius_km=INTERCHANGE_KM, index=None):
+    """:class:`Interchanges` of the points ``lat``/``lon``.
+
+    Each complex holds a seed station and the stations within ``radius_km``
+    of it; seeds are taken in order of most stations in reach (ties by id).
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    n = len(lat)
+    with trace.span("interchanges", stations=n, radius_km=radius_km):
+        if radius_km > 0 and n > 1:
+            index = index or StationIndex(lat, lon)
+            pairs = index.tree.query_pairs(km_to_chord(radius_km), output_type="ndarray")
+        else:
+            pairs = np.empty((0, 2), dtype=np.int64)
+        u, v = pairs[:, 0].astype(np.int64), pairs[:, 1].astype(np.int64)
+        order = np.lexsort((v, u))
+        u, v = u[order], v[order]
+        labels = _seed_clusters(u, v, n)
+        # Renumber complexes in order of their first station
+        _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.argsort(np.argsort(first, kind="stable"), kind="stable")
+        trace.count("interchange_pairs", len(u))
+        return Interchanges(
+            complex_id=rank[inverse].astype(np.int32),
+            u=u, v=v,
+            km=haversine_km(lat[u], lon[u], lat[v], lon[v]),
+            radius_km=float(radius_km),
+        )
+
+
+def _seed_clusters(u, v, n):
+    """Complex label per station: seeds claim their unassigned linked stations."""
+    ends = np.concatenate([u, v])
+    order = np.argsort(ends, kind="stable")
+    others = np.concatenate([v, u])[order]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=n), out=offsets[1:])
+    labels = np.full(n, -1, dtype=np.int64)
+    for seed in np.argsort(-np.diff(offsets), kind="stable").tolist():
+        if labels[seed] >= 0:
+            continue
+        members = others[offsets[seed]:offsets[seed + 1]]
+        labels[members[labels[members] < 0]] = seed
+        labels[seed] = seed
+    return labels
+
+
+def interchanges(network, radius_km=INTERCHANGE_KM):
+    """:class:`Interchanges` of ``network``'s stations."""
+    return cluster_stations(network.station_lat, network.station_lon, radius_km)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.interchange",
+                                     description="Group nearby stations into interchanges.")
+    parser.add_argument("--services", nargs="+", default=[], help="default: all")
+    parser.add_argument("--radius", type=float, default=INTERCHANGE_KM,
+                        help="link stations within this many km (default: %(default)s)")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="cluster N random stations across India")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        rng = np.random.default_rng(0)
+        lat, lon = rng.uniform(8, 35, args.bench), rng.uniform(68, 97, args.bench)
+        t0 = time.perf_counter()
+        result = cluster_stations(lat, lon, args.radius)
+        print(f"✅ Clustered {args.bench} stations in {time.perf_counter() - t0:.2f}s "
+              f"({len(result.u)} links, {len(result.complexes())} complexes)")
+        return
+
+    from railnet.network import Network
+
+    network = Network.load(*args.services, verbose=False)
+    result = interchanges(network, args.radius)
+    exact = network.station_route_counts() > 1
+    grouped = result.is_transfer(network)
+    routes = result.route_counts(network)
+    complexes = sorted(result.complexes(), key=lambda ids: -routes[ids[0]])
+    print(f"✅ {len(complexes)} complexes within {args.radius:g} km; transfer stations "
+          f"{exact.sum()} by exact name, {grouped.sum()} with complexes")
+    for ids in complexes:
+        names = ", ".join(str(s) for s in network.station_name[ids])
+        print(f"  {routes[ids[0]]:>4} routes  {names}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Route-data loader shared by every network script.
+
+All five ``data/*.json`` files are normalised into one columnar
+:class:`RouteData` (one row per route, one row per stop, CSR-style offsets
+between them).  The columns are written to a compact ``.npz`` cache named
+after a content hash of the source file, so a warm load never touches the
+JSON parser; cold loads stream the file (see :mod:`railnet.ingest`).
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+
+from railnet import trace
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+# Bump whenever the cached column layout changes.
+CACHE_VERSION = 1
+
+# service key -> (file name, top-level section, display label)
+SERVICES = {
+    "vande_bharat": ("vb_route_data.json", "routes", "Vande Bharat"),
+    "rajdhani": ("rajdhani_route_data.json", "rajdhani_express_routes", "Rajdhani"),
+    "duronto": ("duronto_route_data.json", "duronto_express_routes", "Duronto"),
+    "humsafar": ("humsafar_route_data.json", "humsafar_express_routes", "Humsafar"),
+    "shatabdi": ("Shatabdi_route_data.json", "shatabdi_express_routes", "Shatabdi"),
+    "jan_shatabdi": ("Shatabdi_route_data.json", "jan_shatabdi_express_routes", "Jan Shatabdi"),
+}
+
+# Route-level columns: name -> (JSON key, dtype, missing value)
+ROUTE_COLUMNS = {
+    "name": ("name", str, ""),
+    "status": ("status", str, ""),
+    "train_number": ("train_number", str, ""),
+    "frequency": ("frequency", str, ""),
+    "travel_time": ("travel_time", str, ""),
+    "max_speed_kmph": ("max_speed_kmph", np.float64, np.nan),
+    "average_speed_kmph": ("average_speed_kmph", np.float64, np.nan),
+    "distance_km": ("distance_km", np.float64, np.nan),
+}
+
+
+def cache_dir():
+    """Directory for compiled caches (override with ``RAILNET_CACHE_DIR``)."""
+    path = Path(os.environ.get("RAILNET_CACHE_DIR", DATA_DIR / ".cache"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def content_hash(data):
+    """Short SHA-1 hex digest of ``data`` (bytes)."""
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+@dataclass
+class RouteData:
+    """Columnar route table; stops of route ``i`` are ``stop_offsets[i]:stop_offsets[i + 1]``."""
+
+    service: np.ndarray
+    name: np.ndarray
+    status: np.ndarray
+    train_number: np.ndarray
+    frequency: np.ndarray
+    travel_time: np.ndarray
+    max_speed_kmph: np.ndarray
+    average_speed_kmph: np.ndarray
+    distance_km: np.ndarray
+    stop_offsets: np.ndarray
+    stop_name: np.ndarray
+    stop_lat: np.ndarray
+    stop_lon: np.ndarray
+    stop_type: np.ndarray
+
+    def __len__(self):
+        return len(self.name)
+
+    @property
+    def n_stops(self):
+        return len(self.stop_name)
+
+    def stop_slice(self, i):
+        return slice(int(self.stop_offsets[i]), int(self.stop_offsets[i + 1]))
+
+    def select(self, mask):
+        """Subset of routes given a boolean mask or integer index array."""
+        idx = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask)
+        starts, ends = self.stop_offsets[idx], self.stop_offsets[idx + 1]
+        lengths = ends - starts
+        offsets = np.zeros(len(idx) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        stop_idx = (np.repeat(starts - offsets[:-1], lengths)
+                    + np.arange(offsets[-1], dtype=np.int64))
+        return RouteData(
+            **{f: getattr(self, f)[idx] for f in _ROUTE_FIELDS},
+            stop_offsets=offsets,
+            **{f: getattr(self, f)[stop_idx] for f in _STOP_FIELDS},
+        )
+
+    def for_services(self, *services):
+        """Routes belonging to the given service keys (see ``SERVICES``)."""
+        return self.select(np.isin(self.service, list(services)))
+
+    def iter_routes(self):
+        """Yield routes as dicts in the original JSON schema."""
+        for i in range(len(self)):
+            route = {"service": str(self.service[i])}
+            for col, (key, dtype, _) in ROUTE_COLUMNS.items():
+                value = getattr(self, col)[i]
+                if dtype is str:
+                    if value:
+                        route[key] = str(value)
+                elif not np.isnan(value):
+                    route[key] = float(value)
+            sl = self.stop_slice(i)
+            route["stations"] = [
+                dict(name=str(n), lat=float(la), lon=float(lo),
+                     **({"stop_type": str(t)} if t else {}))
+                for n, la, lo, t in zip(self.stop_name[sl], self.stop_lat[sl],
+                                        self.stop_lon[sl], self.stop_type[sl])
+            ]
+            yield route
+
+    @classmethod
+    def concat(cls, parts):
+        parts = list(parts)
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for p in parts:
+            offsets.append(p.stop_offsets[1:] + base)
+            base += p.n_stops
+        return cls(
+            **{f: np.concatenate([getattr(p, f) for p in parts]) for f in _ROUTE_FIELDS},
+            stop_offsets=np.concatenate(offsets),
+            **{f: np.concatenate([getattr(p, f) for p in parts]) for f in _STOP_FIELDS},
+        )
+
+
+_ROUTE_FIELDS = ("service",) + tuple(ROUTE_COLUMNS)
+_STOP_FIELDS = ("stop_name", "stop_lat", "stop_lon", "stop_type")
+
+
+def _sections(raw):
+    """Map each top-level section of a route file to its service key."""
+    by_section = {section: key for key, (_, section, _) in SERVICES.items()}
+    if "routes" in raw:
+        yield by_section["routes"], raw["routes"]
+        return
+    for section, body in raw.items():
+        service = by_section.get(section, section.removesuffix("_routes"))
+        yield service, body["routes"]
+
+
+def routes_from_json(raw):
+    """Build a :class:`RouteData` from a parsed route file."""
+    cols = {f: [] for f in _ROUTE_FIELDS + _STOP_FIELDS}
+    offsets = [0]
+    for service, routes in _sections(raw):
+        for route in routes:
+            cols["service"].append(service)
+            for col, (key, _, missing) in ROUTE_COLUMNS.items():
+                value = route.get(key)
+                cols[col].append(missing if value is None else value)
+            for station in route["stations"]:
+                cols["stop_name"].append(station["name"])
+                cols["stop_lat"].append(station["lat"])
+                cols["stop_lon"].append(station["lon"])
+                cols["stop_type"].append(station.get("stop_type", ""))
+            offsets.append(len(cols["stop_name"]))
+    dtypes = {col: dtype for col, (_, dtype, _) in ROUTE_COLUMNS.items()}
+    dtypes.update(service=str, stop_name=str, stop_lat=np.float64,
+                  stop_lon=np.float64, stop_type=str)
+    arrays = {f: np.array(v, dtype=dtypes[f]) for f, v in cols.items()}
+    return RouteData(stop_offsets=np.array(offsets, dtype=np.int64), **arrays)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """:func:`content_hash` of a file, read in chunks."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def load_file(path, use_cache=True):
+    """Load one route file (JSON, NDJSON or CSV) through the hashed ``.npz`` cache.
+
+    Misses are parsed with the streaming readers in :mod:`railnet.ingest`,
+    so memory stays proportional to the columnar result, not the file.
+    """
+    from railnet.ingest import ingest
+
+    path = Path(path)
+    try:
+        digest = file_hash(path)
+    except FileNotFoundError:
+        print(f"❌ Error: File {path} not found")
+        raise
+    cache_file = cache_dir() / f"{path.stem}-v{CACHE_VERSION}-{digest}.npz"
+    if use_cache and cache_file.exists():
+        with np.load(cache_file, allow_pickle=False) as npz:
+            return RouteData(**{f.name: npz[f.name] for f in fields(RouteData)})
+
+    try:
+        data = ingest(path)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"❌ Error: Invalid route data in '{path}': {e}")
+        raise
+    if use_cache:
+        # Other processes' in-flight ``.<pid>.tmp.npz`` files are left alone
+        for stale in cache_file.parent.glob(f"{path.stem}-v*.npz"):
+            if not stale.name.endswith(".tmp.npz"):
+                stale.unlink(missing_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp, **{f.name: getattr(data, f.name) for f in fields(RouteData)})
+        os.replace(tmp, cache_file)
+    return data
+
+
+def load_services(*services, data_dir=DATA_DIR, use_cache=True, verbose=True):
+    """Load and concatenate the named services (all of them by default)."""
+    services = services or tuple(SERVICES)
+    unknown = set(services) - set(SERVICES)
+    if unknown:
+        raise KeyError(f"Unknown service(s): {', '.join(sorted(unknown))}")
+    files = dict.fromkeys(SERVICES[s][0] for s in services)
+    with trace.span("load", services=",".join(services)):
+        parts = [load_file(Path(data_dir) / f, use_cache=use_cache) for f in files]
+        data = RouteData.concat(parts).for_services(*services)
+    if verbose:
+        for s in services:
+            n = int(np.count_nonzero(data.service == s))
+            print(f"✅ Successfully loaded {n} {SERVICES[s][2]} routes from {SERVICES[s][0]}")
+    return data
@@ -0,0 +1,247 @@
+"""
+Level-of-detail simplification of the route layer, one level per web zoom.
+
+The shared segments of :mod:`railnet.corridors` are joined into *chains*:
+maximal paths whose inner stations have exactly two segments carrying the
+same set of routes (compared by an XOR hash of random per-route keys).
+Junctions, route ends and changes of the route set are chain ends and are
+never moved or dropped, so corridors shared by several routes simplify
+identically for all of them and stay aligned; simplification only removes
+inner vertices of a chain.
+
+Each inner vertex gets a Douglas-Peucker importance once (the deviation at
+which it would be dropped, capped by its parent's so levels nest), computed
+for all chains together in vectorised rounds.  A level is then a threshold:
+zoom ``z`` keeps vertices more important than ``PIXEL_TOLERANCE`` pixels of
+a 256 px tile at that zoom, and skips whole chains shorter than that (they
+would be hidden under the line caps of their neighbours).  Renderers ask
+for the tolerance their output needs (:func:`pixel_size_m` from extent and
+DPI) and get the coarsest level within it.
+
+    cd src && python -m railnet.lod                       # vertices per level
+    cd src && python -m railnet.lod --routes ../build/synthetic/routes_x100.json
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from railnet.basemap import EARTH_HALF_CIRCUMFERENCE
+from railnet.corridors import corridors
+
+# Drop detail smaller than half an output pixel
+PIXEL_TOLERANCE = 0.5
+ZOOM_LEVELS = range(0, 15)
+
+
+def zoom_tolerance_m(z):
+    """Tolerance (m) of level ``z``: ``PIXEL_TOLERANCE`` px of a 256 px tile at zoom z."""
+    return PIXEL_TOLERANCE * 2 * EARTH_HALF_CIRCUMFERENCE / (256 * 2 ** z)
+
+
+def pixel_size_m(xlim, ylim, figsize, dpi):
+    """Metres per output pixel of a map spanning ``xlim``/``ylim`` at ``figsize`` inches."""
+    return max((xlim[1] - xlim[0]) / (figsize[0] * dpi), (ylim[1] - ylim[0]) / (figsize[1] * dpi))
+
+
+def _chains(seg_u, seg_v, seg_hash, n_stations):
+    """Station and segment sequences of every chain (lists of lists)."""
+    n_seg = len(seg_u)
+    ends = np.concatenate([seg_u, seg_v])
+    order = np.argsort(ends, kind="stable")
+    node_segs = np.concatenate([np.arange(n_seg), np.arange(n_seg)])[order]
+    offsets = np.zeros(n_stations + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=n_stations), out=offsets[1:])
+    degree = np.diff(offsets)
+    junction = degree != 2
+    two = np.flatnonzero(degree == 2)
+    first, second = node_segs[offsets[two]], node_segs[offsets[two] + 1]
+    junction[two[seg_hash[first] != seg_hash[second]]] = True
+
+    seg_u, seg_v = seg_u.tolist(), seg_v.tolist()
+    node_segs, offsets, junction = node_segs.tolist(), offsets.tolist(), junction.tolist()
+    visited = [False] * n_seg
+    stations, segments = [], []
+
+    def walk(start, seg):
+        verts, segs = [start], []
+        node = start
+        while True:
+            visited[seg] = True
+            segs.append(seg)
+            node = seg_v[seg] if seg_u[seg] == node else seg_u[seg]
+            verts.append(node)
+            if junction[node]:
+                break
+            a, b = node_segs[offsets[node]], node_segs[offsets[node] + 1]
+            seg = b if a == seg else a
+            if visited[seg]:
+                break
+        stations.append(verts)
+        segments.append(segs)
+
+    for node in range(n_stations):
+        if junction[node]:
+            for k in range(offsets[node], offsets[node + 1]):
+                if not visited[node_segs[k]]:
+                    walk(node, node_segs[k])
+    # Loops without any junction start anywhere
+    for seg in range(n_seg):
+        if not visited[seg]:
+            junction[seg_u[seg]] = True
+            walk(seg_u[seg], seg)
+    return stations, segments
+
+
+def _importance(px, py, chain_offsets):
+    """Douglas-Peucker importance of every vertex (``inf`` for chain ends)."""
+    imp = np.full(len(px), np.inf)
+    starts, stops = chain_offsets[:-1], chain_offsets[1:] - 1
+    inner = stops - starts > 1
+    a, b = starts[inner], stops[inner]
+    cap = np.full(len(a), np.inf)
+    while len(a):
+        # Inner vertices of every open interval, flattened
+        counts = b - a - 1
+        owner = np.repeat(np.arange(len(a)), counts)
+        idx = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        idx += a[owner] + 1
+        ax, ay = px[a][owner], py[a][owner]
+        dx, dy = px[b][owner] - ax, py[b][owner] - ay
+        length2 = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(length2 > 0, ((px[idx] - ax) * dx + (py[idx] - ay) * dy) / length2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        dist = np.hypot(px[idx] - ax - t * dx, py[idx] - ay - t * dy)
+        # Farthest vertex per interval (first on ties)
+        best = np.lexsort((idx, -dist, owner))
+        top = best[np.concatenate([[0], np.cumsum(counts)[:-1]])]
+        m = idx[top]
+        imp[m] = np.minimum(dist[top], cap)
+        cap = imp[m]
+        a, b, cap = (np.concatenate([a, m]), np.concatenate([m, b]), np.concatenate([cap, cap]))
+        keep = b - a > 1
+        a, b, cap = a[keep], b[keep], cap[keep]
+    return imp
+
+
+class RouteLOD:
+    """Chains of the drawn routes plus lazily cached simplified levels."""
+
+    def __init__(self, network, x, y, route_mask=None, seed=0):
+        shared = corridors(network, route_mask)
+        self.corridors = shared
+        pairs = np.unique(shared.segment_of_edge.astype(np.int64) * network.n_routes
+                          + shared.route_of_edge)
+        seg, route = np.divmod(pairs, network.n_routes)
+        keys = np.random.default_rng(seed).integers(1, 2**63, network.n_routes, dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, seg[1:] != seg[:-1]]) if len(seg) else seg
+        seg_hash = np.bitwise_xor.reduceat(keys[route], starts) if len(seg) else keys[:0]
+
+        stations, segments = _chains(shared.u, shared.v, seg_hash, network.n_stations)
+        self.n_chains = len(stations)
+        lengths = np.array([len(s) for s in stations], dtype=np.int64)
+        self.chain_offsets = np.zeros(self.n_chains + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.chain_offsets[1:])
+        self.vertex_station = np.array([s for c in stations for s in c], dtype=np.int64)
+        self.vertex_chain = np.repeat(np.arange(self.n_chains), lengths)
+        self.px = np.asarray(x, dtype=np.float64)[self.vertex_station]
+        self.py = np.asarray(y, dtype=np.float64)[self.vertex_station]
+        self.importance = _importance(self.px, self.py, self.chain_offsets)
+        step = np.hypot(np.diff(self.px), np.diff(self.py))
+        inside = self.vertex_chain[1:] == self.vertex_chain[:-1]
+        self.chain_length = np.bincount(self.vertex_chain[1:][inside], weights=step[inside],
+                                        minlength=self.n_chains)
+
+        # Every segment of a chain carries the same routes: take them from its first
+        first_seg = np.array([s[0] for s in segments], dtype=np.int64)
+        chain_of_first = np.full(len(shared), -1, dtype=np.int64)
+        chain_of_first[first_seg] = np.arange(self.n_chains)
+        on_first = chain_of_first[seg] >= 0
+        order = np.lexsort((chain_of_first[seg][on_first], route[on_first]))
+        self.pair_chain = chain_of_first[seg][on_first][order]
+        self.pair_route = route[on_first][order]
+        self.chain_route_count = shared.route_count[first_seg]
+        self.chain_main_route = shared.main_route[first_seg]
+        self._levels = {}
+
+    @property
+    def n_vertices(self):
+        return len(self.px)
+
+    def level_for(self, tolerance_m):
+        """Coarsest zoom level whose tolerance is within ``tolerance_m`` (None: full detail)."""
+        fits = [z for z in ZOOM_LEVELS if zoom_tolerance_m(z) <= tolerance_m]
+        return fits[0] if fits else None
+
+    def kept(self, z):
+        """Indices of the vertices kept at zoom level ``z`` (None: full detail), chain order."""
+        tolerance = 0.0 if z is None else zoom_tolerance_m(z)
+        return np.flatnonzero((self.importance > tolerance)
+                              & (self.chain_length[self.vertex_chain] >= tolerance))
+
+    def level(self, z):
+        """``(segments (n, 2, 2), chain ids)`` of zoom level ``z`` (None: full detail)."""
+        if z not in self._levels:
+            kept = self.kept(z)
+            same = self.vertex_chain[kept[:-1]] == self.vertex_chain[kept[1:]]
+            a, b = kept[:-1][same], kept[1:][same]
+            segments = np.empty((len(a), 2, 2), dtype=np.float64)
+            segments[:, 0, 0], segments[:, 0, 1] = self.px[a], self.py[a]
+            segments[:, 1, 0], segments[:, 1, 1] = self.px[b], self.py[b]
+            self._levels[z] = segments, self.vertex_chain[a]
+        return self._levels[z]
+
+    def segments(self, tolerance_m, merged=False):
+        """Drawn segments at ``tolerance_m`` with their route id and route count.
+
+        ``merged`` gives each chain segment once (route id: the chain's main
+        route); otherwise once per route, grouped by route in id order.
+        """
+        segments, chain = self.level(self.level_for(tolerance_m))
+        if merged:
+            return segments, self.chain_main_route[chain], self.chain_route_count[chain]
+        per_chain = np.bincount(chain, minlength=self.n_chains)
+        chain_start = np.zeros(self.n_chains, dtype=np.int64)
+        np.cumsum(per_chain[:-1], out=chain_start[1:])
+        counts = per_chain[self.pair_chain]
+        idx = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        idx += np.repeat(chain_start[self.pair_chain], counts)
+        route = np.repeat(self.pair_route, counts)
+        return segments[idx], route, self.chain_route_count[chain[idx]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.lod",
+                                     description="Vertices kept per level of detail.")
+    parser.add_argument("--routes", help="route file (default: all services in data/)")
+    args = parser.parse_args(argv)
+
+    from railnet.geometry import WEB_MERCATOR, project_lonlat
+    from railnet.network import Network
+
+    if args.routes:
+        from railnet.ingest import ingest_network
+
+        network = ingest_network(args.routes)
+    else:
+        network = Network.load(verbose=False)
+    x, y = project_lonlat(network.station_lon, network.station_lat, WEB_MERCATOR)
+    t0 = time.perf_counter()
+    lod = RouteLOD(network, x, y)
+    print(f"✅ {network.n_stops - network.n_routes} route segments -> {lod.n_chains} chains, "
+          f"{lod.n_vertices} vertices in {time.perf_counter() - t0:.2f}s")
+    # Stop pairs split along shared corridors draw as several segments at full detail
+    full = len(lod.segments(0.0)[0])
+    print(f"{'zoom':>4} {'tol m':>9} {'segments':>9} {'share':>6} {'merged':>8} {'vertices':>9}")
+    for z in ZOOM_LEVELS:
+        per_route, _, _ = lod.segments(zoom_tolerance_m(z))
+        merged, _ = lod.level(z)
+        points = len(np.unique(merged.reshape(-1, 2), axis=0))
+        print(f"{z:>4} {zoom_tolerance_m(z):9.0f} {len(per_route):>9} "
+              f"{len(per_route) / max(full, 1):6.1%} {len(merged):>8} {points:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Map specifications for every network map we publish.
+
+Each entry of ``MAP_SPECS`` carries the ``map_specs`` keys the scripts have
+always used (colours, marker sizes, output file, DPI …) plus the services it
+draws.  Edit these to restyle a map; the scripts and the batch renderer both
+read them.
+"""
+
+from pathlib import Path
+
+MEDIA_DIR = Path(__file__).resolve().parents[2] / "media"
+
+MAJOR_CITIES = [
+    'New Delhi',
+    'Mumbai',
+    'Chennai',
+    'Ahmedabad',
+    'Varanasi',
+    'Bengaluru',
+    'Howrah',
+    'Bhubaneswar',
+    'Pune',
+    'Lucknow',
+    'Chandigarh',
+    'Jaipur',
+    'Amritsar',
+    'Patna',
+    'Puri',
+    'Visakhapatnam',
+    'Hyderabad'
+]
+
+# Shared defaults
+BASE_SPEC = {
+    "route_line_width": 2,
+    "station_marker_color": "#FFA500",
+    "station_marker_size": 50,
+    # scale station markers by a railnet.centrality metric ("betweenness", "degree" …)
+    "station_size_by": None,
+    # transfer markers also for stations this close to another route's station (km)
+    "interchange_km": None,
+    # draw shared segments once, wider with more routes (railnet.corridors)
+    "merge_corridors": False,
+    # simplify routes to the detail the output extent and DPI can show (railnet.lod)
+    "lod": True,
+    # draw routes along track geometry snapped from this OSM extract (railnet.tracks)
+    "track_geometry": None,
+    "major_city_label_size": 12,
+    "map_background_color": "#F0F0F0",
+    "include_scale_bar": True,
+    "include_north_arrow": True,
+    "additional_elements": {
+        "legend_position": "lower right",
+        "grid_lines": False
+    },
+    "figsize": (15, 12),
+    "padding_m": 200000,
+    "basemap_alpha": 0.7,
+    "basemap_zoom": "auto",
+    "statuses": None,
+    "legend": True,
+    # label this many of the busiest stations in addition to major_cities
+    "label_top_n": 0,
+    "output_dpi": 500
+}
+
+MAP_SPECS = {
+    "vande_bharat": {
+        **BASE_SPEC,
+        "map_title": "Vande Bharat Network",
+        "services": ["vande_bharat"],
+        "statuses": ["current"],
+        "route_colors": {"vande_bharat": "#FF671F"},
+        "route_labels": {"vande_bharat": "Current Routes"},
+        "legend": False,
+        "major_cities": MAJOR_CITIES,
+        "output_file_name": MEDIA_DIR / "vande_bharat_routes_map.png",
+    },
+    "premium_express": {
+        **BASE_SPEC,
+        "map_title": "Premium Express Network (Rajdhani, Duronto & Humsafar)",
+        "services": ["rajdhani", "duronto", "humsafar"],
+        "route_colors": {
+            "rajdhani": "#CC0000",
+            "duronto": "#228B22",
+            "humsafar": "#FF6600",
+        },
+        "route_labels": {
+            "rajdhani": "Rajdhani Express",
+            "duronto": "Duronto Express",
+            "humsafar": "Humsafar Express",
+        },
+        "major_cities": MAJOR_CITIES + [
+            'Mumbai Central',
+            'Hazrat Nizamuddin',
+            'Secunderabad Jn',
+            'Yesvantpur Jn',
+            'Ernakulam Jn',
+            'Jammu Tawi',
+            'Sealdah',
+            'Tirupati'
+        ],
+        "output_file_name": MEDIA_DIR / "premium_express_routes_map.png",
+    },
+    "shatabdi": {
+        **BASE_SPEC,
+        "map_title": "Shatabdi/Jan Shatabdi Express Network",
+        "services": ["shatabdi", "jan_shatabdi"],
+        "route_colors": {
+            "shatabdi": "#227AB4",
+            "jan_shatabdi": "#CC0234",
+        },
+        "route_labels": {
+            "shatabdi": "Shatabdi Routes",
+            "jan_shatabdi": "Jan Shatabdi Routes",
+        },
+        "major_cities": MAJOR_CITIES,
+        "output_file_name": MEDIA_DIR / "Shatabdi_exp_routes_map.png",
+    },
+    "northern_railways": {
+        **BASE_SPEC,
+        # Routes come from railnet.northern rather than data/*.json
+        "map_title": None,
+        "services": None,
+        "route_colormap": "tab20",
+        "route_line_width": 3,
+        "route_alpha": 0.9,
+        "transfer_markers": True,
+        "label_codes": True,
+        "major_cities": None,
+        "figsize": (11, 13),
+        "padding_m": 50000,
+        "basemap_alpha": 1.0,
+        "legend_title": "Vande Bharat Routes",
+        "additional_elements": {
+            "legend_position": "upper right",
+            "grid_lines": False
+        },
+        "include_north_arrow": False,
+        "axis_off": True,
+        "output_file_name": MEDIA_DIR / "VB_NorthernRailways.png",
+        "output_dpi": 300
+    },
+}
@@ -0,0 +1,258 @@
+"""
+Array-backed network model.
+
+Stations are deduplicated by name into one table (integer id, float64 lat/lon:
+the median of the stops' coordinates) and each route is stored as a slice of
+``route_stops`` (CSR layout: stops of route ``i`` are
+``route_stops[route_offsets[i]:route_offsets[i + 1]]``).
+Route attributes are typed numpy columns; repeated strings (service, status,
+frequency, stop type) are stored as :class:`Categorical` codes.
+"""
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from railnet import trace
+from railnet.loader import SERVICES, RouteData, load_services
+
+# Stops of one station name further apart than this (degrees, ~10 m) are reported
+COORD_CONFLICT_DEG = 1e-4
+
+
+def _group_median(values, groups, n_groups):
+    """Median of ``values`` per group id (``0..n_groups-1``, every group non-empty)."""
+    order = np.lexsort((values, groups))
+    ranked = values[order]
+    starts = np.searchsorted(groups[order], np.arange(n_groups))
+    counts = np.bincount(groups, minlength=n_groups)
+    return 0.5 * (ranked[starts + (counts - 1) // 2] + ranked[starts + counts // 2])
+
+
+def coordinate_conflicts(inverse, lat, lon, station_lat, station_lon):
+    """Station ids whose stops lie more than ``COORD_CONFLICT_DEG`` from the station."""
+    inverse = np.asarray(inverse, dtype=np.int64)
+    spread = np.maximum(np.abs(np.asarray(lat) - station_lat[inverse]),
+                        np.abs(np.asarray(lon) - station_lon[inverse]))
+    return np.unique(inverse[spread > COORD_CONFLICT_DEG])
+
+
+def station_coordinates(names, inverse, lat, lon):
+    """``(lat, lon)`` per station: the median over its stops (``inverse`` maps stop -> station).
+
+    The median does not depend on route order.  Names whose stops disagree
+    (:func:`coordinate_conflicts`) are counted in the ``station_coord_conflicts``
+    trace counter.
+    """
+    lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+    inverse = np.asarray(inverse, dtype=np.int64)
+    station_lat = _group_median(lat, inverse, len(names))
+    station_lon = _group_median(lon, inverse, len(names))
+    conflicts = coordinate_conflicts(inverse, lat, lon, station_lat, station_lon)
+    trace.count("station_coord_conflicts", len(conflicts))
+    return station_lat, station_lon
+
+
+@dataclass
+class Categorical:
+    """Integer codes into a small array of category labels."""
+
+    codes: np.ndarray
+    categories: np.ndarray
+
+    @classmethod
+    def from_values(cls, values):
+        categories, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        dtype = np.int8 if len(categories) < 128 else np.int32
+        return cls(codes.astype(dtype), categories)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, idx):
+        if np.ndim(idx) == 0:
+            return self.categories[self.codes[idx]]
+        return Categorical(self.codes[idx], self.categories)
+
+    def __eq__(self, label):
+        """Boolean mask of rows equal to ``label`` (never raises for unknown labels)."""
+        hit = np.flatnonzero(self.categories == label)
+        if not len(hit):
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == hit[0]
+
+    def isin(self, labels):
+        return np.isin(self.codes, np.flatnonzero(np.isin(self.categories, list(labels))))
+
+    @property
+    def values(self):
+        return self.categories[self.codes]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.categories.nbytes
+
+
+_DURATION = re.compile(r"(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?")
+
+
+def parse_duration_min(text):
+    """``'33h 50m'`` -> ``2030.0``; empty or unparseable strings give NaN."""
+    m = _DURATION.fullmatch(text.strip())
+    if not text.strip() or not m:
+        return np.nan
+    hours, minutes = m.groups()
+    return int(hours or 0) * 60.0 + int(minutes or 0)
+
+
+@dataclass
+class Network:
+    """Deduplicated station table plus CSR route-stop sequences."""
+
+    station_name: np.ndarray
+    station_lat: np.ndarray
+    station_lon: np.ndarray
+    route_offsets: np.ndarray
+    route_stops: np.ndarray
+    service: Categorical
+    name: np.ndarray
+    status: Categorical
+    train_number: np.ndarray
+    frequency: Categorical
+    max_speed_kmph: np.ndarray
+    average_speed_kmph: np.ndarray
+    distance_km: np.ndarray
+    travel_time_min: np.ndarray
+    stop_type: Categorical
+
+    @classmethod
+    def from_routes(cls, data: RouteData):
+        """Deduplicate the stops of ``data`` by station name (see :func:`station_coordinates`)."""
+        with trace.span("preprocess", stops=int(data.n_stops)):
+            names, inverse = np.unique(data.stop_name, return_inverse=True)
+            station_lat, station_lon = station_coordinates(names, inverse, data.stop_lat,
+                                                           data.stop_lon)
+            return cls(
+                station_name=names,
+                station_lat=station_lat,
+                station_lon=station_lon,
+                route_offsets=data.stop_offsets.astype(np.int64),
+                route_stops=inverse.astype(np.int32),
+                service=Categorical.from_values(data.service),
+                name=data.name,
+                status=Categorical.from_values(data.status),
+                train_number=data.train_number,
+                frequency=Categorical.from_values(data.frequency),
+                max_speed_kmph=data.max_speed_kmph,
+                average_speed_kmph=data.average_speed_kmph,
+                distance_km=data.distance_km,
+                travel_time_min=np.array([parse_duration_min(t) for t in data.travel_time],
+                                         dtype=np.float64),
+                stop_type=Categorical.from_values(data.stop_type),
+            )
+
+    @classmethod
+    def load(cls, *services, **kwargs):
+        """Shortcut for ``Network.from_routes(load_services(*services))``."""
+        data = load_services(*services, **kwargs)
+        network = cls.from_routes(data)
+        if kwargs.get("verbose", True):
+            inverse = network.route_stops
+            conflicts = coordinate_conflicts(inverse, data.stop_lat, data.stop_lon,
+                                             network.station_lat, network.station_lon)
+            if len(conflicts):
+                print(f"ℹ️  {len(conflicts)} station names have stops at different coordinates "
+                      f"(e.g. {str(network.station_name[conflicts[0]])!r}); using the median")
+        return network
+
+    def to_arrays(self):
+        """Flat ``{name: ndarray}`` view (categoricals split into codes/categories)."""
+        arrays = {}
+        for key, value in vars(self).items():
+            if isinstance(value, Categorical):
+                arrays[f"{key}.codes"] = value.codes
+                arrays[f"{key}.categories"] = value.categories
+            else:
+                arrays[key] = value
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        kwargs = {}
+        for key in arrays:
+            if key.endswith(".codes"):
+                base = key.removesuffix(".codes")
+                kwargs[base] = Categorical(arrays[key], arrays[f"{base}.categories"])
+            elif not key.endswith(".categories"):
+                kwargs[key] = arrays[key]
+        return cls(**kwargs)
+
+    def save(self, path):
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def open(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls.from_arrays({key: npz[key] for key in npz.files})
+
+    @property
+    def n_stations(self):
+        return len(self.station_name)
+
+    @property
+    def n_routes(self):
+        return len(self.name)
+
+    @property
+    def n_stops(self):
+        return len(self.route_stops)
+
+    @property
+    def nbytes(self):
+        total = 0
+        for value in vars(self).values():
+            total += value.nbytes
+        return total
+
+    def route_lengths(self):
+        return np.diff(self.route_offsets)
+
+    def route_station_ids(self, i):
+        return self.route_stops[self.route_offsets[i]:self.route_offsets[i + 1]]
+
+    def stop_route_ids(self):
+        """Route id of every entry in ``route_stops``."""
+        return np.repeat(np.arange(self.n_routes, dtype=np.int32), self.route_lengths())
+
+    def edges(self):
+        """Consecutive stop pairs as ``(u, v, route_id)`` station-id arrays."""
+        route_ids = self.stop_route_ids()
+        keep = route_ids[:-1] == route_ids[1:]
+        return self.route_stops[:-1][keep], self.route_stops[1:][keep], route_ids[:-1][keep]
+
+    def station_route_counts(self):
+        """Number of distinct routes calling at each station."""
+        pairs = np.unique(self.stop_route_ids().astype(np.int64) * self.n_stations
+                          + self.route_stops)
+        return np.bincount(pairs % self.n_stations, minlength=self.n_stations)
+
+    def station_routes(self):
+        """Inverse CSR: ``(offsets, route_ids)`` of routes through each station."""
+        pairs = np.unique(self.route_stops.astype(np.int64) * self.n_routes
+                          + self.stop_route_ids())
+        stations, routes = np.divmod(pairs, self.n_routes)
+        offsets = np.zeros(self.n_stations + 1, dtype=np.int64)
+        np.cumsum(np.bincount(stations, minlength=self.n_stations), out=offsets[1:])
+        return offsets, routes.astype(np.int32)
+
+    def station_id(self, name):
+        """Station id for an exact station name (``KeyError`` if absent)."""
+        i = np.searchsorted(self.station_name, name)
+        if i == self.n_stations or self.station_name[i] != name:
+            raise KeyError(name)
+        return int(i)
+
+    def service_label(self, i):
+        key = str(self.service[i])
+        return SERVICES[key][2] if key in SERVICES else key
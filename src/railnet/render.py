@@ -0,0 +1,295 @@
+"""
+Static map rendering shared by the network scripts and the batch renderer.
+
+``render_map(spec)`` follows the same steps the scripts always did: project
+the stations, set the padded extent, add the basemap, draw routes and
+stations, add title/legend/north arrow, label stations and save.  Routes
+and stations are drawn as collections (see :mod:`railnet.draw`); routes at
+the level of detail the extent and DPI can show (see :mod:`railnet.lod`).
+"""
+
+import numpy as np
+
+from railnet import trace
+from railnet.basemap import BasemapUnavailable, add_basemap, auto_zoom, draw_raster
+from railnet.corridors import corridor_widths, corridors
+from railnet.draw import draw_segments, draw_stations, draw_transfer_stations, route_segments
+from railnet.geometry import WEB_MERCATOR, project_lonlat
+from railnet.labels import draw_labels
+from railnet.loader import load_services
+from railnet.lod import PIXEL_TOLERANCE, RouteLOD, pixel_size_m
+from railnet.network import Network
+
+
+def network_for_spec(spec, data=None):
+    """The network a map spec draws, sliced from ``data`` when given."""
+    if spec["services"] is None:
+        from railnet.northern import northern_route_data
+
+        return Network.from_routes(northern_route_data())
+    if data is None:
+        data = load_services(*spec["services"])
+    else:
+        data = data.for_services(*spec["services"])
+    return Network.from_routes(data)
+
+
+def _route_colors(network, spec):
+    """RGBA colour per route: by service, or one colormap entry per route."""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgba
+
+    if spec.get("route_colormap"):
+        cmap = plt.get_cmap(spec["route_colormap"], max(network.n_routes, 1))
+        return cmap(np.arange(network.n_routes))
+    palette = np.array([to_rgba(spec["route_colors"].get(str(s), "none"))
+                        for s in network.service.categories]).reshape(-1, 4)
+    return palette[network.service.codes]
+
+
+def routes_for_spec(network, spec):
+    """Boolean mask of the routes ``spec`` draws (by status and coloured service)."""
+    route_mask = np.ones(network.n_routes, dtype=bool)
+    if spec.get("statuses"):
+        route_mask &= network.status.isin(spec["statuses"])
+    if not spec.get("route_colormap"):
+        route_mask &= network.service.isin(spec["route_colors"])
+    return route_mask
+
+
+def route_layer(network, x, y, spec, tolerance_m=0.0, lod=None):
+    """Segments ``(n, 2, 2)``, RGBA colours and line widths of the routes ``spec`` draws.
+
+    With ``spec["merge_corridors"]`` every shared segment is drawn once, in
+    the colour of its busiest service and wider the more routes use it.  A
+    positive ``tolerance_m`` (detail the output cannot show, in projected m)
+    draws the matching level of a :class:`railnet.lod.RouteLOD` (``lod``, or
+    one built here) unless ``spec["lod"]`` is off.  With
+    ``spec["track_geometry"]`` (an OSM extract) segments follow the snapped
+    tracks of :mod:`railnet.tracks`, simplified to ``tolerance_m``.
+    """
+    route_mask = routes_for_spec(network, spec)
+    colors = _route_colors(network, spec)
+    base = float(spec["route_line_width"])
+    merge = bool(spec.get("merge_corridors"))
+    if spec.get("track_geometry"):
+        return _track_layer(network, spec, route_mask, colors, base, merge, tolerance_m)
+    if spec.get("lod", True) and (tolerance_m > 0 or lod is not None):
+        lod = lod if lod is not None else RouteLOD(network, x, y, route_mask)
+        segments, route_ids, counts = lod.segments(tolerance_m, merged=merge)
+        widths = corridor_widths(counts, base) if merge else np.full(len(segments), base)
+        return segments, colors[route_ids], widths
+    if merge:
+        merged = corridors(network, route_mask)
+        segments = np.empty((len(merged), 2, 2), dtype=np.float64)
+        segments[:, 0, 0], segments[:, 0, 1] = x[merged.u], y[merged.u]
+        segments[:, 1, 0], segments[:, 1, 1] = x[merged.v], y[merged.v]
+        return segments, colors[merged.main_route], corridor_widths(merged.route_count, base)
+    segments, route_ids = route_segments(network, x, y, route_mask)
+    return segments, colors[route_ids], np.full(len(segments), base)
+
+
+def _track_layer(network, spec, route_mask, colors, base, merge, tolerance_m):
+    from railnet.tracks import track_geometry
+
+    tracks = track_geometry(network, spec["track_geometry"])
+    tx, ty = project_lonlat(tracks.lon, tracks.lat, WEB_MERCATOR)
+    if merge:
+        # Snapped tracks are keyed by the stop pairs themselves, which already overlap
+        merged = corridors(network, route_mask, split=False)
+        u, v = merged.u, merged.v
+        colors, widths = colors[merged.main_route], corridor_widths(merged.route_count, base)
+    else:
+        u, v, route_ids = network.edges()
+        keep = route_mask[route_ids]
+        u, v = u[keep], v[keep]
+        colors, widths = colors[route_ids[keep]], np.full(int(keep.sum()), base)
+    segments, owner = tracks.segments(u, v, tx, ty, tolerance_m)
+    return segments, colors[owner], widths[owner]
+
+
+def _plot_routes(ax, network, x, y, spec, tolerance_m=0.0):
+    segments, colors, widths = route_layer(network, x, y, spec, tolerance_m)
+    return draw_segments(ax, segments, colors,
+                         linewidths=widths,
+                         alpha=spec.get("route_alpha", 1.0),
+                         zorder=1 if spec.get("route_colormap") else 2)
+
+
+def _station_sizes(network, spec):
+    """Marker areas scaled by ``spec["station_size_by"]`` (a centrality metric), or None."""
+    metric = spec.get("station_size_by")
+    if not metric:
+        return None
+    from railnet.centrality import station_importance
+
+    return station_importance(network).marker_sizes(metric)
+
+
+def _transfer_mask(network, spec):
+    """Interchange stations: served by >1 route or, with ``spec["interchange_km"]``, in an
+    interchange complex (stations within that radius of a seed station, see
+    :mod:`railnet.interchange`) served by >1 route."""
+    radius = spec.get("interchange_km")
+    if not radius:
+        return network.station_route_counts() > 1
+    from railnet.interchange import interchanges
+
+    return interchanges(network, radius).is_transfer(network)
+
+
+def _plot_stations(ax, network, x, y, spec):
+    sizes = _station_sizes(network, spec)
+    if spec.get("transfer_markers"):
+        return draw_transfer_stations(ax, x, y, _transfer_mask(network, spec), sizes)
+    return [draw_stations(ax, x, y,
+                          sizes=spec["station_marker_size"] if sizes is None else sizes,
+                          color=spec["station_marker_color"],
+                          label='Stations',
+                          zorder=3)]
+
+
+def _label_stations(ax, network, x, y, spec):
+    from railnet.stations import default_registry
+
+    route_counts = network.station_route_counts()
+    registry = default_registry()
+    ids = registry.resolve(network.station_name, network.station_lat, network.station_lon)
+    if spec.get("label_codes"):
+        codes = registry.codes(ids, fallback=network.station_name)
+        return draw_labels(ax, x, y, codes, priority=route_counts, fontsize=7,
+                           fontweight='normal', boxed=False, offset_pt=3)
+    # Major cities first (matched by station name or registry city; the busiest
+    # station of a city carries its label), then optionally the busiest others
+    major_cities = spec["major_cities"] or []
+    cities = registry.cities(ids)
+    by_name = np.isin(network.station_name, major_cities)
+    is_major = by_name | np.isin(cities, major_cities)
+    texts = np.where(by_name, network.station_name, np.where(is_major, cities,
+                                                               network.station_name))
+    candidates = is_major.copy()
+    top_n = spec.get("label_top_n", 0)
+    if top_n:
+        candidates[np.argsort(-route_counts, kind="stable")[:top_n]] = True
+    idx = np.flatnonzero(candidates)
+    priority = route_counts[idx] + np.where(is_major[idx], network.n_routes + 1, 0)
+    return draw_labels(ax, x[idx], y[idx], texts[idx], priority=priority,
+                       fontsize=spec["major_city_label_size"])
+
+
+def _add_legend(ax, network, spec):
+    from matplotlib.lines import Line2D
+
+    loc = spec["additional_elements"]["legend_position"]
+    if spec.get("route_colormap"):
+        # One proxy handle per route: the routes themselves are a single collection
+        colors = _route_colors(network, spec)
+        handles = [Line2D([0], [0], color=colors[i], lw=spec["route_line_width"],
+                          label=network.name[i]) for i in range(network.n_routes)]
+        ax.legend(handles=handles, loc=loc, fontsize=11, frameon=False,
+                  title=spec.get("legend_title"))
+        return
+    legend_elements = [
+        Line2D([0], [0], color=color, lw=spec["route_line_width"],
+               label=spec["route_labels"][service])
+        for service, color in spec["route_colors"].items()
+    ]
+    legend_elements.append(
+        Line2D([0], [0], marker='o', color='w', markerfacecolor=spec["station_marker_color"],
+               markersize=8, label='Stations', markeredgecolor='black'))
+    ax.legend(handles=legend_elements, loc=loc, frameon=True, fancybox=True, shadow=True)
+
+
+def _add_north_arrow(ax):
+    ax.annotate('N', xy=(0.95, 0.95), xycoords='axes fraction',
+                fontsize=14, fontweight='bold',
+                ha='center', va='center',
+                bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
+    ax.annotate('↑', xy=(0.95, 0.92), xycoords='axes fraction',
+                fontsize=16, ha='center', va='center')
+
+
+def render_map(spec, network=None, basemap=None, output=None, dpi=None, verbose=True):
+    """Render one map spec to a PNG and return the output path.
+
+    ``basemap`` may be a prepared ``(img, extent)`` raster (as the batch
+    renderer passes); otherwise tiles come from the local tile store.
+    """
+    import matplotlib.pyplot as plt
+
+    network = network if network is not None else network_for_spec(spec)
+    with trace.span("project", stations=network.n_stations):
+        x, y = project_lonlat(network.station_lon, network.station_lat, WEB_MERCATOR)
+
+    fig, ax = plt.subplots(1, 1, figsize=spec["figsize"])
+    ax.set_facecolor(spec["map_background_color"])
+
+    padding = spec["padding_m"]
+    ax.set_xlim(x.min() - padding, x.max() + padding)
+    ax.set_ylim(y.min() - padding, y.max() + padding)
+    ax.set_aspect("equal")
+    with trace.span("basemap"):
+        try:
+            if basemap is not None:
+                draw_raster(ax, *basemap, alpha=spec["basemap_alpha"])
+            else:
+                add_basemap(ax, crs=WEB_MERCATOR, zoom=spec["basemap_zoom"],
+                            alpha=spec["basemap_alpha"])
+        except BasemapUnavailable as e:
+            print(f"Could not load basemap ({e}), continuing without it...")
+
+    dpi = dpi or spec["output_dpi"]
+    # Half an output pixel: finer route detail cannot show at this extent and DPI
+    tolerance = PIXEL_TOLERANCE * pixel_size_m(ax.get_xlim(), ax.get_ylim(), spec["figsize"], dpi)
+    with trace.span("draw"):
+        routes = _plot_routes(ax, network, x, y, spec, tolerance)
+        _plot_stations(ax, network, x, y, spec)
+        trace.count("segments_drawn", len(routes.get_paths()))
+        trace.count("stations_drawn", network.n_stations)
+
+        if spec.get("map_title"):
+            ax.set_title(spec["map_title"], fontsize=16, fontweight='bold', pad=20)
+        if spec.get("legend"):
+            _add_legend(ax, network, spec)
+
+        # Remove axis ticks and labels for cleaner look
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+        ax.tick_params(left=False, bottom=False, labelleft=False, labelbottom=False)
+        if spec.get("include_north_arrow"):
+            _add_north_arrow(ax)
+        if spec.get("axis_off"):
+            ax.set_axis_off()
+
+    output = output or spec["output_file_name"]
+    plt.tight_layout()
+    # Labels go last so collision checks see the final axes layout
+    with trace.span("label"):
+        labels = _label_stations(ax, network, x, y, spec)
+        trace.count("labels_drawn", len(labels))
+    trace.count("artists_drawn", len(ax.get_children()))
+    with trace.span("save", dpi=dpi):
+        plt.savefig(output, dpi=dpi, bbox_inches='tight',
+                    facecolor='white', edgecolor='none')
+    plt.close(fig)
+    if verbose:
+        print(f"Map saved as {output}")
+    return output
+
+
+def map_bounds_lonlat(network, spec):
+    """Lon/lat box of the axes :func:`render_map` sets up for ``network`` (its basemap area)."""
+    from pyproj import Transformer
+
+    x, y = project_lonlat(network.station_lon, network.station_lat, WEB_MERCATOR)
+    padding = spec["padding_m"]
+    transformer = Transformer.from_crs(WEB_MERCATOR, "EPSG:4326", always_xy=True)
+    return transformer.transform_bounds(x.min() - padding, y.min() - padding,
+                                        x.max() + padding, y.max() + padding)
+
+
+def map_basemap_tiles(network, spec, zoom="auto"):
+    """``(bounds, z)`` of the basemap :func:`render_map` draws (``zoom`` overrides the spec)."""
+    bounds = map_bounds_lonlat(network, spec)
+    z = zoom if zoom != "auto" else spec.get("basemap_zoom", "auto")
+    return bounds, auto_zoom(bounds) if z == "auto" else int(z)
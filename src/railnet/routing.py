@@ -0,0 +1,375 @@
+"""
+Journey planning over the combined network of every service.
+
+The graph has one *hub* node per station and one node per (route, station)
+call.  Riding a route moves between consecutive calls (haversine km, both
+directions); boarding and alighting link a call to its station hub at half
+the transfer penalty each.  Every journey boards once and alights once, so
+after subtracting that constant a path costs its distance plus
+``transfer_penalty_km`` per change of train.  Hubs of nearby stations
+(interchange complexes, see :mod:`railnet.interchange`) are linked by
+transfer edges costing ``interchange_penalty_km`` plus the walking distance,
+so changing between e.g. New Delhi and Hazrat Nizamuddin is possible at a
+price on top of the usual transfer penalty.
+
+* :meth:`JourneyPlanner.plan` answers one query with A*; the heuristic is
+  the great-circle distance to the destination, tightened by ALT landmark
+  bounds after :meth:`JourneyPlanner.preprocess`.
+* :meth:`JourneyPlanner.plan_many` answers bulk origin/destination batches:
+  one shortest-path tree per distinct origin or destination (C Dijkstra in
+  scipy, in bounded chunks cut short by the ALT landmark bounds) and a
+  vectorised walk of the predecessor arrays for each chunk's queries.
+
+    cd src && python -m railnet.routing "New Delhi" "Chennai Central"
+    cd src && python -m railnet.routing --bench 100000
+"""
+
+import argparse
+import heapq
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from railnet import trace
+from railnet.geodesy import haversine_km
+from railnet.interchange import INTERCHANGE_KM, interchanges
+from railnet.network import Network
+
+TRANSFER_PENALTY_KM = 50.0
+# Extra cost of changing to a different station of the same complex
+INTERCHANGE_PENALTY_KM = 25.0
+# Distance/predecessor entries per Dijkstra chunk of plan_many (~48 MB)
+PLAN_CHUNK_ENTRIES = 1 << 22
+
+
+@dataclass
+class Leg:
+    """A continuous ride on one route."""
+
+    route: str
+    service: str
+    board: str
+    alight: str
+    distance_km: float
+    stations: list = field(default_factory=list)
+
+
+@dataclass
+class Journey:
+    origin: str
+    destination: str
+    distance_km: float
+    cost: float
+    legs: list = field(default_factory=list)
+    # Walking/metro km between stations of an interchange complex
+    walk_km: float = 0.0
+
+    @property
+    def services(self):
+        return [leg.service for leg in self.legs]
+
+    @property
+    def transfers(self):
+        """Stations where the traveller changes train."""
+        return [leg.alight for leg in self.legs[:-1]]
+
+
+@dataclass
+class BatchResult:
+    """Per-query arrays from :meth:`JourneyPlanner.plan_many` (NaN/-1 if unreachable)."""
+
+    cost: np.ndarray
+    distance_km: np.ndarray
+    transfers: np.ndarray
+    walks: np.ndarray
+
+    @property
+    def reachable(self):
+        return np.isfinite(self.cost)
+
+
+class JourneyPlanner:
+    def __init__(self, network: Network, transfer_penalty_km=TRANSFER_PENALTY_KM,
+                 interchange_km=INTERCHANGE_KM, interchange_penalty_km=INTERCHANGE_PENALTY_KM):
+        with trace.span("graph", stations=network.n_stations):
+            self._build(network, transfer_penalty_km, interchange_km, interchange_penalty_km)
+
+    def _build(self, network, transfer_penalty_km, interchange_km, interchange_penalty_km):
+        self.network = network
+        self.penalty = float(transfer_penalty_km)
+        self.interchange_penalty = float(interchange_penalty_km)
+        self.interchanges = interchanges(network, interchange_km)
+        n = network.n_stations
+        route_ids = network.stop_route_ids().astype(np.int64)
+        calls, call_of_stop = np.unique(route_ids * n + network.route_stops,
+                                        return_inverse=True)
+        # Node ids: stations are 0..n-1, calls follow
+        self.node_route = np.concatenate([np.full(n, -1), calls // n])
+        self.node_station = np.concatenate([np.arange(n), calls % n])
+        self.n_nodes = len(self.node_station)
+
+        stop_node = n + call_of_stop
+        same_route = route_ids[:-1] == route_ids[1:]
+        a, b = stop_node[:-1][same_route], stop_node[1:][same_route]
+        a, b = a[a != b], b[a != b]
+        lat, lon = network.station_lat, network.station_lon
+        sa, sb = self.node_station[a], self.node_station[b]
+        ride = haversine_km(lat[sa], lon[sa], lat[sb], lon[sb])
+        call_nodes = np.arange(n, self.n_nodes)
+        half = np.full(len(call_nodes), self.penalty / 2)
+        ic = self.interchanges
+        walk = self.interchange_penalty + ic.km
+        src = np.concatenate([a, b, self.node_station[call_nodes], call_nodes, ic.u, ic.v])
+        dst = np.concatenate([b, a, call_nodes, self.node_station[call_nodes], ic.v, ic.u])
+        weight = np.concatenate([ride, ride, half, half, walk, walk])
+        # Keep the cheapest of any parallel edges (csr_matrix would sum them)
+        order = np.lexsort((weight, dst, src))
+        src, dst, weight = src[order], dst[order], weight[order]
+        first = np.ones(len(src), dtype=bool)
+        first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        # Zero-length rides would vanish from a sparse matrix; keep them positive
+        weight = np.maximum(weight[first], 1e-9)
+        self.graph = csr_matrix((weight, (src[first], dst[first])),
+                                shape=(self.n_nodes, self.n_nodes))
+        self.landmarks = None
+        self._landmark_dist = None
+
+    @classmethod
+    def load(cls, *services, **kwargs):
+        return cls(Network.load(*services, verbose=False), **kwargs)
+
+    def _station(self, station):
+        if isinstance(station, str):
+            return self.network.station_id(station)
+        return int(station)
+
+    def preprocess(self, n_landmarks=8):
+        """Pick landmarks by farthest-point selection and store their distance rows (ALT)."""
+        n = self.network.n_stations
+        hubs = np.arange(n)
+        landmarks = [int(np.argmax(self.network.station_lat))]
+        dist = dijkstra(self.graph, indices=landmarks)
+        for _ in range(n_landmarks - 1):
+            reach = np.where(np.isfinite(dist[:, :n]), dist[:, :n], -np.inf).min(axis=0)
+            candidate = int(hubs[np.argmax(reach)])
+            if candidate in landmarks or not np.isfinite(reach[candidate]):
+                break
+            landmarks.append(candidate)
+            dist = np.vstack([dist, dijkstra(self.graph, indices=[candidate])])
+        self.landmarks = np.array(landmarks)
+        self._landmark_dist = dist
+        return self
+
+    def _heuristic(self, target):
+        lat, lon = self.network.station_lat, self.network.station_lon
+        st = self.node_station
+        h = haversine_km(lat[st], lon[st], lat[target], lon[target])
+        if self._landmark_dist is not None:
+            # The graph is symmetric, so |d(L, t) - d(L, v)| <= d(v, t)
+            d = self._landmark_dist
+            with np.errstate(invalid="ignore"):
+                alt = np.abs(d[:, [target]] - d)
+            alt[~np.isfinite(alt)] = 0.0
+            h = np.maximum(h, alt.max(axis=0))
+        return h
+
+    def _astar(self, source, target):
+        indptr, indices, weights = self.graph.indptr, self.graph.indices, self.graph.data
+        h = self._heuristic(target)
+        g = {source: 0.0}
+        parent = {source: -1}
+        heap = [(h[source], source)]
+        done = set()
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u == target:
+                break
+            if u in done:
+                continue
+            done.add(u)
+            gu = g[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                v = int(indices[k])
+                cost = gu + weights[k]
+                if cost < g.get(v, np.inf):
+                    g[v] = cost
+                    parent[v] = u
+                    heapq.heappush(heap, (cost + h[v], v))
+        if target not in parent:
+            return None
+        path = [target]
+        while parent[path[-1]] != -1:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def plan(self, origin, destination):
+        """Best :class:`Journey` between two stations (names or ids), or ``None``."""
+        o, d = self._station(origin), self._station(destination)
+        names = self.network.station_name
+        if o == d:
+            return Journey(str(names[o]), str(names[d]), 0.0, 0.0)
+        path = self._astar(o, d)
+        if path is None:
+            return None
+        return self._path_journey(path)
+
+    def _path_journey(self, path):
+        net = self.network
+        lat, lon = net.station_lat, net.station_lon
+        names = net.station_name
+        legs, current = [], []
+        # Consecutive hubs are walks between stations of a complex
+        walks = np.array([(a, b) for a, b in zip(path[:-1], path[1:])
+                          if a < net.n_stations and b < net.n_stations], dtype=np.int64)
+        walks = walks.reshape(-1, 2)
+        walk_km = float(haversine_km(lat[walks[:, 0]], lon[walks[:, 0]],
+                                     lat[walks[:, 1]], lon[walks[:, 1]]).sum())
+        for node in path[1:]:
+            if node < net.n_stations:
+                if current:
+                    legs.append(current)
+                current = []
+            else:
+                current.append(node)
+        for i, nodes in enumerate(legs):
+            st = self.node_station[nodes]
+            dist = float(haversine_km(lat[st[:-1]], lon[st[:-1]], lat[st[1:]], lon[st[1:]]).sum())
+            route = int(self.node_route[nodes[0]])
+            legs[i] = Leg(route=str(net.name[route]), service=net.service_label(route),
+                          board=str(names[st[0]]), alight=str(names[st[-1]]),
+                          distance_km=dist, stations=[str(names[s]) for s in st])
+        distance = sum(leg.distance_km for leg in legs)
+        cost = (distance + self.penalty * max(len(legs) - 1, 0)
+                + self.interchange_penalty * len(walks) + walk_km)
+        return Journey(str(names[path[0]]), str(names[path[-1]]), distance, cost, legs,
+                       walk_km)
+
+    def plan_many(self, origins, destinations, chunk_entries=PLAN_CHUNK_ENTRIES):
+        """Costs, distances and transfer/walk counts for many OD pairs (station ids).
+
+        ``distance_km`` includes the km walked between stations of a complex.
+        The graph is symmetric, so trees grow from whichever end has fewer
+        distinct stations, in chunks of at most ``chunk_entries`` node
+        entries; after :meth:`preprocess` each chunk's search stops at the
+        largest landmark upper bound ``min_L d(L, o) + d(L, t)`` it needs.
+        """
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        if len(np.unique(destinations)) < len(np.unique(origins)):
+            origins, destinations = destinations, origins
+        sources, row = np.unique(origins, return_inverse=True)
+        bound = np.full(len(origins), np.inf)
+        if self._landmark_dist is not None:
+            d = self._landmark_dist
+            bound = (d[:, origins] + d[:, destinations]).min(axis=0) * (1 + 1e-9)
+        # Sources needing similar search radii share a chunk
+        reach = np.full(len(sources), -np.inf)
+        np.maximum.at(reach, row, bound)
+        rank = np.empty(len(sources), dtype=np.int64)
+        rank[np.argsort(reach, kind="stable")] = np.arange(len(sources))
+        sources, row, reach = sources[np.argsort(rank)], rank[row], np.sort(reach)
+        cost = np.full(len(origins), np.inf)
+        alights = np.zeros(len(origins), dtype=np.int64)
+        walks = np.zeros(len(origins), dtype=np.int64)
+        by_source = np.argsort(row, kind="stable")
+        starts = np.searchsorted(row[by_source], np.arange(len(sources) + 1))
+        chunk = max(1, chunk_entries // self.n_nodes)
+        for lo in range(0, len(sources), chunk):
+            hi = min(lo + chunk, len(sources))
+            queries = by_source[starts[lo]:starts[hi]]
+            dist, pred = dijkstra(self.graph, indices=sources[lo:hi], limit=float(reach[hi - 1]),
+                                  return_predecessors=True)
+            local = row[queries] - lo
+            cost[queries] = dist[local, destinations[queries]]
+            alights[queries], walks[queries] = self._count_steps(
+                pred, local, origins[queries], destinations[queries],
+                np.isfinite(cost[queries]))
+        cost -= self.penalty
+        cost[origins == destinations] = 0.0
+
+        # Journeys that only walk within a complex never board
+        walk_only = (alights == 0) & (origins != destinations)
+        cost[walk_only] += self.penalty
+        reachable = np.isfinite(cost)
+        transfers = np.where(reachable, np.maximum(alights - 1, 0), -1)
+        distance = (cost - self.penalty * np.maximum(transfers, 0)
+                    - self.interchange_penalty * walks)
+        return BatchResult(cost=np.where(reachable, cost, np.nan),
+                           distance_km=np.where(reachable, distance, np.nan),
+                           transfers=transfers,
+                           walks=np.where(reachable, walks, -1))
+
+    def _count_steps(self, pred, row, origins, destinations, reachable):
+        """Alightings and complex walks on each query's path (``pred`` rows ``row``).
+
+        Every query's predecessor chain is walked in lock-step: each call ->
+        hub step is an alighting (transfers = alightings - 1), each hub ->
+        hub step a walk within an interchange complex.  Paths read backwards
+        board where they alighted, so the counts hold for either direction.
+        """
+        n = self.network.n_stations
+        alights = np.zeros(len(origins), dtype=np.int64)
+        walks = np.zeros(len(origins), dtype=np.int64)
+        cur = destinations.copy()
+        active = reachable & (origins != destinations)
+        cur[~active] = -9999
+        while active.any():
+            at_hub = (cur >= 0) & (cur < n)
+            cur[active] = pred[row[active], cur[active]]
+            now_hub = (cur >= 0) & (cur < n)
+            alights += active & at_hub & ~now_hub
+            walks += active & at_hub & now_hub
+            active &= cur != origins
+        return alights, walks
+
+
+def _print_journey(journey):
+    if journey is None:
+        print("❌ No connection")
+        return
+    walk = f", {journey.walk_km:.1f} km between stations" if journey.walk_km else ""
+    print(f"{journey.origin} → {journey.destination}: {journey.distance_km:.0f} km, "
+          f"{len(journey.transfers)} transfer(s){walk}")
+    for prev, leg in zip([None] + journey.legs[:-1], journey.legs):
+        if prev is not None and prev.alight != leg.board:
+            print(f"  {'change':<14} {prev.alight} → {leg.board}")
+        print(f"  {leg.service:<14} {leg.route}: {leg.board} → {leg.alight} "
+              f"({leg.distance_km:.0f} km, {len(leg.stations) - 1} stops)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.routing",
+                                     description="Plan journeys across all services.")
+    parser.add_argument("origin", nargs="?")
+    parser.add_argument("destination", nargs="?")
+    parser.add_argument("--penalty", type=float, default=TRANSFER_PENALTY_KM,
+                        help="transfer penalty in km (default: %(default)s)")
+    parser.add_argument("--interchange-km", type=float, default=INTERCHANGE_KM,
+                        help="link stations this close as one interchange; 0 disables "
+                             "(default: %(default)s)")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="time N random origin/destination queries")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    planner = JourneyPlanner.load(transfer_penalty_km=args.penalty,
+                                  interchange_km=args.interchange_km).preprocess()
+    print(f"Graph: {planner.n_nodes} nodes, {planner.graph.nnz} edges "
+          f"({time.perf_counter() - t0:.2f}s incl. preprocessing)")
+    if args.origin and args.destination:
+        _print_journey(planner.plan(args.origin, args.destination))
+    if args.bench:
+        rng = np.random.default_rng(0)
+        n = planner.network.n_stations
+        o, d = rng.integers(0, n, args.bench), rng.integers(0, n, args.bench)
+        t0 = time.perf_counter()
+        result = planner.plan_many(o, d)
+        print(f"✅ {args.bench} queries in {time.perf_counter() - t0:.2f}s "
+              f"({result.reachable.mean():.0%} reachable)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Local query service: the network loaded once, answered over HTTP as JSON.
+
+A stdlib asyncio server (HTTP/1.1 with keep-alive, no web framework)
+holds every index in memory for the life of the process:
+
+* station lookup: exact name, the station registry's canonical match
+  (resolved for all stations once at startup) and case-insensitive
+  prefix/substring search,
+* routes through a station: the ``station_routes`` CSR of the network,
+* nearest stations: the KD-tree of :class:`railnet.spatial.StationIndex`,
+* paths: a preprocessed :class:`railnet.routing.JourneyPlanner` (A* + ALT).
+
+Encoded responses are kept in an LRU cache keyed by the request target, so
+repeated queries are a dict lookup and a socket write.  Internal errors
+answer 500 and are not cached.
+
+    GET /stations?q=kota&limit=10
+    GET /routes?station=Kota Jn
+    GET /nearest?lat=26.9&lon=75.8&k=5
+    GET /path?from=Jaipur&to=Agra Cantt
+    GET /health
+
+    cd src && python -m railnet.service --port 8765
+    python ../benchmarks/bench_service.py              # load test against localhost
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import traceback
+from dataclasses import asdict
+from functools import lru_cache
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from railnet.network import Network
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_SIZE = 65536
+MAX_LIMIT = 100
+# Request line plus headers; longer requests are rejected
+MAX_HEADER_BYTES = 16384
+
+
+class QueryError(Exception):
+    """A request that cannot be answered; ``status`` is the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(query, name, cast=str, default=None):
+    values = query.get(name)
+    if not values or values[0] == "":
+        if default is None:
+            raise QueryError(HTTPStatus.BAD_REQUEST, f"missing parameter '{name}'")
+        return default
+    try:
+        return cast(values[0])
+    except ValueError:
+        raise QueryError(HTTPStatus.BAD_REQUEST, f"bad value for '{name}': {values[0]!r}")
+
+
+class NetworkService:
+    """In-memory indexes of one network and the JSON-ready answer of every endpoint."""
+
+    def __init__(self, network: Network, planner_kwargs=None):
+        from railnet.routing import JourneyPlanner
+        from railnet.spatial import StationIndex
+        from railnet.stations import default_registry
+
+        self.network = network
+        self.station_offsets, self.station_route_ids = network.station_routes()
+        self.route_counts = np.diff(self.station_offsets)
+        self.spatial = StationIndex.from_network(network)
+        self.planner = JourneyPlanner(network, **(planner_kwargs or {})).preprocess()
+        self._lower = np.char.lower(network.station_name.astype(str))
+        self.registry = default_registry()
+        canonical = self.registry.resolve(network.station_name, network.station_lat,
+                                          network.station_lon)
+        # Stations per canonical registry id, for names that are not exact
+        order = np.argsort(canonical, kind="stable")
+        ids, first = np.unique(canonical[order], return_index=True)
+        groups = np.split(order, first[1:])
+        self._by_canonical = {int(c): g for c, g in zip(ids, groups) if c >= 0}
+        self.endpoints = {
+            "/stations": self.stations,
+            "/routes": self.routes,
+            "/nearest": self.nearest,
+            "/path": self.path,
+        }
+
+    @classmethod
+    def load(cls, *services, **kwargs):
+        return cls(Network.load(*services, verbose=False), **kwargs)
+
+    def match(self, name):
+        """Station ids that are ``name`` (exact, else the registry's canonical station)."""
+        try:
+            return np.array([self.network.station_id(name)])
+        except KeyError:
+            pass
+        target = self.registry.lookup(name)
+        return self._by_canonical.get(target, np.empty(0, dtype=np.int64))
+
+    def _station(self, i):
+        net = self.network
+        return {"name": str(net.station_name[i]), "lat": float(net.station_lat[i]),
+                "lon": float(net.station_lon[i]), "routes": int(self.route_counts[i])}
+
+    def _one_station(self, name):
+        ids = self.match(name)
+        if not len(ids):
+            raise QueryError(HTTPStatus.NOT_FOUND, f"no station matches '{name}'")
+        return ids
+
+    def stations(self, query):
+        """Matches for ``q``: exact/registry first, then prefix, then substring matches."""
+        q = _param(query, "q")
+        limit = max(0, min(_param(query, "limit", int, 10), MAX_LIMIT))
+        found = np.char.find(self._lower, q.strip().lower())
+        exact = self.match(q)
+        prefix = np.flatnonzero(found == 0)
+        inside = np.flatnonzero(found > 0)
+        ids = list(dict.fromkeys(np.concatenate([exact, prefix, inside]).tolist()))
+        return {"query": q, "count": len(ids),
+                "stations": [self._station(i) for i in ids[:limit]]}
+
+    def routes(self, query):
+        """Routes calling at ``station`` (every station it resolves to)."""
+        stations = self._one_station(_param(query, "station"))
+        route_ids = np.unique(np.concatenate(
+            [self.station_route_ids[self.station_offsets[s]:self.station_offsets[s + 1]]
+             for s in stations]))
+        net = self.network
+        return {
+            "stations": [str(net.station_name[s]) for s in stations],
+            "count": len(route_ids),
+            "routes": [{"name": str(net.name[i]), "service": net.service_label(i),
+                        "train_number": str(net.train_number[i]),
+                        "stops": int(net.route_offsets[i + 1] - net.route_offsets[i])}
+                       for i in route_ids.tolist()],
+        }
+
+    def nearest(self, query):
+        """The ``k`` stations closest to ``lat``/``lon`` with their great-circle km."""
+        lat, lon = _param(query, "lat", float), _param(query, "lon", float)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise QueryError(HTTPStatus.BAD_REQUEST, "lat/lon out of range")
+        k = max(1, min(_param(query, "k", int, 5), MAX_LIMIT, len(self.spatial)))
+        km, ids = self.spatial.nearest([lat], [lon], k=k)
+        km, ids = np.atleast_1d(km[0]), np.atleast_1d(ids[0])
+        return {"lat": lat, "lon": lon,
+                "stations": [{**self._station(i), "km": round(float(d), 3)}
+                             for d, i in zip(km, ids) if i >= 0]}
+
+    def path(self, query):
+        """Best journey between ``from`` and ``to`` (first match of each name)."""
+        origin = self._one_station(_param(query, "from"))[0]
+        destination = self._one_station(_param(query, "to"))[0]
+        journey = self.planner.plan(int(origin), int(destination))
+        if journey is None:
+            raise QueryError(HTTPStatus.NOT_FOUND, "no connection")
+        return {**asdict(journey), "transfers": journey.transfers}
+
+    def answer(self, target):
+        """``(status, JSON dict)`` for a request target such as ``/nearest?lat=..``."""
+        url = urlsplit(target)
+        handler = self.endpoints.get(url.path.rstrip("/") or "/")
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"unknown endpoint {url.path}",
+                                          "endpoints": sorted(self.endpoints)}
+        try:
+            return HTTPStatus.OK, handler(parse_qs(url.query))
+        except QueryError as e:
+            return e.status, {"error": str(e)}
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}
+
+
+def _encode(status, payload):
+    return int(status), json.dumps(payload, ensure_ascii=False,
+                                   separators=(",", ":")).encode()
+
+
+class _Uncached(Exception):
+    """Carries an encoded response that must not enter the cache (server errors)."""
+
+    def __init__(self, response):
+        super().__init__(response[0])
+        self.response = response
+
+
+class QueryServer:
+    """HTTP/1.1 front end of a :class:`NetworkService` with a response cache."""
+
+    def __init__(self, service: NetworkService, cache_size=CACHE_SIZE):
+        self.service = service
+        self.started = time.time()
+        self.requests = 0
+        self._cached = lru_cache(maxsize=cache_size)(self._answer)
+
+    def _answer(self, target):
+        response = _encode(*self.service.answer(target))
+        if response[0] >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            raise _Uncached(response)
+        return response
+
+    def respond(self, target):
+        """``(status, body)`` of ``target``, cached unless it is a server error."""
+        try:
+            return self._cached(target)
+        except _Uncached as e:
+            return e.response
+
+    def health(self):
+        info = self._cached.cache_info()
+        net = self.service.network
+        return {"stations": net.n_stations, "routes": net.n_routes,
+                "uptime_s": round(time.time() - self.started, 1), "requests": self.requests,
+                "cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+                          "max_size": info.maxsize}}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                           b'{"error":"headers too large"}', False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(_response(HTTPStatus.BAD_REQUEST,
+                                           b'{"error":"bad request line"}', False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+                connection = headers.get("connection")
+                keep_alive = (connection != "close" if version == "HTTP/1.1"
+                              else connection == "keep-alive")
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The end of the body is unknown: answer and drop the connection
+                    writer.write(_response(HTTPStatus.BAD_REQUEST,
+                                           b'{"error":"bad content-length"}', False))
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                if method not in ("GET", "HEAD"):
+                    status, body = HTTPStatus.METHOD_NOT_ALLOWED, b'{"error":"GET only"}'
+                elif target.split("?", 1)[0].rstrip("/") == "/health":
+                    status, body = _encode(HTTPStatus.OK, self.health())
+                else:
+                    status, body = self.respond(target)
+                writer.write(_response(status, b"" if method == "HEAD" else body, keep_alive,
+                                       len(body)))
+                if not keep_alive:
+                    break
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES,
+                                            backlog=1024)
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+def _response(status, body, keep_alive, length=None):
+    status = HTTPStatus(status)
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body) if length is None else length}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.service",
+                                     description="Serve station, route and path queries.")
+    parser.add_argument("--services", nargs="+", default=[], help="default: all")
+    parser.add_argument("--routes", help="route file instead of the service data")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE,
+                        help="cached responses (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.routes:
+        from railnet.ingest import ingest_network
+
+        network = ingest_network(args.routes)
+    else:
+        network = Network.load(*args.services, verbose=False)
+    server = QueryServer(NetworkService(network), args.cache_size)
+
+    def ready(srv):
+        host, port = srv.sockets[0].getsockname()[:2]
+        print(f"✅ {network.n_stations} stations, {network.n_routes} routes indexed in "
+              f"{time.perf_counter() - t0:.2f}s; serving on http://{host}:{port}", flush=True)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Per-segment distance and run-time statistics.
+
+Every consecutive stop pair of every route is a segment.  All columns are
+computed with array operations over the network's CSR stop arrays:
+
+* ``gc_km``: great-circle distance between the two stops,
+* ``track_km``: ``gc_km`` scaled by the route's detour factor (timetable
+  ``distance_km`` over its summed great-circle length; the median factor of
+  routes that have one otherwise),
+* ``speed_kmph``: the route's average speed (``average_speed_kmph``, else
+  ``distance_km / travel_time``, else ``max_speed_kmph`` x
+  ``MAX_TO_AVERAGE_SPEED``, else the service median, else the network
+  median), with its source in ``speed_source``,
+* ``run_min``: ``track_km / speed_kmph``.
+
+Route and service aggregates are grouped reductions of the same arrays.
+
+    cd src && python -m railnet.stats        # data/segment_stats.{csv,npz} + route/service CSVs
+"""
+
+import argparse
+import csv
+import time
+from pathlib import Path
+
+import numpy as np
+
+from railnet.geodesy import haversine_km
+from railnet.loader import DATA_DIR
+from railnet.network import Network
+
+# Typical average-to-maximum speed ratio of Indian express services
+MAX_TO_AVERAGE_SPEED = 0.6
+SPEED_SOURCES = np.array(["average_speed", "timetable", "max_speed", "service_median",
+                          "network_median", "none"])
+STATS_FILE = DATA_DIR / "segment_stats.csv"
+
+
+def _route_sums(values, route_ids, n_routes):
+    return np.bincount(route_ids, weights=values, minlength=n_routes)
+
+
+def segment_stats(network: Network):
+    """Columns of the segment table as ``{name: ndarray}`` plus route-level arrays.
+
+    Returns ``(segments, routes)``; ``routes`` holds one value per route.
+    """
+    u, v, route_ids = network.edges()
+    n_routes = network.n_routes
+    lat, lon = network.station_lat, network.station_lon
+    gc = haversine_km(lat[u], lon[u], lat[v], lon[v])
+
+    route_gc = _route_sums(gc, route_ids, n_routes)
+    n_segments = np.bincount(route_ids, minlength=n_routes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        detour = network.distance_km / route_gc
+    detour[~np.isfinite(detour) | (detour < 1.0)] = np.nan
+    known = np.isfinite(detour)
+    detour = np.where(known, detour, np.nanmedian(detour) if known.any() else 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        timetable = network.distance_km / (network.travel_time_min / 60.0)
+    candidates = np.stack([
+        network.average_speed_kmph,
+        timetable,
+        network.max_speed_kmph * MAX_TO_AVERAGE_SPEED,
+    ])
+    candidates[~np.isfinite(candidates) | (candidates <= 0)] = np.nan
+    has = np.isfinite(candidates)
+    source = np.where(has.any(axis=0), has.argmax(axis=0), 3)
+    speed = np.where(source < 3, candidates[np.minimum(source, 2), np.arange(n_routes)], np.nan)
+
+    # Routes without any speed data borrow their service's median
+    service = network.service.codes
+    for code in np.unique(service[source == 3]):
+        in_service = service == code
+        known_speeds = speed[in_service & np.isfinite(speed)]
+        if len(known_speeds):
+            speed[in_service & (source == 3)] = np.median(known_speeds)
+    fallback = (source == 3) & ~np.isfinite(speed)
+    source[fallback] = 4
+    if np.isfinite(speed).any():
+        speed[fallback] = np.nanmedian(speed)
+    else:
+        source[fallback] = 5
+
+    track = gc * detour[route_ids]
+    run_min = track / speed[route_ids] * 60.0
+    first_edge = np.concatenate([[0], np.cumsum(n_segments)[:-1]])
+    segments = {
+        "route_id": route_ids,
+        "seq": np.arange(len(route_ids)) - first_edge[route_ids],
+        "service": network.service.codes[route_ids],
+        "from_id": u,
+        "to_id": v,
+        "gc_km": gc,
+        "track_km": track,
+        "speed_kmph": speed[route_ids],
+        "speed_source": source[route_ids].astype(np.int8),
+        "run_min": run_min,
+    }
+    routes = {
+        "n_segments": n_segments,
+        "gc_km": route_gc,
+        "track_km": _route_sums(track, route_ids, n_routes),
+        "detour": detour,
+        "speed_kmph": speed,
+        "speed_source": source.astype(np.int8),
+        "run_min": _route_sums(np.nan_to_num(run_min), route_ids, n_routes),
+    }
+    routes["run_min"][~np.isfinite(speed)] = np.nan
+    return segments, routes
+
+
+def fixed_cells(x, decimals):
+    """CSV cells of floats with fixed decimals (NaN -> ``""``).
+
+    Uses lookup tables for the digits instead of formatting each value.
+    """
+    scale = 10 ** decimals
+    v = np.round(np.asarray(x, dtype=np.float64) * scale)
+    ok = np.isfinite(v)
+    v = np.where(ok, v, 0).astype(np.int64)
+    whole, frac = np.divmod(np.abs(v), scale)
+    top = int(whole.max(initial=0))
+    # Small integers (the common case) come from a table; large ones (totals) via str
+    whole_s = [str(i) for i in range(top + 1)] if top <= 4 * len(v) + 100 else None
+    if whole_s is None:
+        whole, whole_s = np.arange(len(v)), list(map(str, whole.tolist()))
+    frac_s = [f".{i:0{decimals}d}" if decimals else "" for i in range(scale)]
+    return ["" if not k else ("-" if neg else "") + whole_s[w] + frac_s[f]
+            for k, neg, w, f in zip(ok.tolist(), (v < 0).tolist(), whole.tolist(), frac.tolist())]
+
+
+def text_cells(values, idx=None):
+    """CSV cells for ``values[idx]`` (all of ``values`` by default); each distinct value
+    is converted to ``str`` once."""
+    table = list(map(str, np.asarray(values).tolist()))
+    if idx is None:
+        return table
+    return [table[i] for i in np.asarray(idx).tolist()]
+
+
+def write_csv(path, columns):
+    """Write ``{header: list of cells}`` (from :func:`text_cells`/:func:`fixed_cells`) as CSV."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+
+
+def stats_tables(network, segments, routes):
+    """Segment, route and service tables as ``{header: cells}`` dicts."""
+    rid = segments["route_id"]
+    stations = text_cells(network.station_name)
+    seg = {
+        "service": text_cells(network.service.categories, segments["service"]),
+        "route": text_cells(network.name, rid),
+        "train_number": text_cells(network.train_number, rid),
+        "seq": text_cells(np.arange(segments["seq"].max(initial=0) + 1), segments["seq"]),
+        "from_station": [stations[i] for i in segments["from_id"].tolist()],
+        "to_station": [stations[i] for i in segments["to_id"].tolist()],
+        "gc_km": fixed_cells(segments["gc_km"], 2),
+        "track_km": fixed_cells(segments["track_km"], 2),
+        "speed_kmph": fixed_cells(segments["speed_kmph"], 1),
+        "speed_source": text_cells(SPEED_SOURCES, segments["speed_source"]),
+        "run_min": fixed_cells(segments["run_min"], 1),
+    }
+    route = {
+        "service": text_cells(network.service.values),
+        "route": text_cells(network.name),
+        "train_number": text_cells(network.train_number),
+        "status": text_cells(network.status.values),
+        "segments": text_cells(routes["n_segments"]),
+        "gc_km": fixed_cells(routes["gc_km"], 1),
+        "track_km": fixed_cells(routes["track_km"], 1),
+        "timetable_km": fixed_cells(network.distance_km, 1),
+        "detour": fixed_cells(routes["detour"], 3),
+        "speed_kmph": fixed_cells(routes["speed_kmph"], 1),
+        "speed_source": text_cells(SPEED_SOURCES, routes["speed_source"]),
+        "run_min": fixed_cells(routes["run_min"], 0),
+    }
+
+    codes, categories = network.service.codes, network.service.categories
+    k = len(categories)
+    n_routes = np.bincount(codes, minlength=k)
+    track = np.bincount(codes, weights=routes["track_km"], minlength=k)
+    run = routes["run_min"]
+    has_run = np.bincount(codes, weights=np.isfinite(run), minlength=k) > 0
+    median_speed = np.array([np.nanmedian(routes["speed_kmph"][codes == c])
+                             if np.isfinite(routes["speed_kmph"][codes == c]).any() else np.nan
+                             for c in range(k)])
+    with np.errstate(invalid="ignore"):
+        service = {
+            "service": text_cells(categories),
+            "routes": text_cells(n_routes),
+            "segments": text_cells(np.bincount(codes, weights=routes["n_segments"],
+                                          minlength=k).astype(np.int64)),
+            "gc_km": fixed_cells(np.bincount(codes, weights=routes["gc_km"], minlength=k), 1),
+            "track_km": fixed_cells(track, 1),
+            "mean_route_km": fixed_cells(track / n_routes, 1),
+            "median_speed_kmph": fixed_cells(median_speed, 1),
+            "run_hours": fixed_cells(np.where(has_run, np.bincount(
+                codes, weights=np.nan_to_num(run), minlength=k) / 60, np.nan), 1),
+        }
+    return seg, route, service
+
+
+def write_stats(network, path=STATS_FILE, columnar=".npz"):
+    """Write segment, route and service tables next to ``path``; returns the paths.
+
+    ``columnar`` is ``".npz"`` (numpy, always available) or ``".parquet"``
+    (needs ``pandas`` + ``pyarrow``) for the segment table.
+    """
+    path = Path(path)
+    segments, routes = segment_stats(network)
+    tables = stats_tables(network, segments, routes)
+    stem = path.with_suffix("")
+    outputs = [path, stem.with_name("route_stats.csv"), stem.with_name("service_stats.csv")]
+    for table, output in zip(tables, outputs):
+        write_csv(output, table)
+    columnar_path = stem.with_suffix(columnar)
+    if columnar == ".parquet":
+        import pandas as pd
+
+        rid = segments["route_id"]
+        pd.DataFrame({
+            **segments,
+            "service": pd.Categorical.from_codes(segments["service"],
+                                                 network.service.categories),
+            "route": network.name[rid],
+            "from_station": network.station_name[segments["from_id"]],
+            "to_station": network.station_name[segments["to_id"]],
+            "speed_source": SPEED_SOURCES[segments["speed_source"]],
+        }).to_parquet(columnar_path, index=False)
+    else:
+        np.savez(columnar_path, **segments,
+                 station_name=network.station_name, route_name=network.name,
+                 service_name=network.service.categories, speed_sources=SPEED_SOURCES)
+    outputs.append(columnar_path)
+    return outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.stats",
+                                     description="Segment distance/run-time statistics.")
+    parser.add_argument("--out", default=STATS_FILE, help="segment CSV path")
+    parser.add_argument("--columnar", choices=[".npz", ".parquet"], default=".npz")
+    args = parser.parse_args(argv)
+
+    network = Network.load(verbose=False)
+    t0 = time.perf_counter()
+    outputs = write_stats(network, args.out, args.columnar)
+    print(f"✅ {network.n_stops - network.n_routes} segments in "
+          f"{time.perf_counter() - t0:.2f}s -> {', '.join(str(p) for p in outputs)}")
+
+
+if __name__ == "__main__":
+    main()
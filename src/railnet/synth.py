@@ -0,0 +1,168 @@
+"""
+Synthetic route networks at any multiple of the real data's size.
+
+Every real route is a template that is copied ``scale`` times.  Each copy
+keeps the template's service, metadata and stop sequence (randomly
+reversed), but every stop is either the real station or one of its
+*satellites*: synthetic stations scattered around the real one (normal
+offset, ``spread_km``).  Routes therefore keep the real geography, length
+distribution and shared corridors, while the station count grows as
+``scale ** station_growth`` (national networks reuse stations heavily).
+
+Output is the existing JSON schema (one ``{"routes": [...]}`` section per
+service), or NDJSON for ``.ndjson`` paths, written route by route.
+
+    cd src && python -m railnet.synth --scale 100      # build/synthetic/routes_x100.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from railnet.loader import DATA_DIR, ROUTE_COLUMNS, SERVICES, load_services
+from railnet.network import Network
+
+SYNTH_DIR = DATA_DIR.parent / "build" / "synthetic"
+SUFFIXES = ("Road", "Cantt", "Town", "Halt", "East", "West", "City", "Jn")
+KM_PER_DEG = 111.32
+
+
+class Satellites:
+    """Real stations plus synthetic satellites; satellites of station ``j`` are
+    ``offsets[j]:offsets[j + 1]`` in ``lat``/``lon``/``name``."""
+
+    def __init__(self, network, scale, station_growth=0.5, spread_km=8.0, rng=None):
+        rng = rng or np.random.default_rng(0)
+        n = network.n_stations
+        weight = network.station_route_counts().astype(np.float64)
+        extra = n * (scale ** station_growth - 1)
+        # Busier stations grow more satellites
+        counts = rng.poisson(extra * weight / weight.sum())
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        parent = np.repeat(np.arange(n), counts)
+        rank = np.arange(len(parent)) - self.offsets[parent]
+        spread = spread_km / KM_PER_DEG
+        self.lat = np.round(network.station_lat[parent]
+                            + rng.normal(0, spread, len(parent)), 5)
+        coslat = np.cos(np.radians(network.station_lat[parent]))
+        self.lon = np.round(network.station_lon[parent]
+                            + rng.normal(0, spread, len(parent)) / coslat, 5)
+        suffix = np.array(SUFFIXES)[rank % len(SUFFIXES)]
+        nth = np.where(rank >= len(SUFFIXES), np.char.add(" ", (rank // len(SUFFIXES) + 1)
+                                                          .astype(str)), "")
+        self.name = np.char.add(np.char.add(np.char.add(network.station_name[parent], " "),
+                                            suffix), nth)
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets)
+
+
+def synthetic_routes(data=None, scale=10, seed=0, station_growth=0.5, spread_km=8.0,
+                     real_share=0.5):
+    """Yield ``(service, route dict)`` of ``scale`` copies of every route in ``data``.
+
+    ``real_share`` is the probability a stop stays at the real station
+    rather than one of its satellites.  Routes come grouped by service.
+    """
+    data = data if data is not None else load_services(verbose=False)
+    rng = np.random.default_rng(seed)
+    network = Network.from_routes(data)
+    sats = Satellites(network, scale, station_growth, spread_km, rng)
+    counts = sats.counts
+    # Real stations first, satellites after them
+    all_lat = np.concatenate([network.station_lat, sats.lat])
+    all_lon = np.concatenate([network.station_lon, sats.lon])
+    all_names = np.concatenate([network.station_name, sats.name])
+    stops, offsets = network.route_stops, network.route_offsets
+    number = 0
+    for service in dict.fromkeys(data.service.tolist()):
+        idx = np.flatnonzero(data.service == service)
+        for _ in range(scale):
+            keep = (rng.random(len(stops)) < real_share) | (counts[stops] == 0)
+            pick = sats.offsets[stops] + (rng.random(len(stops)) * counts[stops]).astype(np.int64)
+            chosen = np.where(keep, stops, network.n_stations + pick)
+            lat, lon, names = all_lat[chosen], all_lon[chosen], all_names[chosen]
+            reverse = rng.random(network.n_routes) < 0.5
+            stretch = rng.normal(1.0, 0.05, network.n_routes)
+            for i in idx:
+                order = range(offsets[i], offsets[i + 1])
+                if reverse[i]:
+                    order = reversed(order)
+                stations = [{"name": str(names[s]), "lat": float(lat[s]), "lon": float(lon[s]),
+                             **({"stop_type": str(data.stop_type[s])} if data.stop_type[s] else {})}
+                            for s in order]
+                number += 1
+                route = {"name": f"{stations[0]['name']} - {stations[-1]['name']}",
+                         "train_number": f"S{number:06d}"}
+                for col, (key, dtype, _) in ROUTE_COLUMNS.items():
+                    if col in ("name", "train_number"):
+                        continue
+                    value = getattr(data, col)[i]
+                    if dtype is str and value:
+                        route[key] = str(value)
+                    elif dtype is not str and np.isfinite(value):
+                        route[key] = round(float(value) * (stretch[i] if col == "distance_km"
+                                                           else 1.0), 1)
+                route["stations"] = stations
+                yield service, route
+
+
+def write_routes(routes, path):
+    """Write ``(service, route)`` pairs (grouped by service) in the JSON schema
+    (``.json``) or as NDJSON (``.ndjson``/``.jsonl``); returns the route count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        if path.suffix in (".ndjson", ".jsonl"):
+            for service, route in routes:
+                f.write(json.dumps({"service": service, **route}, ensure_ascii=False) + "\n")
+                n += 1
+        else:
+            current = None
+            f.write("{")
+            for service, route in routes:
+                if service != current:
+                    section = SERVICES[service][1] if service in SERVICES else service
+                    if section == "routes":
+                        section = f"{service}_routes"
+                    f.write(("\n  ]},\n" if current else "\n") + f'  "{section}": {{"routes": [\n')
+                    current, first = service, True
+                f.write(("" if first else ",\n") + "    " + json.dumps(route, ensure_ascii=False))
+                first = False
+                n += 1
+            f.write("\n  ]}\n}\n" if current else "}\n")
+    tmp.replace(path)
+    return n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.synth",
+                                     description="Generate a synthetic network N times the real data.")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--station-growth", type=float, default=0.5,
+                        help="stations grow as scale ** this (default 0.5)")
+    parser.add_argument("--spread-km", type=float, default=8.0,
+                        help="std-dev of satellite offsets from their real station")
+    parser.add_argument("--out", help="output .json or .ndjson "
+                                      "(default build/synthetic/routes_x<scale>.json)")
+    args = parser.parse_args(argv)
+
+    out = Path(args.out or SYNTH_DIR / f"routes_x{args.scale}.json")
+    t0 = time.perf_counter()
+    n = write_routes(synthetic_routes(scale=args.scale, seed=args.seed,
+                                      station_growth=args.station_growth,
+                                      spread_km=args.spread_km), out)
+    print(f"✅ {n} routes -> {out} ({out.stat().st_size / 2**20:.1f} MB, "
+          f"{time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+XYZ tile pyramid export (Web Mercator, 256 px PNG tiles).
+
+Route segments and stations are bucketed into the tiles they touch (with a
+buffer for line width and marker size), empty tiles are never rendered, and
+each tile's content is hashed.  ``tiles.json`` in the output directory keeps
+those hashes, so re-exporting after a route edit only re-renders the tiles
+whose content actually changed and removes tiles that became empty.
+Each zoom draws the routes at its own level of detail (:mod:`railnet.lod`).
+
+    cd src && python -m railnet.tiles premium_express --out ../build/tiles --zoom 4 9
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from railnet.basemap import EARTH_HALF_CIRCUMFERENCE
+from railnet.geometry import WEB_MERCATOR, project_lonlat
+from railnet.lod import RouteLOD, zoom_tolerance_m
+from railnet.maps import MAP_SPECS
+from railnet.render import network_for_spec, route_layer, routes_for_spec
+
+TILE_SIZE = 256
+# Bump to force a full re-render when the tile styling code changes.
+STYLE_VERSION = 1
+
+
+def tile_size_m(z):
+    return 2 * EARTH_HALF_CIRCUMFERENCE / 2 ** z
+
+
+def _tile_ids(x, y, z, buffer_m):
+    """Tiles (``tx, ty`` arrays) within ``buffer_m`` of each point, plus the point index."""
+    size = tile_size_m(z)
+    n = 2 ** z
+    cols = [np.floor((x + d + EARTH_HALF_CIRCUMFERENCE) / size) for d in (-buffer_m, buffer_m)]
+    rows = [np.floor((EARTH_HALF_CIRCUMFERENCE - y - d) / size) for d in (-buffer_m, buffer_m)]
+    point = np.arange(len(x))
+    tx = np.concatenate([c for c in cols for _ in rows]).astype(np.int64)
+    ty = np.concatenate([r for _ in cols for r in rows]).astype(np.int64)
+    idx = np.tile(point, 4)
+    ok = (tx >= 0) & (tx < n) & (ty >= 0) & (ty < n)
+    return tx[ok], ty[ok], idx[ok]
+
+
+def _sample_segments(segments, step):
+    """Points every ``step`` metres along each segment, with their segment index."""
+    start, end = segments[:, 0], segments[:, 1]
+    length = np.hypot(*(end - start).T)
+    counts = np.ceil(length / step).astype(np.int64) + 1
+    seg = np.repeat(np.arange(len(segments)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    t = (np.arange(counts.sum()) - first) / np.maximum(np.repeat(counts - 1, counts), 1)
+    pts = start[seg] + (end - start)[seg] * t[:, None]
+    return pts[:, 0], pts[:, 1], seg
+
+
+def bucket(z, segments, sx, sy, line_px, marker_px):
+    """``{(x, y): (segment ids, station ids)}`` for every non-empty tile at ``z``."""
+    m_per_px = tile_size_m(z) / TILE_SIZE
+    # Every point of a segment is within step/2 of a sample, so buffering the
+    # samples by that much (plus the line half-width) never misses a tile.
+    step = tile_size_m(z) / 2
+    px, py, seg = _sample_segments(segments, step)
+    tx, ty, i = _tile_ids(px, py, z, line_px * m_per_px + step / 2)
+    seg_keys = np.unique(np.column_stack([tx, ty, seg[i]]), axis=0)
+    tx, ty, i = _tile_ids(sx, sy, z, marker_px * m_per_px)
+    st_keys = np.unique(np.column_stack([tx, ty, i]), axis=0)
+
+    tiles = {}
+    for keys, slot in ((seg_keys, 0), (st_keys, 1)):
+        if not len(keys):
+            continue
+        tile_index, starts = np.unique(keys[:, :2], axis=0, return_index=True)
+        for (x, y), ids in zip(map(tuple, tile_index), np.split(keys[:, 2], starts[1:])):
+            tiles.setdefault((int(x), int(y)), [np.empty(0, np.int64), np.empty(0, np.int64)])
+            tiles[(int(x), int(y))][slot] = ids
+    return tiles
+
+
+def _content_hash(layers, z, seg_ids, st_ids):
+    level = layers["levels"][z]
+    h = hashlib.sha1(str(STYLE_VERSION).encode())
+    h.update(level["segments"][seg_ids].round(1).tobytes())
+    h.update(level["colors"][seg_ids].tobytes())
+    h.update(level["widths"][seg_ids].tobytes())
+    h.update(np.column_stack([layers["sx"], layers["sy"]])[st_ids].round(1).tobytes())
+    h.update(layers["transfer"][st_ids].tobytes())
+    h.update(repr(layers["style"]).encode())
+    return h.hexdigest()[:16]
+
+
+_WORKER = {}
+
+
+def _init_worker(layers):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    _WORKER["layers"] = layers
+
+
+def _render_tiles(out_dir, jobs):
+    import matplotlib.pyplot as plt
+
+    from railnet.draw import draw_segments, draw_stations, draw_transfer_stations
+
+    layers = _WORKER["layers"]
+    style = layers["style"]
+    dpi = 100
+    fig = plt.figure(figsize=(TILE_SIZE / dpi, TILE_SIZE / dpi), dpi=dpi)
+    for z, x, y, seg_ids, st_ids in jobs:
+        fig.clear()
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+        size = tile_size_m(z)
+        left = -EARTH_HALF_CIRCUMFERENCE + x * size
+        top = EARTH_HALF_CIRCUMFERENCE - y * size
+        ax.set_xlim(left, left + size)
+        ax.set_ylim(top - size, top)
+        if len(seg_ids):
+            level = layers["levels"][z]
+            draw_segments(ax, level["segments"][seg_ids], level["colors"][seg_ids],
+                          linewidths=level["widths"][seg_ids], alpha=style["alpha"])
+        if len(st_ids):
+            sx, sy = layers["sx"][st_ids], layers["sy"][st_ids]
+            if style["transfer_markers"]:
+                draw_transfer_stations(ax, sx, sy, layers["transfer"][st_ids])
+            else:
+                draw_stations(ax, sx, sy, sizes=style["marker_size"], color=style["marker_color"])
+        path = Path(out_dir) / str(z) / str(x) / f"{y}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(path, dpi=dpi, transparent=True)
+    plt.close(fig)
+    return len(jobs)
+
+
+def map_layers(spec, network=None, zooms=range(4, 10)):
+    """Projected drawing layers for a map spec (routes per zoom), as plain numpy arrays."""
+    network = network if network is not None else network_for_spec(spec)
+    sx, sy = project_lonlat(network.station_lon, network.station_lat, WEB_MERCATOR)
+    lod = None
+    if spec.get("lod", True):
+        lod = RouteLOD(network, sx, sy, routes_for_spec(network, spec))
+    levels = {}
+    for z in zooms:
+        segments, colors, widths = route_layer(network, sx, sy, spec, zoom_tolerance_m(z), lod)
+        levels[z] = {"segments": segments, "colors": colors, "widths": widths}
+    return {
+        "levels": levels,
+        "sx": np.asarray(sx),
+        "sy": np.asarray(sy),
+        "transfer": network.station_route_counts() > 1,
+        "style": {
+            "line_width": spec["route_line_width"],
+            "alpha": spec.get("route_alpha", 1.0),
+            "transfer_markers": bool(spec.get("transfer_markers")),
+            "marker_size": spec["station_marker_size"],
+            "marker_color": spec["station_marker_color"],
+        },
+    }
+
+
+def export_tiles(spec, out_dir, zooms=range(4, 10), workers=None, network=None, verbose=True):
+    """Write (or update) the tile pyramid for ``spec`` under ``out_dir``.
+
+    Returns ``(rendered, unchanged, removed)`` tile counts.
+    """
+    out_dir = Path(out_dir)
+    layers = map_layers(spec, network, zooms)
+    style = layers["style"]
+    # Buffers: half a line width, and the marker radius (s is in points²)
+    widest = max((level["widths"].max(initial=0) for level in layers["levels"].values()),
+                 default=0)
+    line_px = max(widest, style["line_width"]) / 2 * 100 / 72
+    marker_px = np.sqrt(max(style["marker_size"], 120)) / 2 * 100 / 72 + 1
+
+    manifest_path = out_dir / "tiles.json"
+    old = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    new, jobs = {}, []
+    for z in zooms:
+        segments = layers["levels"][z]["segments"]
+        for (x, y), (seg_ids, st_ids) in bucket(z, segments, layers["sx"], layers["sy"],
+                                                line_px, marker_px).items():
+            key = f"{z}/{x}/{y}"
+            new[key] = _content_hash(layers, z, seg_ids, st_ids)
+            if old.get(key) != new[key] or not (out_dir / f"{key}.png").exists():
+                jobs.append((z, x, y, seg_ids, st_ids))
+
+    removed = [key for key in old if key not in new]
+    for key in removed:
+        (out_dir / f"{key}.png").unlink(missing_ok=True)
+
+    if jobs:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        chunks = [jobs[i::workers * 4] for i in range(workers * 4) if jobs[i::workers * 4]]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(layers,)) as pool:
+            list(pool.map(_render_tiles, [out_dir] * len(chunks), chunks))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(new, sort_keys=True))
+    os.replace(tmp, manifest_path)
+    unchanged = len(new) - len(jobs)
+    if verbose:
+        print(f"✅ {len(jobs)} tiles rendered, {unchanged} unchanged, "
+              f"{len(removed)} removed in {out_dir}")
+    return len(jobs), unchanged, len(removed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.tiles",
+                                     description="Export a map as an XYZ tile pyramid.")
+    parser.add_argument("map", choices=sorted(MAP_SPECS))
+    parser.add_argument("--out", required=True, help="output directory ({z}/{x}/{y}.png)")
+    parser.add_argument("--zoom", type=int, nargs=2, default=(4, 9), metavar=("MIN", "MAX"))
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    export_tiles(MAP_SPECS[args.map], args.out, range(args.zoom[0], args.zoom[1] + 1),
+                 workers=args.workers)
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
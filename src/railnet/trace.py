@@ -0,0 +1,228 @@
+"""
+Opt-in instrumentation: timed spans around pipeline stages plus counters.
+
+    from railnet import trace
+
+    with trace.span("load", services="rajdhani"):
+        ...
+    trace.count("tiles_fetched")
+
+Tracing is off unless enabled (``railnet --trace trace.json <command>``, or
+``RAILNET_TRACE=trace.json`` for the scripts).  While off, :func:`span`
+returns a shared no-op context manager and :func:`count` returns at once,
+so the instrumentation can stay in hot paths.
+
+Each span records wall time, process CPU time and memory.  By default
+memory is the process RSS high-water mark when the span ends (free to
+read); ``memory="tracemalloc"`` (``--trace-memory``) records each span's own
+peak allocation instead, at the cost of slower Python code.  Results export
+as Chrome trace-event JSON (``chrome://tracing`` or Perfetto) and as a
+summary table.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+_TRACER = None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB.
+
+    Linux ``ru_maxrss`` survives ``exec`` (a child started from a large
+    parent inherits its peak), so ``VmHWM`` is preferred where available.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024
+
+
+def _now_us():
+    return time.time_ns() / 1000
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "ts", "t0", "c0", "peak")
+
+    def __init__(self, tracer, name, args):
+        self.tracer, self.name, self.args = tracer, name, args
+        self.peak = 0
+
+    def __enter__(self):
+        tracer = self.tracer
+        if tracer.memory == "tracemalloc":
+            # The parent keeps the peak seen so far before the counter is reset
+            if tracer.stack:
+                parent = tracer.stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        tracer.stack.append(self)
+        self.ts = _now_us()
+        self.t0, self.c0 = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.t0
+        cpu = time.process_time() - self.c0
+        tracer = self.tracer
+        tracer.stack.pop()
+        if tracer.memory == "tracemalloc":
+            peak_mb = max(self.peak, tracemalloc.get_traced_memory()[1]) / 2**20
+        else:
+            peak_mb = peak_rss_mb()
+        tracer.events.append({
+            "name": self.name, "cat": "stage", "ph": "X", "ts": self.ts, "dur": wall * 1e6,
+            "pid": tracer.pid, "tid": threading.get_native_id(),
+            "args": {"cpu_ms": round(cpu * 1e3, 3), "peak_mb": round(peak_mb, 2),
+                     **self.args},
+        })
+        return False
+
+
+class Tracer:
+    """Collects span and counter events of one process."""
+
+    def __init__(self, memory="rss"):
+        if memory not in ("rss", "tracemalloc"):
+            raise ValueError(f"Unknown memory mode: {memory}")
+        self.memory = memory
+        self.pid = os.getpid()
+        self.events = []
+        self.counters = {}
+        self.stack = []
+        if memory == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def span(self, name, args):
+        return _Span(self, name, args)
+
+    def count(self, name, n):
+        total = self.counters[name] = self.counters.get(name, 0) + n
+        self.events.append({"name": name, "cat": "counter", "ph": "C", "ts": _now_us(),
+                            "pid": self.pid, "tid": 0, "args": {name: total}})
+
+    def drain(self):
+        """Remove and return what was recorded so far (worker -> parent)."""
+        payload = {"events": self.events, "counters": self.counters}
+        self.events, self.counters = [], {}
+        return payload
+
+    def extend(self, payload):
+        """Merge a :meth:`drain` payload from another process."""
+        self.events += payload["events"]
+        for name, n in payload["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def write_chrome(self, path):
+        """Chrome trace-event JSON; returns the path."""
+        pids = {e["pid"] for e in self.events} | {self.pid}
+        meta = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                 "args": {"name": "railnet" if pid == self.pid else f"worker {pid}"}}
+                for pid in sorted(pids)]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": meta + self.events, "displayTimeUnit": "ms",
+                       "otherData": {"memory": self.memory, "counters": self.counters}}, f)
+        return path
+
+    def summary(self):
+        """Per-span-name totals (calls, wall, CPU, max peak) and counters as text."""
+        rows = {}
+        for e in self.events:
+            if e["ph"] != "X":
+                continue
+            row = rows.setdefault(e["name"], [0, 0.0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += e["dur"] / 1e6
+            row[2] += e["args"]["cpu_ms"] / 1e3
+            row[3] = max(row[3], e["args"]["peak_mb"])
+        peak = "peak MB" if self.memory == "tracemalloc" else "RSS MB"
+        lines = [f"{'stage':<16} {'calls':>6} {'wall s':>9} {'cpu s':>9} {peak:>9}"]
+        lines += [f"{name:<16} {n:>6} {wall:9.3f} {cpu:9.3f} {mb:9.1f}"
+                  for name, (n, wall, cpu, mb) in rows.items()]
+        if self.counters:
+            lines.append("")
+            lines += [f"{name:<16} {value:>6}" for name, value in self.counters.items()]
+        return "\n".join(lines)
+
+
+def span(name, **args):
+    """Context manager timing ``name``; a no-op unless tracing is enabled."""
+    if _TRACER is None:
+        return _NO_SPAN
+    return _TRACER.span(name, args)
+
+
+def count(name, n=1):
+    """Add ``n`` to counter ``name`` (no-op unless tracing is enabled)."""
+    if _TRACER is not None:
+        _TRACER.count(name, n)
+
+
+def enable(memory="rss"):
+    global _TRACER
+    _TRACER = Tracer(memory)
+    return _TRACER
+
+
+def disable():
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    return tracer
+
+
+def active():
+    """The active :class:`Tracer`, or ``None``."""
+    return _TRACER
+
+
+def config():
+    """Settings to re-enable tracing in a worker process (``None`` when off)."""
+    return None if _TRACER is None else {"memory": _TRACER.memory}
+
+
+def finish(path):
+    """Disable tracing, write ``path`` and print the summary."""
+    tracer = disable()
+    if tracer is None:
+        return None
+    tracer.write_chrome(path)
+    print(tracer.summary())
+    print(f"Trace written to {path}")
+    return path
+
+
+def from_env():
+    """Enable tracing when ``RAILNET_TRACE`` names an output file (written at exit)."""
+    path = os.environ.get("RAILNET_TRACE")
+    if not path or _TRACER is not None:
+        return
+    enable(os.environ.get("RAILNET_TRACE_MEMORY", "rss"))
+    owner = os.getpid()
+    # Forked pool workers inherit the tracer; only the process that enabled it writes
+    atexit.register(lambda: os.getpid() == owner and finish(path))
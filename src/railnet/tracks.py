@@ -0,0 +1,669 @@
+"""
+Snap station-to-station segments to real track geometry from a local OSM extract.
+
+Routes are otherwise drawn as straight lines between consecutive stations.
+This stage:
+
+1. reads ``railway=rail`` ways from an ``.osm.pbf`` (needs pyosmium) or a
+   GeoJSON extract (LineStrings; ways that share a coordinate share a node),
+2. builds an indexed rail graph: a symmetric CSR matrix of track km between
+   consecutive way nodes and a KD-tree over the nodes
+   (:class:`railnet.spatial.StationIndex`), cached in ``data/.cache`` per
+   extract hash,
+3. map-matches every distinct station pair of the network (the shared
+   segments of :mod:`railnet.corridors`, so a segment used by fifty routes is
+   solved once) to the shortest rail path between the ``CANDIDATES`` track
+   nodes within ``SNAP_KM`` of either station.  Pairs are grouped by origin
+   station: one multi-source Dijkstra, bounded by the detour limit, answers
+   all of an origin's pairs.  Origins are split across worker processes.
+
+Snapped polylines are cached per station pair (coordinates quantized to
+~1 m) and rail graph, so other networks, services or synthetic data that
+share a pair reuse it.  Pairs with no track nearby, or whose rail path is
+longer than ``MAX_DETOUR`` times the great-circle distance plus
+``DETOUR_SLACK_KM``, keep the straight line (``snapped`` is False).
+``"track_geometry": "<extract>"`` in a map spec draws routes along the
+snapped tracks.
+
+    cd src && python -m railnet.tracks ../data/osm/india-rail.osm.pbf
+    cd src && python -m railnet.tracks extract.geojson --services vande_bharat --workers 8
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from railnet import trace
+from railnet.corridors import corridors, edge_keys
+from railnet.geodesy import haversine_km
+from railnet.loader import cache_dir, content_hash, file_hash
+
+# OSM railway=* values read as track
+RAILWAY_TYPES = ("rail",)
+# Track nodes further than this from a station are not candidates
+SNAP_KM = 2.0
+CANDIDATES = 4
+# Rail paths longer than MAX_DETOUR * great-circle + DETOUR_SLACK_KM are rejected
+MAX_DETOUR = 2.0
+DETOUR_SLACK_KM = 20.0
+# Bump when reading or matching changes
+TRACKS_VERSION = 2
+# GeoJSON vertices within 1e-7 degrees are the same node
+_NODE_QUANTUM = 1e7
+# Station pair keys: coordinates in 1e-5 degree steps (~1 m)
+_PAIR_QUANTUM = 1e5
+
+
+def _params():
+    """Settings that change snapped geometry (part of every snap cache key)."""
+    return (TRACKS_VERSION, SNAP_KM, CANDIDATES, MAX_DETOUR, DETOUR_SLACK_KM)
+
+
+def _ways(lengths, coords, node_keys):
+    """``(lat, lon, way_offsets, way_nodes)`` with dense node ids from per-vertex keys."""
+    _, first, way_nodes = np.unique(node_keys, return_index=True, return_inverse=True)
+    way_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=way_offsets[1:])
+    return coords[first, 1], coords[first, 0], way_offsets, way_nodes.astype(np.int64)
+
+
+def read_geojson(path, railway_types=RAILWAY_TYPES):
+    """Rail ways of a GeoJSON extract; features without a ``railway``/``fclass`` tag are kept."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    lines = []
+    for feature in data.get("features", [data]):
+        props = feature.get("properties") or {}
+        kind = props.get("railway", props.get("fclass"))
+        if kind is not None and kind not in railway_types:
+            continue
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "LineString":
+            lines.append(geometry["coordinates"])
+        elif geometry.get("type") == "MultiLineString":
+            lines.extend(geometry["coordinates"])
+    lines = [line for line in lines if len(line) > 1]
+    lengths = np.array([len(line) for line in lines], dtype=np.int64)
+    coords = np.array([p[:2] for line in lines for p in line], dtype=np.float64).reshape(-1, 2)
+    q = np.round(coords * _NODE_QUANTUM).astype(np.int64)
+    keys = (q[:, 1] + 90 * int(_NODE_QUANTUM)) * (360 * int(_NODE_QUANTUM) + 1) \
+        + q[:, 0] + 180 * int(_NODE_QUANTUM)
+    return _ways(lengths, coords, keys)
+
+
+def read_pbf(path, railway_types=RAILWAY_TYPES):
+    """Rail ways of an OSM PBF extract (OSM node ids identify shared nodes)."""
+    try:
+        import osmium
+    except ImportError as e:
+        raise ImportError("reading .osm.pbf extracts needs pyosmium (pip install osmium)") from e
+
+    lengths, refs, coords = [], [], []
+    tags = [("railway", kind) for kind in railway_types]
+    # Node locations are collected before the tag filter drops untagged nodes
+    ways = (osmium.FileProcessor(str(path)).with_locations()
+            .with_filter(osmium.filter.TagFilter(*tags)))
+    for obj in ways:
+        if not obj.is_way():
+            continue
+        nodes = [n for n in obj.nodes if n.location.valid()]
+        if len(nodes) < 2:
+            continue
+        lengths.append(len(nodes))
+        refs.extend(n.ref for n in nodes)
+        coords.extend((n.location.lon, n.location.lat) for n in nodes)
+    coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+    return _ways(np.array(lengths, dtype=np.int64), coords, np.array(refs, dtype=np.int64))
+
+
+class RailGraph:
+    """Track nodes, undirected track edges ``(u, v, km)`` and their indexes."""
+
+    def __init__(self, lat, lon, u, v, km, key=None):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.u, self.v, self.km = np.asarray(u), np.asarray(v), np.asarray(km)
+        self.key = key
+        self._graph = self._index = None
+
+    @classmethod
+    def from_ways(cls, lat, lon, way_offsets, way_nodes, key=None):
+        """One edge per consecutive node pair of every way (parallel edges merged)."""
+        n = len(lat)
+        way_of = np.repeat(np.arange(len(way_offsets) - 1), np.diff(way_offsets))
+        same = way_of[:-1] == way_of[1:]
+        a, b = way_nodes[:-1][same], way_nodes[1:][same]
+        pairs = np.unique(edge_keys(a[a != b], b[a != b], n))
+        u, v = np.divmod(pairs, n)
+        # Drop nodes that are on no edge (single-node ways, duplicates)
+        used = np.unique(np.concatenate([u, v]))
+        remap = np.full(n, -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        lat, lon = np.asarray(lat)[used], np.asarray(lon)[used]
+        u, v = remap[u], remap[v]
+        return cls(lat, lon, u, v, haversine_km(lat[u], lon[u], lat[v], lon[v]), key)
+
+    @property
+    def n_nodes(self):
+        return len(self.lat)
+
+    @property
+    def graph(self):
+        """Symmetric CSR matrix of track km."""
+        if self._graph is None:
+            from scipy.sparse import csr_matrix
+
+            w = np.maximum(self.km, 1e-6)
+            self._graph = csr_matrix((np.concatenate([w, w]),
+                                      (np.concatenate([self.u, self.v]),
+                                       np.concatenate([self.v, self.u]))),
+                                     shape=(self.n_nodes, self.n_nodes))
+        return self._graph
+
+    @property
+    def index(self):
+        """KD-tree over the track nodes."""
+        if self._index is None:
+            from railnet.spatial import StationIndex
+
+            self._index = StationIndex(self.lat, self.lon)
+        return self._index
+
+    def save(self, path):
+        tmp = Path(path).with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp, lat=self.lat, lon=self.lon, u=self.u, v=self.v, km=self.km)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path, key=None):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls(npz["lat"], npz["lon"], npz["u"], npz["v"], npz["km"], key)
+
+
+def rail_key(extract, railway_types=RAILWAY_TYPES):
+    """Cache key of the rail graph of an extract."""
+    return content_hash((file_hash(extract) + repr((TRACKS_VERSION, railway_types))).encode())
+
+
+def rail_graph(extract, railway_types=RAILWAY_TYPES, use_cache=True):
+    """:class:`RailGraph` of an extract, through the cache; ``.key`` identifies it."""
+    extract = Path(extract)
+    key = rail_key(extract, railway_types)
+    path = cache_dir() / f"rail-{key}.npz"
+    if use_cache and path.exists():
+        return RailGraph.open(path, key)
+    reader = read_pbf if extract.name.endswith(".pbf") else read_geojson
+    with trace.span("rail_graph", extract=extract.name):
+        rail = RailGraph.from_ways(*reader(extract, railway_types), key=key)
+    if use_cache:
+        rail.save(path)
+    return rail
+
+
+def _gather(offsets, rows, reverse):
+    """CSR ``(offsets, idx)`` of the vertex ranges ``rows``, reversed where ``reverse``."""
+    start, stop = offsets[rows], offsets[rows + 1]
+    counts = stop - start
+    out = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(counts, out=out[1:])
+    step = np.arange(out[-1]) - np.repeat(out[:-1], counts)
+    idx = np.where(np.repeat(reverse, counts), np.repeat(stop - 1, counts) - step,
+                   np.repeat(start, counts) + step)
+    return out, idx
+
+
+def contract(rail, keep=()):
+    """Junction graph of ``rail``: nodes of degree != 2 and ``keep``, linked by chains.
+
+    A chain is a maximal run of edges through degree-2 nodes.  Returns the
+    arrays :class:`_Matcher` needs (plain numpy, so they can be saved for
+    worker processes).
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import breadth_first_order, connected_components
+
+    n, u, v = rail.n_nodes, np.asarray(rail.u), np.asarray(rail.v)
+    n_edges = len(u)
+    ends = np.concatenate([u, v])
+    inc_edges = np.concatenate([np.arange(n_edges), np.arange(n_edges)])[
+        np.argsort(ends, kind="stable")]
+    degree = np.bincount(ends, minlength=n)
+    inc_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=inc_offsets[1:])
+    junction = degree != 2
+    junction[np.asarray(keep, dtype=np.int64)] = True
+    for _ in range(2):
+        inner = np.flatnonzero(~junction)
+        e1, e2 = inc_edges[inc_offsets[inner]], inc_edges[inc_offsets[inner] + 1]
+        links = coo_matrix((np.ones(len(inner), dtype=np.int8), (e1, e2)),
+                           shape=(n_edges, n_edges))
+        n_chains, chain = connected_components(links, directed=False)
+        # Closed loops of degree-2 nodes get a junction at their lowest node
+        has_end = np.zeros(n_chains, dtype=bool)
+        has_end[chain[junction[u]]] = True
+        has_end[chain[junction[v]]] = True
+        if has_end.all():
+            break
+        loose = np.flatnonzero(~has_end[chain])
+        lowest = np.full(n_chains, n, dtype=np.int64)
+        np.minimum.at(lowest, chain[loose], np.minimum(u[loose], v[loose]))
+        junction[lowest[lowest < n]] = True
+
+    # The two junction ends of every chain (the first is its start)
+    at_u, at_v = np.flatnonzero(junction[u]), np.flatnonzero(junction[v])
+    end_edge = np.concatenate([at_u, at_v])
+    end_side = np.r_[np.zeros(len(at_u), dtype=bool), np.ones(len(at_v), dtype=bool)]
+    order = np.argsort(chain[end_edge], kind="stable")
+    end_edge, end_side = end_edge[order], end_side[order]
+    end_node = np.where(end_side, v[end_edge], u[end_edge]).reshape(n_chains, 2)
+    length = np.bincount(chain, weights=rail.km, minlength=n_chains)
+
+    # Node order along every chain: give each chain private copies of its end
+    # junctions, so chains are separate paths, and walk them all in one BFS
+    # from a root linked to every chain start
+    cu, cv = u.copy(), v.copy()
+    copies = n + np.arange(2 * n_chains)
+    cu[end_edge[~end_side]] = copies[~end_side]
+    cv[end_edge[end_side]] = copies[end_side]
+    root = n + 2 * n_chains
+    size = root + 1
+    rows = np.concatenate([cu, np.full(n_chains, root)])
+    cols = np.concatenate([cv, copies[0::2]])
+    tree = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(size, size))
+    walk = breadth_first_order(tree.tocsr(), root, directed=False, return_predecessors=False)[1:]
+    node_chain = np.empty(size, dtype=np.int64)
+    node_chain[u], node_chain[v] = chain, chain
+    node_chain[copies] = np.repeat(np.arange(n_chains), 2)
+    walk = walk[np.argsort(node_chain[walk], kind="stable")]
+    original = np.concatenate([np.arange(n), end_node.ravel()])
+    chain_offsets = np.zeros(n_chains + 1, dtype=np.int64)
+    np.cumsum(np.bincount(node_chain[walk], minlength=n_chains), out=chain_offsets[1:])
+
+    nodes = np.flatnonzero(junction)
+    dense = np.full(n, -1, dtype=np.int64)
+    dense[nodes] = np.arange(len(nodes))
+    a, b = dense[end_node[:, 0]], dense[end_node[:, 1]]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    ids = np.flatnonzero(lo != hi)
+    # Keep the shortest of parallel chains
+    ids = ids[np.lexsort((length[ids], hi[ids], lo[ids]))]
+    key = lo[ids] * len(nodes) + hi[ids]
+    first = np.r_[True, key[1:] != key[:-1]]
+    return {
+        "lat": rail.lat, "lon": rail.lon,
+        "chain_offsets": chain_offsets, "chain_vertices": original[walk],
+        "junction_nodes": nodes, "chain_key": key[first], "chain_id": ids[first],
+        "chain_length": np.maximum(length[ids[first]], 1e-6),
+    }
+
+
+class _Matcher:
+    """Shortest rail paths on the junction graph, expanded back to track nodes.
+
+    The graph has one extra, unconnected node (id ``n``): :meth:`seeded`
+    links it to a station's candidate nodes, so that a single search from it
+    counts the station-to-track distance of every candidate.
+    """
+
+    def __init__(self, arrays):
+        from scipy.sparse import csr_matrix
+
+        for name, value in arrays.items():
+            setattr(self, name, value)
+        n = len(self.junction_nodes)
+        self.dense = np.full(len(self.lat), -1, dtype=np.int64)
+        self.dense[self.junction_nodes] = np.arange(n)
+        lo, hi = np.divmod(self.chain_key, n)
+        w = self.chain_length
+        self.graph = csr_matrix((np.concatenate([w, w]),
+                                 (np.concatenate([lo, hi]), np.concatenate([hi, lo]))),
+                                shape=(n + 1, n + 1))
+
+    def seeded(self, sources, km):
+        """The graph with edges ``km`` from the extra node to the junctions ``sources``."""
+        from scipy.sparse import csr_matrix
+
+        # One edge per junction: the closest candidate snapping to it
+        order = np.lexsort((km, sources))
+        first = np.r_[True, sources[order][1:] != sources[order][:-1]]
+        sources, km = sources[order][first], km[order][first]
+        g = self.graph
+        return csr_matrix((np.concatenate([g.data, km]), np.concatenate([g.indices, sources]),
+                           np.r_[g.indptr[:-1], g.nnz + len(sources)]), shape=g.shape)
+
+    def chain_nodes(self, c, start):
+        """Track nodes of chain ``c`` from its end ``start`` to the other end."""
+        nodes = self.chain_vertices[self.chain_offsets[c]:self.chain_offsets[c + 1]]
+        return nodes if nodes[0] == start else nodes[::-1]
+
+    def expand(self, path):
+        """Track nodes along a path of junction ids."""
+        n = len(self.junction_nodes)
+        nodes = [self.junction_nodes[path[:1]]]
+        for a, b in zip(path[:-1], path[1:]):
+            row = np.searchsorted(self.chain_key, min(a, b) * n + max(a, b))
+            chain = self.chain_nodes(int(self.chain_id[row]), self.junction_nodes[a])
+            nodes.append(chain[1:])
+        return np.concatenate(nodes)
+
+
+_WORKER = {}
+
+
+def _init_worker(path):
+    with np.load(path, allow_pickle=False) as npz:
+        _WORKER["matcher"] = _Matcher({name: npz[name] for name in npz.files})
+
+
+def _match(jobs):
+    """Snap ``jobs``: ``(origin lat, lon, candidate nodes, km, targets)``, where each
+    target is ``(pair, lat, lon, candidate nodes, km)``.
+
+    Returns ``(pair, lon, lat)`` polylines from origin to target, the
+    stations included at both ends; ``lon`` is None if the pair stays straight.
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    m = _WORKER["matcher"]
+    results = []
+    for o_lat, o_lon, s_ids, s_km, targets in jobs:
+        pairs = [t[0] for t in targets]
+        found = s_ids >= 0
+        if not found.any():
+            results.extend((p, None, None) for p in pairs)
+            continue
+        sources, s_km = m.dense[s_ids[found]], s_km[found]
+        t_lat = np.array([t[1] for t in targets])
+        t_lon = np.array([t[2] for t in targets])
+        t_ids = np.array([t[3] for t in targets])
+        t_km = np.array([t[4] for t in targets])
+        gc = haversine_km(o_lat, o_lon, t_lat, t_lon)
+        limit = MAX_DETOUR * gc + DETOUR_SLACK_KM
+        # Distances from the station itself: every candidate starts at its walk
+        start = len(m.junction_nodes)
+        dist, pred = dijkstra(m.seeded(sources, s_km), indices=start,
+                              limit=float(limit.max()), return_predecessors=True)
+        dense = np.where(t_ids >= 0, m.dense[np.maximum(t_ids, 0)], 0)
+        cost = np.where(t_ids >= 0, dist[dense] + t_km, np.inf)
+        best = np.argmin(cost, axis=1)
+        for i, pair in enumerate(pairs):
+            if not cost[i, best[i]] <= limit[i]:
+                results.append((pair, None, None))
+                continue
+            node = int(dense[i, best[i]])
+            path = []
+            while node != start:
+                path.append(node)
+                node = int(pred[node])
+            nodes = m.expand(path[::-1])
+            results.append((pair, np.r_[o_lon, m.lon[nodes], t_lon[i]],
+                            np.r_[o_lat, m.lat[nodes], t_lat[i]]))
+    return results
+
+
+class SnapCache:
+    """Snapped polylines per quantized station pair, for one rail graph."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pairs = np.empty((0, 4), dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.lon = self.lat = np.empty(0)
+        self.snapped = np.empty(0, dtype=bool)
+        if path is not None and path.exists():
+            with np.load(path, allow_pickle=False) as npz:
+                self.pairs, self.offsets = npz["pairs"], npz["offsets"]
+                self.lon, self.lat, self.snapped = npz["lon"], npz["lat"], npz["snapped"]
+        self.row = {tuple(p): i for i, p in enumerate(self.pairs.tolist())}
+
+    def add(self, pairs, lines):
+        """Append ``pairs`` (n, 4) with their ``(lon, lat, snapped)`` polylines."""
+        lengths = np.array([len(lon) for lon, _, _ in lines], dtype=np.int64)
+        for p in pairs.tolist():
+            self.row[tuple(p)] = len(self.row)
+        self.pairs = np.concatenate([self.pairs, pairs])
+        self.offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum(lengths)])
+        self.lon = np.concatenate([self.lon, *(lon for lon, _, _ in lines)])
+        self.lat = np.concatenate([self.lat, *(lat for _, lat, _ in lines)])
+        self.snapped = np.concatenate([self.snapped, [s for _, _, s in lines]])
+
+    def save(self):
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp, pairs=self.pairs, offsets=self.offsets, lon=self.lon, lat=self.lat,
+                 snapped=self.snapped)
+        os.replace(tmp, self.path)
+
+
+def snap_segments(rail, a_lat, a_lon, b_lat, b_lon, workers=None, use_cache=True):
+    """Track polylines from ``a`` to ``b`` for station pairs (arrays).
+
+    Returns ``(offsets, lon, lat, snapped)``: pair ``i`` is
+    ``offsets[i]:offsets[i + 1]``, starting at ``a`` and ending at ``b``.
+    """
+    a_lat, a_lon, b_lat, b_lon = (np.asarray(c, dtype=np.float64)
+                                  for c in (a_lat, a_lon, b_lat, b_lon))
+    q = np.round(np.column_stack([a_lat, a_lon, b_lat, b_lon]) * _PAIR_QUANTUM).astype(np.int64)
+    # Canonical order: the lexicographically smaller station first
+    flip = (q[:, 0] > q[:, 2]) | ((q[:, 0] == q[:, 2]) & (q[:, 1] > q[:, 3]))
+    q[flip] = q[flip][:, [2, 3, 0, 1]]
+    pairs, first, inverse = np.unique(q, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    name = f"tracks-{content_hash((str(rail.key) + repr(_params())).encode())}.npz"
+    cache = SnapCache(cache_dir() / name if use_cache and rail.key else None)
+
+    missing = [i for i, p in enumerate(pairs.tolist()) if tuple(p) not in cache.row]
+    if missing:
+        with trace.span("snap", pairs=len(missing)):
+            lines = _solve(rail, pairs[missing], a_lat, a_lon, b_lat, b_lon,
+                           first[missing], flip[first[missing]], workers)
+        cache.add(pairs[missing], lines)
+        trace.count("snapped_pairs", len(missing))
+        if cache.path is not None:
+            cache.save()
+
+    rows = np.array([cache.row[tuple(p)] for p in pairs.tolist()], dtype=np.int64)[inverse]
+    offsets, idx = _gather(cache.offsets, rows, flip)
+    return offsets, cache.lon[idx], cache.lat[idx], cache.snapped[rows]
+
+
+def _solve(rail, pairs, a_lat, a_lon, b_lat, b_lon, first, flipped, workers):
+    """``(lon, lat, snapped)`` per canonical pair, oriented like the pair."""
+    # Exact station coordinates of each canonical end
+    lat1 = np.where(flipped, b_lat[first], a_lat[first])
+    lon1 = np.where(flipped, b_lon[first], a_lon[first])
+    lat2 = np.where(flipped, a_lat[first], b_lat[first])
+    lon2 = np.where(flipped, a_lon[first], b_lon[first])
+    lines = [(np.array([lon1[i], lon2[i]]), np.array([lat1[i], lat2[i]]), False)
+             for i in range(len(pairs))]
+    solve = np.flatnonzero((pairs[:, 0] != pairs[:, 2]) | (pairs[:, 1] != pairs[:, 3]))
+    if not len(solve) or not rail.n_nodes:
+        return lines
+
+    # Candidate track nodes of both ends, all kept as junctions of the contracted graph
+    k = min(CANDIDATES, rail.n_nodes)
+    s_km, s_ids = (a.reshape(len(solve), k) for a in
+                   rail.index.nearest(lat1[solve], lon1[solve], k=k, max_km=SNAP_KM))
+    t_km, t_ids = (a.reshape(len(solve), k) for a in
+                   rail.index.nearest(lat2[solve], lon2[solve], k=k, max_km=SNAP_KM))
+    keep = np.unique(np.concatenate([s_ids.ravel(), t_ids.ravel()]))
+    with trace.span("contract", nodes=rail.n_nodes):
+        arrays = contract(rail, keep[keep >= 0])
+
+    # Group by origin station: one bounded multi-source Dijkstra each
+    origin_key = pairs[solve, 0] * (360 * int(_PAIR_QUANTUM) + 1) + pairs[solve, 1]
+    order = np.argsort(origin_key, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(origin_key[order]) != 0])
+    jobs = []
+    for group in np.split(order, starts[1:]):
+        g = group[0]
+        targets = [(int(solve[j]), lat2[solve[j]], lon2[solve[j]], t_ids[j], t_km[j])
+                   for j in group]
+        jobs.append((lat1[solve[g]], lon1[solve[g]], s_ids[g], s_km[g], targets))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    chunk = max(1, len(jobs) // (workers * 8))
+    batches = [jobs[i:i + chunk] for i in range(0, len(jobs), chunk)]
+    if workers == 1:
+        _WORKER["matcher"] = _Matcher(arrays)
+        results = [r for batch in batches for r in _match(batch)]
+        _WORKER.clear()
+    else:
+        tmp = cache_dir() / f"junctions-{os.getpid()}.tmp.npz"
+        np.savez(tmp, **arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(tmp,)) as pool:
+                results = [r for batch in pool.map(_match, batches) for r in batch]
+        finally:
+            tmp.unlink(missing_ok=True)
+    for pair, lon, lat in results:
+        if lon is not None:
+            lines[pair] = (lon, lat, True)
+    return lines
+
+
+@dataclass
+class TrackGeometry:
+    """Polylines of a network's distinct station pairs, oriented from lower to higher id."""
+
+    key: np.ndarray
+    n_stations: int
+    offsets: np.ndarray
+    lon: np.ndarray
+    lat: np.ndarray
+    snapped: np.ndarray
+
+    def __len__(self):
+        return len(self.key)
+
+    def km(self):
+        """Length of every polyline."""
+        step = haversine_km(self.lat[:-1], self.lon[:-1], self.lat[1:], self.lon[1:])
+        owner = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        inside = owner[1:] == owner[:-1]
+        return np.bincount(owner[1:][inside], weights=step[inside], minlength=len(self))
+
+    def paths(self, u, v):
+        """CSR ``(offsets, vertex ids)`` of the polyline from ``u`` to ``v`` per pair."""
+        u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+        rows = np.searchsorted(self.key, edge_keys(u, v, self.n_stations))
+        return _gather(self.offsets, rows, u > v)
+
+    def segments(self, u, v, x, y, tolerance=0.0):
+        """Drawing segments ``(m, 2, 2)`` of the pairs ``(u, v)`` and the pair of each.
+
+        ``x``/``y`` are the vertices projected (``lon``/``lat`` order); a
+        positive ``tolerance`` (same units) simplifies each polyline first.
+        """
+        import shapely
+
+        offsets, idx = self.paths(u, v)
+        owner = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        xy = np.column_stack([np.asarray(x)[idx], np.asarray(y)[idx]])
+        if tolerance > 0 and len(xy):
+            lines = shapely.simplify(shapely.linestrings(xy, indices=owner), tolerance)
+            xy, owner = shapely.get_coordinates(lines, return_index=True)
+        same = owner[1:] == owner[:-1]
+        segments = np.stack([xy[:-1][same], xy[1:][same]], axis=1)
+        return segments, owner[:-1][same]
+
+    def route_coords(self, network, routes=None):
+        """Vertex ids along each route (all by default) and the position of each route."""
+        u, v, route_ids = network.edges()
+        if routes is not None:
+            keep = np.isin(route_ids, routes)
+            u, v, route_ids = u[keep], v[keep], route_ids[keep]
+        offsets, idx = self.paths(u, v)
+        # Consecutive segments share their joint: drop it from all but a route's first
+        joint = np.zeros(len(idx), dtype=bool)
+        later = np.flatnonzero(np.r_[False, route_ids[1:] == route_ids[:-1]])
+        joint[offsets[later]] = True
+        owner = np.repeat(route_ids, np.diff(offsets))
+        return idx[~joint], owner[~joint]
+
+    def route_km(self, network):
+        """Track km of every route (sum over its segments)."""
+        u, v, route_ids = network.edges()
+        rows = np.searchsorted(self.key, edge_keys(u, v, self.n_stations))
+        return np.bincount(route_ids, weights=self.km()[rows], minlength=network.n_routes)
+
+
+def track_geometry(network, extract, workers=None, use_cache=True):
+    """:class:`TrackGeometry` of every distinct station pair of ``network``.
+
+    The result is also cached per network, so redrawing a map does not load
+    the rail graph at all.
+    """
+    shared = corridors(network, split=False)
+    lat, lon = network.station_lat, network.station_lon
+    digest = content_hash(b"".join([
+        str(rail_key(extract)).encode(), repr(_params()).encode(),
+        shared.key.tobytes(), np.ascontiguousarray(lat).tobytes(),
+        np.ascontiguousarray(lon).tobytes()]))
+    path = cache_dir() / f"track-geometry-{digest}.npz"
+    if use_cache and path.exists():
+        with np.load(path) as z:
+            return TrackGeometry(key=shared.key, n_stations=network.n_stations,
+                                 offsets=z["offsets"], lon=z["lon"], lat=z["lat"],
+                                 snapped=z["snapped"])
+    rail = rail_graph(extract, use_cache=use_cache)
+    offsets, t_lon, t_lat, snapped = snap_segments(rail, lat[shared.u], lon[shared.u],
+                                                   lat[shared.v], lon[shared.v],
+                                                   workers, use_cache)
+    if use_cache:
+        tmp = path.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp, offsets=offsets, lon=t_lon, lat=t_lat, snapped=snapped)
+        os.replace(tmp, path)
+    return TrackGeometry(key=shared.key, n_stations=network.n_stations, offsets=offsets,
+                         lon=t_lon, lat=t_lat, snapped=snapped)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.tracks",
+                                     description="Snap routes to OSM rail geometry.")
+    parser.add_argument("extract", help="OSM extract (.osm.pbf or GeoJSON)")
+    parser.add_argument("--services", nargs="+", default=[], help="default: all")
+    parser.add_argument("--routes", help="route file instead of the service data")
+    parser.add_argument("--workers", type=int, help="processes for map matching")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    from railnet.network import Network
+
+    if args.routes:
+        from railnet.ingest import ingest_network
+
+        network = ingest_network(args.routes)
+    else:
+        network = Network.load(*args.services, verbose=False)
+    use_cache = not args.no_cache
+    t0 = time.perf_counter()
+    try:
+        rail = rail_graph(args.extract, use_cache=use_cache)
+    except (ImportError, FileNotFoundError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    t1 = time.perf_counter()
+    print(f"✅ Rail graph: {rail.n_nodes} nodes, {len(rail.u)} edges in {t1 - t0:.2f}s")
+    tracks = track_geometry(network, args.extract, args.workers, use_cache)
+    seconds = time.perf_counter() - t1
+    shared = corridors(network, split=False)
+    gc = shared.km(network)
+    km = tracks.km()
+    snapped = tracks.snapped
+    print(f"✅ {len(tracks)} station pairs in {seconds:.2f}s: {snapped.sum()} snapped "
+          f"({snapped.mean():.0%}), {np.diff(tracks.offsets).sum()} vertices")
+    if snapped.any():
+        print(f"   track km / great-circle km on snapped pairs: "
+              f"{km[snapped].sum() / max(gc[snapped].sum(), 1e-9):.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
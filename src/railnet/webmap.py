@@ -0,0 +1,152 @@
+"""
+Interactive HTML export: one self-contained Leaflet page for any mix of services.
+
+The page carries a compact TopoJSON-style encoding instead of GeoJSON:
+
+* coordinates are quantized to ``QUANTUM_DEG`` (~11 m) integer steps and
+  delta-encoded, so most numbers are one or two digits,
+* each shared corridor chain (:class:`railnet.lod.RouteLOD`) is stored once
+  as an *arc*; routes reference arcs by index and list their stops as
+  delta-encoded station indices (stations sorted by position),
+* each service is one multi-polyline layer with a toggle, drawn on a canvas
+  renderer; station popups are built on click from the route stop lists.
+
+    cd src && python -m railnet.webmap                     # all services
+    cd src && python -m railnet.webmap --services rajdhani duronto --out /tmp/premium.html
+"""
+
+import argparse
+import json
+import os
+import time
+from html import escape
+
+import numpy as np
+
+from railnet.loader import SERVICES
+from railnet.lod import RouteLOD
+from railnet.maps import MAP_SPECS, MEDIA_DIR
+from railnet.network import Network
+
+QUANTUM_DEG = 1e-4
+HTML_FILE = MEDIA_DIR / "railnet_network.html"
+# Service colours as the static maps draw them
+SERVICE_COLORS = {service: color for spec in MAP_SPECS.values() if spec["services"]
+                  for service, color in spec["route_colors"].items()}
+LEAFLET = "https://unpkg.com/leaflet@1.9.4/dist"
+
+_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>__TITLE__</title>
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<link rel="stylesheet" href="__LEAFLET__/leaflet.css">
+<script src="__LEAFLET__/leaflet.js"></script>
+<style>html,body,#map{height:100%;margin:0}.leaflet-popup-content{max-height:40vh;overflow:auto}</style>
+</head><body><div id="map"></div><script>
+const D=__DATA__;
+const [qx,qy]=D.transform.scale,[ox,oy]=D.transform.translate;
+const undelta=a=>{let s=0;return a.map(v=>s+=v)};
+const sx=undelta(D.stations.x),sy=undelta(D.stations.y);
+const ll=(x,y)=>[y*qy+oy,x*qx+ox];
+const extent=a=>a.reduce(([lo,hi],v)=>[v<lo?v:lo,v>hi?v:hi],[Infinity,-Infinity]);
+const esc=s=>String(s).replace(/[&<>"']/g,c=>"&#"+c.charCodeAt(0)+";");
+const arcs=D.arcs.map(a=>{const p=[];let x=0,y=0;
+  for(let i=0;i<a.length;i+=2){x+=a[i];y+=a[i+1];p.push(ll(x,y))}return p});
+const [x0,x1]=extent(sx),[y0,y1]=extent(sy);
+const map=L.map("map",{preferCanvas:true}).fitBounds([ll(x0,y0),ll(x1,y1)]);
+L.tileLayer("https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png",
+  {attribution:"&copy; OpenStreetMap &copy; CARTO",maxZoom:18}).addTo(map);
+const R=D.routes,overlays={},at=sx.map(()=>[]);
+D.services.forEach((s,k)=>{
+  const used=new Set();
+  R.service.forEach((rs,r)=>{if(rs===k)R.arcs[r].forEach(a=>used.add(a))});
+  overlays[s.label]=L.polyline([...used].map(a=>arcs[a]),{color:s.color,weight:3,opacity:.85})
+    .addTo(map)});
+R.stops.forEach((st,r)=>undelta(st).forEach(i=>at[i].push(r)));
+const stations=L.layerGroup(sx.map((x,i)=>L.circleMarker(ll(x,sy[i]),
+  {radius:at[i].length>1?5:3,color:"#333",weight:1,fillColor:"#FFA500",fillOpacity:.9})
+  .bindPopup(()=>"<b>"+esc(D.stations.name[i])+"</b><br>"+[...new Set(at[i])].map(r=>
+    esc(D.services[R.service[r]].label+": "+R.name[r])).join("<br>")))).addTo(map);
+overlays["Stations"]=stations;
+L.control.layers(null,overlays,{collapsed:innerWidth<600}).addTo(map);
+</script></body></html>
+"""
+
+
+def _delta(values):
+    values = np.asarray(values, dtype=np.int64)
+    return np.diff(values, prepend=0).tolist()
+
+
+def encode(network, quantum=QUANTUM_DEG, colors=None):
+    """Compact topology of ``network`` as a JSON-ready dict (see the module docstring)."""
+    colors = {**SERVICE_COLORS, **(colors or {})}
+    lon0, lat0 = float(network.station_lon.min()), float(network.station_lat.min())
+    qx = np.round((network.station_lon - lon0) / quantum).astype(np.int64)
+    qy = np.round((network.station_lat - lat0) / quantum).astype(np.int64)
+
+    # Stations ordered by position: neighbours in the list are neighbours on the map
+    order = np.lexsort((qy, qx))
+    new_id = np.empty(network.n_stations, dtype=np.int64)
+    new_id[order] = np.arange(network.n_stations)
+
+    lod = RouteLOD(network, qx, qy)
+    arcs = []
+    for i in range(lod.n_chains):
+        stations = lod.vertex_station[lod.chain_offsets[i]:lod.chain_offsets[i + 1]]
+        xy = np.column_stack([qx[stations], qy[stations]])
+        xy[1:] -= xy[:-1].copy()
+        arcs.append(xy.ravel().tolist())
+    route_arcs = [[] for _ in range(network.n_routes)]
+    for chain, route in zip(lod.pair_chain.tolist(), lod.pair_route.tolist()):
+        route_arcs[route].append(chain)
+
+    services = [str(s) for s in network.service.categories]
+    return {
+        "transform": {"scale": [quantum, quantum], "translate": [lon0, lat0]},
+        "services": [{"key": s, "label": SERVICES[s][2] if s in SERVICES else s,
+                      "color": colors.get(s, "#555555")} for s in services],
+        "stations": {"name": network.station_name[order].tolist(),
+                     "x": _delta(qx[order]), "y": _delta(qy[order])},
+        "arcs": arcs,
+        "routes": {
+            "name": network.name.tolist(),
+            "service": network.service.codes.tolist(),
+            "arcs": route_arcs,
+            "stops": [_delta(new_id[network.route_station_ids(i)])
+                      for i in range(network.n_routes)],
+        },
+    }
+
+
+def export_html(network, path=HTML_FILE, title="Indian Railways Network", quantum=QUANTUM_DEG,
+                colors=None):
+    """Write the interactive page for ``network``; returns the path."""
+    data = json.dumps(encode(network, quantum, colors), separators=(",", ":"),
+                      ensure_ascii=False)
+    html = (_TEMPLATE.replace("__TITLE__", escape(title)).replace("__LEAFLET__", LEAFLET)
+            .replace("__DATA__", data.replace("</", "<\\/")))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m railnet.webmap",
+                                     description="Export an interactive Leaflet map.")
+    parser.add_argument("--services", nargs="+", default=[], help="default: all")
+    parser.add_argument("--out", default=HTML_FILE, help="HTML path")
+    parser.add_argument("--title", default="Indian Railways Network")
+    parser.add_argument("--quantum", type=float, default=QUANTUM_DEG,
+                        help="coordinate step in degrees (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    network = Network.load(*args.services, verbose=False)
+    t0 = time.perf_counter()
+    path = export_html(network, args.out, args.title, args.quantum)
+    size = os.path.getsize(path)
+    print(f"✅ {network.n_routes} routes, {network.n_stations} stations -> {path} "
+          f"({size / 1024:.0f} KB) in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    """Compiled caches go to a temporary directory, not ``data/.cache``."""
+    with pytest.MonkeyPatch.context() as mp:
+        path = tmp_path_factory.mktemp("cache")
+        mp.setenv("RAILNET_CACHE_DIR", str(path))
+        yield path
+
+
+@pytest.fixture(scope="session")
+def network():
+    """All services in ``data/``."""
+    from railnet.network import Network
+
+    return Network.load(verbose=False)
@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+
+from railnet import trace
+from railnet.basemap import (BasemapUnavailable, TileStore, auto_zoom, basemap_raster,
+                             tile_extent_merc, tile_range)
+
+
+@pytest.mark.parametrize("bounds", [
+    (67.0, 5.0, 98.0, 38.0),      # India
+    (76.0, 8.0, 77.0, 30.0),      # tall and narrow
+    (70.0, 25.0, 90.0, 25.5),     # wide and flat
+    (77.1, 28.5, 77.3, 28.7),     # Delhi
+])
+def test_auto_zoom_follows_contextily(bounds):
+    contextily_tile = pytest.importorskip("contextily.tile")
+    assert auto_zoom(bounds) == contextily_tile._calculate_zoom(*bounds)
+
+
+def test_auto_zoom_takes_the_coarser_axis():
+    assert auto_zoom((76.0, 8.0, 77.0, 30.0)) == auto_zoom((60.0, 8.0, 82.0, 30.0))
+
+
+def _png(color):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGBA", (256, 256), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Offline store holding the zoom-5 tiles of a small box, one colour per tile."""
+    store = TileStore(root=tmp_path, offline=True)
+    x0, y0, x1, y1 = tile_range((75.0, 20.0, 85.0, 28.0), 5)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            path = store.path(5, x, y)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(_png((10 * x % 256, 10 * y % 256, 0, 255)))
+    return store
+
+
+def test_offline_store_never_downloads(store):
+    bounds = (75.0, 20.0, 85.0, 28.0)
+    assert store.covers(bounds, 5)
+    assert not store.covers(bounds, 6)
+    with pytest.raises(BasemapUnavailable):
+        store.get(6, 0, 0)
+    with pytest.raises(BasemapUnavailable):
+        store.prewarm([6], bounds)
+    assert store.fetched == 0
+
+
+def test_stitched_raster_is_cached(store):
+    bounds = (75.0, 20.0, 85.0, 28.0)
+    x0, y0, x1, y1 = tile_range(bounds, 5)
+    img, extent = basemap_raster(bounds, zoom=5, store=store)
+    assert img.shape == (256 * (y1 - y0 + 1), 256 * (x1 - x0 + 1), 4)
+    np.testing.assert_allclose(extent, tile_extent_merc(5, x0, y0, x1, y1))
+    # Top-left pixel comes from the top-left tile
+    assert tuple(img[0, 0, :2]) == (10 * x0 % 256, 10 * y0 % 256)
+
+    tracer = trace.enable()
+    try:
+        again, _ = basemap_raster(bounds, zoom=5, store=store)
+    finally:
+        trace.disable()
+    np.testing.assert_array_equal(again, img)
+    assert tracer.counters == {"basemap_cache_hits": 1}
+    assert list(store.root.glob("rasters/*.npz"))
+    assert not list(store.root.glob("rasters/*.tmp*"))
@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+
+from railnet import build
+from railnet.build import Builder, Manifest, _save_npz, hash_json
+
+
+def make_stage(builder, path, value, log):
+    def run():
+        log.append(value)
+        _save_npz(path, {"x": np.array([value])})
+    return lambda inputs: builder.stage("tables:test", inputs, [path], run)
+
+
+def test_stage_reruns_only_when_inputs_or_outputs_change(tmp_path):
+    builder = Builder(tmp_path, verbose=False)
+    out, log = tmp_path / "tables.npz", []
+    stage = make_stage(builder, out, 1, log)
+
+    first = stage({"a.json": "h1"})
+    assert stage({"a.json": "h1"}) == first and log == [1]
+    stage({"a.json": "h2"})
+    assert log == [1, 1]
+
+    _save_npz(out, {"x": np.array([2])})  # edited behind the manifest's back
+    stage({"a.json": "h2"})
+    out.unlink()
+    stage({"a.json": "h2"})
+    assert log == [1, 1, 1, 1]
+    assert builder.skipped == ["tables:test"]
+
+
+def test_unchanged_upstream_content_stops_the_rebuild(tmp_path):
+    builder = Builder(tmp_path, verbose=False)
+    tables, network, log = tmp_path / "tables.npz", tmp_path / "network.npz", []
+
+    def downstream(h):
+        return builder.stage("network:test", h, [network],
+                             lambda: log.append("network") or _save_npz(network, {"y": [0]}))
+
+    downstream(make_stage(builder, tables, 1, log)({"a.json": "h1"}))
+    # The source file changed (new hash) but normalises to the same arrays
+    downstream(make_stage(builder, tables, 1, log)({"a.json": "reformatted"}))
+    assert log == [1, "network", 1]
+
+
+def test_incomplete_stage_is_not_recorded(tmp_path):
+    builder = Builder(tmp_path, verbose=False)
+    out, runs = tmp_path / "map.png", []
+
+    def render():
+        runs.append(1)
+        out.write_bytes(b"png")
+        return len(runs) > 1  # first render fell back to no basemap
+
+    assert builder.stage("render:test", [], [out], render) is None
+    assert builder.stage("render:test", [], [out], render) is not None
+    builder.stage("render:test", [], [out], render)
+    assert len(runs) == 2
+
+
+def test_manifest_persists_and_drops_other_versions(tmp_path, monkeypatch):
+    out = tmp_path / "tables.npz"
+    builder = Builder(tmp_path, verbose=False)
+    make_stage(builder, out, 1, [])({"a.json": "h1"})
+    builder.manifest.save()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    log = []
+    make_stage(Builder(tmp_path, verbose=False), out, 1, log)({"a.json": "h1"})
+    assert log == []
+    recorded = json.loads((tmp_path / "manifest.json").read_text())["stages"]
+    assert list(recorded["tables:test"]["outputs"]) == [str(out.resolve())]
+
+    monkeypatch.setattr(build, "MANIFEST_VERSION", build.MANIFEST_VERSION + 1)
+    assert Manifest(tmp_path / "manifest.json").stages == {}
+
+
+def test_input_hash_ignores_key_order_and_checkout_location():
+    inside = build.ROOT / "data" / "vb_route_data.json"
+    assert hash_json({"a": 1, "p": inside}) == hash_json({"p": "data/vb_route_data.json", "a": 1})
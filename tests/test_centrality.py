@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from railnet.centrality import station_graph, station_importance
+
+nx = pytest.importorskip("networkx")
+
+
+@pytest.fixture(scope="module")
+def graph(network):
+    u, v, km = station_graph(network)
+    g = nx.Graph()
+    g.add_nodes_from(range(network.n_stations))
+    g.add_weighted_edges_from(zip(u.tolist(), v.tolist(), np.maximum(km, 1e-6).tolist()),
+                              weight="km")
+    return g
+
+
+@pytest.fixture(scope="module")
+def importance(network):
+    return station_importance(network, exact=True, workers=1, use_cache=False)
+
+
+def test_betweenness_matches_networkx(network, graph, importance):
+    expected = nx.betweenness_centrality(graph, weight="km", normalized=True)
+    expected = np.array([expected[i] for i in range(network.n_stations)])
+    np.testing.assert_allclose(importance.betweenness, expected, atol=1e-9)
+
+
+def test_closeness_matches_networkx(network, graph, importance):
+    expected = nx.closeness_centrality(graph, distance="km", wf_improved=True)
+    expected = np.array([expected[i] for i in range(network.n_stations)])
+    np.testing.assert_allclose(importance.closeness, expected, rtol=1e-9)
+
+
+def test_degree_counts_distinct_neighbours(network, graph, importance):
+    np.testing.assert_array_equal(importance.degree,
+                                  [graph.degree(i) for i in range(network.n_stations)])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from railnet.corridors import SPLIT_DETOUR, corridors, edge_keys, split_edges
+
+
+def test_edge_keys_are_undirected():
+    assert edge_keys([3, 7], [7, 3], 10).tolist() == [37, 37]
+    assert edge_keys(2, 2, 10) == 22
+
+
+@pytest.mark.parametrize("split", [False, True])
+def test_segment_keys(network, split):
+    shared = corridors(network, split=split)
+    n = network.n_stations
+    assert (shared.u < shared.v).all()
+    np.testing.assert_array_equal(shared.key, shared.u.astype(np.int64) * n + shared.v)
+    assert (np.diff(shared.key) > 0).all()
+    # Every segment is used by some (split) stop pair, and counts its distinct routes
+    assert np.bincount(shared.segment_of_edge, minlength=len(shared)).min() > 0
+    pairs = np.unique(shared.segment_of_edge.astype(np.int64) * network.n_routes
+                      + shared.route_of_edge)
+    np.testing.assert_array_equal(np.bincount(pairs // network.n_routes, minlength=len(shared)),
+                                  shared.route_count)
+
+
+def test_unsplit_segments_are_the_stop_pairs(network):
+    u, v, route_ids = network.edges()
+    shared = corridors(network, split=False)
+    np.testing.assert_array_equal(shared.key, np.unique(edge_keys(u, v, network.n_stations)))
+    np.testing.assert_array_equal(shared.route_of_edge, route_ids)
+
+
+def test_split_pairs_follow_existing_segments(network):
+    u, v, route_ids = network.edges()
+    n = network.n_stations
+    a, b, split_routes = split_edges(network)
+    # Hops are stop pairs of some route, and each route keeps its own hops in order
+    assert np.isin(edge_keys(a, b, n), edge_keys(u, v, n)).all()
+    assert (np.diff(split_routes) >= 0).all()
+    for r in np.unique(route_ids)[:50].tolist():
+        stops = np.r_[u[route_ids == r][:1], v[route_ids == r]]
+        hops_a, hops_b = a[split_routes == r], b[split_routes == r]
+        assert hops_a[0] == stops[0] and hops_b[-1] == stops[-1]
+        np.testing.assert_array_equal(hops_a[1:], hops_b[:-1])
+        assert np.isin(stops, np.r_[hops_a, hops_b[-1:]]).all()
+    # No split path is longer than the detour allowance
+    lat, lon = network.station_lat, network.station_lon
+    from railnet.geodesy import haversine_km
+
+    direct = haversine_km(lat[u], lon[u], lat[v], lon[v]).sum()
+    walked = haversine_km(lat[a], lon[a], lat[b], lon[b]).sum()
+    assert direct <= walked <= SPLIT_DETOUR * direct
+    assert len(corridors(network)) < len(corridors(network, split=False))
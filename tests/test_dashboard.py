@@ -0,0 +1,10 @@
+import os
+
+from railnet.dashboard import APP_FILE, _app_env
+
+
+def test_app_env_keeps_the_callers_pythonpath():
+    env = _app_env({"PYTHONPATH": os.pathsep.join(["/opt/a", "/opt/b"]), "HOME": "/h"})
+    assert env["PYTHONPATH"].split(os.pathsep) == [str(APP_FILE.parent), "/opt/a", "/opt/b"]
+    assert env["HOME"] == "/h"
+    assert _app_env({})["PYTHONPATH"] == str(APP_FILE.parent)
@@ -0,0 +1,46 @@
+import io
+
+import numpy as np
+import pytest
+
+from railnet.ingest import ingest, iter_json, write_csv, write_ndjson
+from railnet.loader import DATA_DIR, RouteData, SERVICES, routes_from_json
+
+
+def assert_same_routes(a, b):
+    for name in RouteData.__dataclass_fields__:
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name), err_msg=name)
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 7, 4096])
+@pytest.mark.parametrize("file_name", sorted({f for f, _, _ in SERVICES.values()}))
+def test_chunk_boundaries_do_not_change_the_result(file_name, chunk_chars):
+    path = DATA_DIR / file_name
+    assert_same_routes(ingest(path, chunk_chars=chunk_chars), ingest(path))
+
+
+def test_streamed_json_matches_the_in_memory_parser():
+    import json
+
+    path = DATA_DIR / "Shatabdi_route_data.json"
+    with open(path, encoding="utf-8") as f:
+        expected = routes_from_json(json.load(f))
+    assert_same_routes(ingest(path, chunk_chars=13), expected)
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 2, 3, 5])
+def test_numbers_split_across_refills_are_read_whole(chunk_chars):
+    text = ('{"routes": [{"name": "A", "distance_km": 1.5e3, "stations": '
+            '[{"name": "X", "lat": -12.25, "lon": 77}]}], "meta": 1.5e3}')
+    [(service, route)] = iter_json(io.StringIO(text), chunk_chars=chunk_chars)
+    assert service == "vande_bharat"
+    assert route["distance_km"] == 1500.0
+    assert route["stations"] == [{"name": "X", "lat": -12.25, "lon": 77}]
+
+
+@pytest.mark.parametrize("writer, suffix", [(write_ndjson, ".ndjson"), (write_csv, ".csv")])
+def test_ndjson_and_csv_round_trip(tmp_path, writer, suffix):
+    data = ingest(DATA_DIR / "rajdhani_route_data.json")
+    path = tmp_path / f"routes{suffix}"
+    writer(data, path)
+    assert_same_routes(ingest(path), data)
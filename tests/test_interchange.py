@@ -0,0 +1,43 @@
+import numpy as np
+
+from railnet.geodesy import haversine_km
+from railnet.interchange import cluster_stations, interchanges
+
+
+def test_links_are_exactly_the_close_pairs():
+    rng = np.random.default_rng(3)
+    lat, lon = rng.uniform(27, 29, 300), rng.uniform(76, 78, 300)
+    result = cluster_stations(lat, lon, radius_km=8)
+    km = haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    u, v = np.nonzero(np.triu(km <= 8, k=1))
+    np.testing.assert_array_equal(result.u, u)
+    np.testing.assert_array_equal(result.v, v)
+    np.testing.assert_allclose(result.km, km[u, v])
+
+    # Every complex fits in a circle of the radius around one of its members
+    for ids in result.complexes():
+        assert (km[np.ix_(ids, ids)] <= 8 + 1e-9).all(axis=1).any()
+    assert result.sizes().sum() == 300
+    first = [ids.min() for ids in result.complexes(min_size=1)]
+    assert first == sorted(first)
+
+
+def test_a_line_of_close_stations_does_not_chain_into_one_complex():
+    # 12 stations 5 km apart: each links to its neighbours, but not to the far end
+    lat = np.full(12, 20.0)
+    lon = 77 + np.arange(12) * 5 / haversine_km(20, 77, 20, 78)
+    result = cluster_stations(lat, lon, radius_km=6)
+    assert len(result.u) == 11
+    # Seeds by most links, ties by id: 1 takes 0-2, then 3, 5, 7 and 9 take their next
+    # neighbour, and 11 is left alone
+    assert result.sizes().tolist() == [3, 2, 2, 2, 2, 1]
+    assert cluster_stations(lat, lon, radius_km=0).n_complexes == 12
+
+
+def test_delhi_terminals_form_one_transfer_complex(network):
+    result = interchanges(network)
+    delhi = [network.station_id(s) for s in ("New Delhi", "Hazrat Nizamuddin")]
+    assert result.complex_id[delhi[0]] == result.complex_id[delhi[1]]
+    exact = network.station_route_counts()
+    assert (result.route_counts(network) >= exact).all()
+    assert (result.is_transfer(network) >= (exact > 1)).all()
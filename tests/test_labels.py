@@ -0,0 +1,44 @@
+import numpy as np
+
+from railnet.labels import CANDIDATES, label_boxes, place_labels
+
+FONT, DPI, OFFSET = 10, 100, 5.0
+
+
+def boxes(placed, px, py, texts):
+    width, height = label_boxes([texts[i] for i, _ in placed], FONT, DPI)
+    offset = OFFSET * DPI / 72
+    out = []
+    for (i, (sx, sy, _, _)), w, h in zip(placed, width, height):
+        x0 = px[i] + sx * offset - (w if sx < 0 else 0)
+        y0 = py[i] + sy * offset - (h if sy < 0 else 0)
+        out.append((x0, y0, x0 + w, y0 + h))
+    return np.array(out)
+
+
+def test_placed_labels_never_overlap_and_stay_in_bounds():
+    rng = np.random.default_rng(1)
+    px, py = rng.uniform(0, 800, (2, 400))
+    texts = [f"Station {i}" * (1 + i % 3) for i in range(400)]
+    bounds = (0, 0, 800, 800)
+    placed = place_labels(px, py, texts, rng.random(400), FONT, DPI, OFFSET, bounds=bounds)
+    b = boxes(placed, px, py, texts)
+    assert 0 < len(placed) < 400
+    assert (b[:, 0] >= 0).all() and (b[:, 1] >= 0).all()
+    assert (b[:, 2] <= 800).all() and (b[:, 3] <= 800).all()
+    overlap = ((b[:, None, 0] < b[None, :, 2]) & (b[None, :, 0] < b[:, None, 2])
+               & (b[:, None, 1] < b[None, :, 3]) & (b[None, :, 1] < b[:, None, 3]))
+    assert overlap.sum() == len(b)  # only each box with itself
+
+
+def test_duplicates_keep_the_best_and_conflicts_move_anchor():
+    px, py = np.array([0.0, 500.0, 2.0]), np.array([0.0, 500.0, 2.0])
+    texts = ["Delhi", "Delhi", "Agra"]
+    placed = place_labels(px, py, texts, [1, 5, 3], FONT, DPI, OFFSET)
+    assert [i for i, _ in placed] == [1, 2]
+    assert [c for _, c in placed] == [CANDIDATES[0], CANDIDATES[0]]
+    # Two labels on the same point: the second takes the next free anchor
+    placed = place_labels(px[:1].repeat(2), py[:1].repeat(2), ["A", "B"], [2, 1], FONT, DPI)
+    assert placed == [(0, CANDIDATES[0]), (1, CANDIDATES[1])]
+    assert len(place_labels(px, py, texts, [1, 5, 3], FONT, DPI, max_labels=1)) == 1
+    assert place_labels([], [], [], [], FONT, DPI) == []
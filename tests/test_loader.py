@@ -0,0 +1,42 @@
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from railnet import ingest
+from railnet.loader import DATA_DIR, RouteData, load_file
+
+
+@pytest.fixture
+def route_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAILNET_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "rajdhani_route_data.json"
+    shutil.copy(DATA_DIR / path.name, path)
+    return path
+
+
+def test_warm_load_skips_the_parser(route_file, monkeypatch):
+    cold = load_file(route_file)
+    monkeypatch.setattr(ingest, "ingest", lambda *a, **k: pytest.fail("cache missed"))
+    warm = load_file(route_file)
+    for name in RouteData.__dataclass_fields__:
+        np.testing.assert_array_equal(getattr(warm, name), getattr(cold, name), err_msg=name)
+
+
+def test_changed_file_replaces_its_cache_only(route_file, tmp_path):
+    load_file(route_file)
+    cache = tmp_path / "cache"
+    [old] = cache.glob("*.npz")
+    foreign = cache / f"{old.stem}.99999.tmp.npz"
+    foreign.write_bytes(b"in flight")
+
+    raw = json.loads(route_file.read_text(encoding="utf-8"))
+    raw["rajdhani_express_routes"]["routes"][0]["name"] = "Renamed Express"
+    route_file.write_text(json.dumps(raw), encoding="utf-8")
+    data = load_file(route_file)
+
+    assert data.name[0] == "Renamed Express"
+    assert not old.exists() and foreign.exists()
+    [new] = set(cache.iterdir()) - {foreign}
+    assert new.stem.startswith("rajdhani_route_data-v") and ".tmp" not in new.name
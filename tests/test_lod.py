@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from railnet.corridors import edge_keys
+from railnet.geometry import WEB_MERCATOR, project_lonlat
+from railnet.lod import RouteLOD, zoom_tolerance_m
+
+
+@pytest.fixture(scope="module")
+def lod(network):
+    x, y = project_lonlat(network.station_lon, network.station_lat, WEB_MERCATOR)
+    return RouteLOD(network, x, y)
+
+
+def test_chains_partition_the_corridor_segments(network, lod):
+    stations, chain = lod.vertex_station, lod.vertex_chain
+    same = chain[1:] == chain[:-1]
+    keys = edge_keys(stations[:-1][same], stations[1:][same], network.n_stations)
+    np.testing.assert_array_equal(np.sort(keys), lod.corridors.key)
+    # Chain ends are never simplified away
+    ends = np.r_[lod.chain_offsets[:-1], lod.chain_offsets[1:] - 1]
+    assert np.isinf(lod.importance[ends]).all()
+
+
+def test_levels_nest_and_stay_within_tolerance(lod):
+    previous = None
+    for z in (4, 7, 10):
+        kept = lod.kept(z)
+        if previous is not None:
+            assert np.isin(previous, kept).all()
+        previous = kept
+
+        tolerance = zoom_tolerance_m(z)
+        long_chain = lod.chain_length[lod.vertex_chain] >= tolerance
+        kept_mask = np.zeros(lod.n_vertices, dtype=bool)
+        kept_mask[kept] = True
+        # Each dropped vertex of a drawn chain lies near the span that replaced it
+        anchors = np.flatnonzero(kept_mask)
+        for i in np.flatnonzero(~kept_mask & long_chain):
+            b = anchors[np.searchsorted(anchors, i)]
+            a = anchors[np.searchsorted(anchors, i) - 1]
+            p, q, r = (np.array([lod.px[k], lod.py[k]]) for k in (a, b, i))
+            t = np.clip(np.dot(r - p, q - p) / max(np.dot(q - p, q - p), 1e-12), 0, 1)
+            assert np.hypot(*(r - p - t * (q - p))) <= tolerance + 1e-6
+
+
+def test_per_route_segments_follow_each_route(network, lod):
+    # Chain of every corridor segment, from the consecutive vertices of each chain
+    stations, chain = lod.vertex_station, lod.vertex_chain
+    same = chain[1:] == chain[:-1]
+    keys = edge_keys(stations[:-1][same], stations[1:][same], network.n_stations)
+    shared = lod.corridors
+    chain_of_segment = chain[1:][same][np.argsort(keys)]
+    expected = np.unique(shared.route_of_edge * lod.n_chains
+                         + chain_of_segment[shared.segment_of_edge])
+    np.testing.assert_array_equal(np.sort(lod.pair_route * lod.n_chains + lod.pair_chain),
+                                  expected)
+
+    z = lod.level_for(zoom_tolerance_m(6))
+    level, level_chain = lod.level(z)
+    segments, route, count = lod.segments(zoom_tolerance_m(6))
+    assert (np.diff(route) >= 0).all()
+    for r in np.unique(lod.pair_route)[::7]:
+        on_route = np.isin(level_chain, lod.pair_chain[lod.pair_route == r])
+        np.testing.assert_array_equal(segments[route == r], level[on_route])
+        np.testing.assert_array_equal(count[route == r],
+                                      lod.chain_route_count[level_chain[on_route]])
@@ -0,0 +1,36 @@
+import warnings
+
+import numpy as np
+
+from railnet.loader import load_services
+from railnet.network import Network, station_coordinates
+
+
+def test_stations_are_unique_names_with_csr_stops(network):
+    data = load_services(verbose=False)
+    assert (network.station_name[:-1] < network.station_name[1:]).all()
+    np.testing.assert_array_equal(network.station_name[network.route_stops], data.stop_name)
+    assert network.route_offsets[-1] == len(network.route_stops) == data.n_stops
+
+
+def test_median_coordinates_ignore_route_order():
+    names = np.array(["A", "B"])
+    inverse = np.array([0, 0, 0, 1])
+    lat, lon = np.array([10.0, 10.2, 10.1, 5.0]), np.array([70.0, 70.0, 70.3, 60.0])
+    station_lat, station_lon = station_coordinates(names, inverse, lat, lon)
+    np.testing.assert_allclose(station_lat, [10.1, 5.0])
+    np.testing.assert_allclose(station_lon, [70.0, 60.0])
+    order = np.array([2, 0, 3, 1])
+    again = station_coordinates(names, inverse[order], lat[order], lon[order])
+    np.testing.assert_array_equal(again[0], station_lat)
+    np.testing.assert_array_equal(again[1], station_lon)
+
+
+def test_load_reports_conflicts_once_without_warning(capsys):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        Network.load(verbose=False)
+        assert capsys.readouterr().out == ""
+        Network.load()
+    out = capsys.readouterr().out
+    assert out.count("station names have stops at different coordinates") == 1
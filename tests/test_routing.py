@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from railnet.routing import JourneyPlanner
+
+
+@pytest.fixture(scope="module")
+def planner(network):
+    return JourneyPlanner(network).preprocess()
+
+
+def test_astar_matches_plan_many(network, planner):
+    rng = np.random.default_rng(0)
+    origins = rng.integers(0, network.n_stations, 200)
+    destinations = rng.integers(0, network.n_stations, 200)
+    batch = planner.plan_many(origins, destinations)
+    for i, (o, d) in enumerate(zip(origins.tolist(), destinations.tolist())):
+        journey = planner.plan(o, d)
+        if journey is None:
+            assert not batch.reachable[i]
+            continue
+        assert batch.reachable[i]
+        assert journey.cost == pytest.approx(batch.cost[i], rel=1e-9, abs=1e-6)
+        assert journey.distance_km + journey.walk_km == pytest.approx(batch.distance_km[i],
+                                                                      abs=1e-6)
+        assert len(journey.transfers) == batch.transfers[i]
+
+
+def test_same_station_is_free(planner):
+    journey = planner.plan(0, 0)
+    assert journey.cost == 0 and journey.legs == []
+    assert planner.plan_many([0], [0]).cost[0] == 0
+
+
+def test_plan_many_chunks_and_bounds_do_not_change_results(network, planner):
+    rng = np.random.default_rng(1)
+    origins = rng.integers(0, network.n_stations, 300)
+    destinations = rng.integers(0, network.n_stations, 300)
+    plain = JourneyPlanner(network)
+    reference = plain.plan_many(origins, destinations, chunk_entries=1 << 30)
+    for result in (plain.plan_many(origins, destinations, chunk_entries=1),
+                   planner.plan_many(origins, destinations, chunk_entries=planner.n_nodes * 7),
+                   planner.plan_many(destinations, origins)):
+        np.testing.assert_allclose(result.cost, reference.cost, rtol=1e-9)
+        np.testing.assert_allclose(result.distance_km, reference.distance_km, rtol=1e-9)
+        np.testing.assert_array_equal(result.transfers, reference.transfers)
+        np.testing.assert_array_equal(result.walks, reference.walks)
+
+
+def test_plan_many_roots_trees_at_the_smaller_side(network, planner):
+    # One destination, many origins: a single tree, rooted at the destination
+    origins = np.arange(network.n_stations)
+    destinations = np.zeros(network.n_stations, dtype=np.int64)
+    result = planner.plan_many(origins, destinations)
+    for o in range(0, network.n_stations, 37):
+        journey = planner.plan(o, 0)
+        assert journey.cost == pytest.approx(result.cost[o], abs=1e-6)
+        assert len(journey.transfers) == result.transfers[o]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from railnet.service import MAX_LIMIT, NetworkService, QueryServer
+
+
+@pytest.fixture(scope="module")
+def service(network):
+    return NetworkService(network)
+
+
+@pytest.mark.parametrize("target", [
+    "/stations",
+    "/stations?q=",
+    "/stations?q=kota&limit=ten",
+    "/routes",
+    "/nearest?lat=26.9",
+    "/nearest?lat=north&lon=75.8",
+    "/nearest?lat=95&lon=75.8",
+    "/path?from=Kota Jn",
+])
+def test_bad_requests(service, target):
+    status, payload = service.answer(target)
+    assert status == 400
+    assert "error" in payload
+
+
+@pytest.mark.parametrize("target", [
+    "/nowhere",
+    "/routes?station=Atlantis Central",
+    "/path?from=Atlantis Central&to=Kota Jn",
+])
+def test_not_found(service, target):
+    status, payload = service.answer(target)
+    assert status == 404
+    assert "error" in payload
+
+
+def test_answers(service, network):
+    name = str(network.station_name[0])
+    status, payload = service.answer(f"/routes?station={name}")
+    assert status == 200 and payload["count"] > 0
+    status, payload = service.answer("/nearest?lat=26.9&lon=75.8&k=3")
+    assert status == 200 and len(payload["stations"]) == 3
+
+
+@pytest.mark.parametrize("limit, count", [("-5", 0), ("0", 0), ("3", 3), ("100000", MAX_LIMIT)])
+def test_stations_limit_is_clamped(service, limit, count):
+    status, payload = service.answer(f"/stations?q=a&limit={limit}")
+    assert status == 200
+    assert len(payload["stations"]) == min(count, payload["count"])
+
+
+def test_internal_errors_are_not_cached(service, capsys):
+    server = QueryServer(service)
+    calls = []
+
+    def broken(query):
+        calls.append(query)
+        raise RuntimeError("boom")
+
+    service.endpoints["/broken"] = broken
+    try:
+        assert server.respond("/broken")[0] == 500
+        assert server.respond("/broken")[0] == 500
+    finally:
+        del service.endpoints["/broken"]
+    assert len(calls) == 2
+    assert server._cached.cache_info().currsize == 0
+    assert "RuntimeError" in capsys.readouterr().err
+
+
+async def _exchange(server, request):
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return int(status)
+
+
+@pytest.mark.parametrize("length, status", [(b"abc", 400), (b"-1", 400), (b"0", 200)])
+def test_content_length(service, length, status):
+    request = b"GET /health HTTP/1.1\r\nConnection: close\r\nContent-Length: " + length
+    assert asyncio.run(_exchange(QueryServer(service), request + b"\r\n\r\n")) == status
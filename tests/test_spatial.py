@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from railnet.geodesy import haversine_km
+from railnet.spatial import StationIndex
+
+
+@pytest.fixture(scope="module")
+def index(network):
+    return StationIndex.from_network(network)
+
+
+def _all_km(index):
+    return haversine_km(index.lat[:, None], index.lon[:, None], index.lat, index.lon)
+
+
+def test_neighbours_match_brute_force(index):
+    km = _all_km(index)
+    np.fill_diagonal(km, np.inf)
+    dist, ids = index.neighbours(k=3)
+    assert not (ids == np.arange(len(index))[:, None]).any()
+    np.testing.assert_allclose(dist, np.sort(km, axis=1)[:, :3], atol=1e-6)
+    np.testing.assert_allclose(np.take_along_axis(km, ids, axis=1), dist, atol=1e-6)
+
+
+def test_neighbours_of_colocated_stations():
+    # Three stations at one point and one 10 km away
+    lat, lon = np.array([20.0, 20.0, 20.0, 20.09]), np.array([80.0, 80.0, 80.0, 80.0])
+    index = StationIndex(lat, lon)
+    dist, ids = index.neighbours(k=2)
+    for i in range(3):
+        assert sorted(ids[i].tolist()) == sorted({0, 1, 2} - {i})
+        np.testing.assert_allclose(dist[i], 0.0, atol=1e-9)
+    assert set(ids[3].tolist()) <= {0, 1, 2}
+    dist, ids = index.neighbours(k=1)
+    assert (ids[:3, 0] != np.arange(3)).all()
+
+
+def test_within_matches_brute_force(index):
+    rng = np.random.default_rng(0)
+    lat, lon = rng.uniform(10, 30, 20), rng.uniform(70, 90, 20)
+    offsets, ids = index.within(lat, lon, 100.0)
+    assert len(offsets) == len(lat) + 1
+    km = haversine_km(lat[:, None], lon[:, None], index.lat, index.lon)
+    for i in range(len(lat)):
+        expected = np.flatnonzero(km[i] <= 100.0)
+        np.testing.assert_array_equal(ids[offsets[i]:offsets[i + 1]], expected)
+
+
+def test_within_scalar_point(index):
+    offsets, ids = index.within(float(index.lat[0]), float(index.lon[0]), 50.0)
+    assert offsets.tolist() == [0, len(ids)]
+    assert 0 in ids.tolist()
+    many_offsets, many_ids = index.within(index.lat[:1], index.lon[:1], 50.0)
+    np.testing.assert_array_equal(offsets, many_offsets)
+    np.testing.assert_array_equal(ids, many_ids)
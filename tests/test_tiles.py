@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+
+from railnet.basemap import EARTH_HALF_CIRCUMFERENCE
+from railnet.loader import load_services
+from railnet.maps import MAP_SPECS
+from railnet.network import Network
+from railnet.tiles import bucket, export_tiles, tile_size_m
+
+SPEC = MAP_SPECS["vande_bharat"]
+
+
+def tile_of(x, y, z):
+    size = tile_size_m(z)
+    return (np.floor((x + EARTH_HALF_CIRCUMFERENCE) / size).astype(int),
+            np.floor((EARTH_HALF_CIRCUMFERENCE - y) / size).astype(int))
+
+
+def test_bucket_covers_every_point_of_every_segment():
+    rng = np.random.default_rng(0)
+    z, size = 6, tile_size_m(6)
+    start = rng.uniform(-3 * size, 3 * size, (40, 2))
+    segments = np.stack([start, start + rng.uniform(-2 * size, 2 * size, (40, 2))], axis=1)
+    sx, sy = rng.uniform(-3 * size, 3 * size, (2, 25))
+    tiles = bucket(z, segments, sx, sy, line_px=0, marker_px=0)
+
+    t = np.linspace(0, 1, 500)[:, None, None]
+    pts = segments[None, :, 0] + (segments[None, :, 1] - segments[None, :, 0]) * t
+    tx, ty = tile_of(pts[..., 0], pts[..., 1], z)
+    for seg in range(len(segments)):
+        for key in set(zip(tx[:, seg].tolist(), ty[:, seg].tolist())):
+            assert seg in tiles[key][0]
+    for i, key in enumerate(zip(*map(np.ndarray.tolist, tile_of(sx, sy, z)))):
+        assert i in tiles[key][1]
+
+
+def test_reexport_renders_only_changed_tiles(tmp_path):
+    data = load_services("vande_bharat", verbose=False)
+    full = Network.from_routes(data)
+    assert export_tiles(SPEC, tmp_path, zooms=[4, 5], workers=1, network=full,
+                        verbose=False)[1:] == (0, 0)
+    manifest = json.loads((tmp_path / "tiles.json").read_text())
+    assert sorted(p.relative_to(tmp_path).with_suffix("").as_posix()
+                  for p in tmp_path.glob("*/*/*.png")) == sorted(manifest)
+
+    assert export_tiles(SPEC, tmp_path, zooms=[4, 5], workers=1, network=full,
+                        verbose=False) == (0, len(manifest), 0)
+
+    # Keep only the routes with a stop in the northern tenth of the map
+    north = data.stop_lat > np.quantile(data.stop_lat, 0.9)
+    keep = np.unique(np.searchsorted(data.stop_offsets, np.flatnonzero(north), side="right") - 1)
+    rendered, unchanged, removed = export_tiles(
+        SPEC, tmp_path, zooms=[4, 5], workers=1, network=Network.from_routes(data.select(keep)),
+        verbose=False)
+    after = json.loads((tmp_path / "tiles.json").read_text())
+    assert removed > 0 and rendered + unchanged == len(after) < len(manifest)
+    assert len(list(tmp_path.glob("*/*/*.png"))) == len(after)
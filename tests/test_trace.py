@@ -0,0 +1,67 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from railnet import trace
+
+
+@pytest.fixture
+def tracing():
+    was_tracing = tracemalloc.is_tracing()
+    yield trace.enable
+    trace.disable()
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def test_disabled_tracing_records_nothing():
+    assert trace.active() is None and trace.config() is None
+    with trace.span("load") as a, trace.span("network") as b:
+        trace.count("hits")
+    assert a is b
+
+
+def test_spans_nest_and_attribute_their_own_peak(tracing):
+    tracer = tracing("tracemalloc")
+    with trace.span("outer", map="x"):
+        with trace.span("inner"):
+            block = np.ones(4 << 20, dtype=np.uint8)
+            del block
+        trace.count("hits", 2)
+        trace.count("hits")
+    inner, outer = [e for e in tracer.events if e["ph"] == "X"]
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert outer["args"]["map"] == "x"
+    assert outer["ts"] <= inner["ts"] and inner["dur"] <= outer["dur"]
+    # The child's allocation shows in both peaks, though it was freed before the parent ended
+    assert inner["args"]["peak_mb"] >= 4 and outer["args"]["peak_mb"] >= 4
+    assert tracer.counters == {"hits": 3}
+    assert [e["args"]["hits"] for e in tracer.events if e["ph"] == "C"] == [2, 3]
+
+
+def test_worker_payloads_merge_into_the_export(tracing, tmp_path):
+    tracer = tracing()
+    assert trace.config() == {"memory": "rss"}
+    worker = trace.Tracer()
+    worker.pid = tracer.pid + 1
+    with worker.span("tile", {}):
+        worker.count("tiles", 5)
+    tracer.count("tiles", 1)
+    tracer.extend(worker.drain())
+    assert worker.events == [] and worker.counters == {}
+    assert tracer.counters == {"tiles": 6}
+
+    data = json.loads(open(tracer.write_chrome(tmp_path / "t.json")).read())
+    names = {e["args"]["name"] for e in data["traceEvents"] if e["ph"] == "M"}
+    assert names == {"railnet", f"worker {worker.pid}"}
+    assert data["otherData"]["counters"] == {"tiles": 6}
+    summary = tracer.summary().splitlines()
+    assert summary[1].split()[:2] == ["tile", "1"]
+    assert summary[-1].split() == ["tiles", "6"]
+
+
+def test_unknown_memory_mode_is_rejected():
+    with pytest.raises(ValueError):
+        trace.Tracer("psutil")
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pytest
+
+from railnet.geodesy import haversine_km
+from railnet.tracks import CANDIDATES, SNAP_KM, rail_graph, snap_segments
+
+
+@pytest.fixture(scope="module")
+def grid(tmp_path_factory):
+    """A jittered 20 x 20 rail grid (~1.7 km spacing) with a fifth of its edges missing."""
+    rng = np.random.default_rng(0)
+    n = 20
+    lat = 25 + np.arange(n)[:, None] * 0.015 + rng.normal(0, 0.003, (n, n))
+    lon = 75 + np.arange(n)[None, :] * 0.015 + rng.normal(0, 0.003, (n, n))
+    features = []
+    for i in range(n):
+        for j in range(n):
+            for di, dj in ((0, 1), (1, 0)):
+                if i + di < n and j + dj < n and rng.random() < 0.8:
+                    line = [[lon[i, j], lat[i, j]], [lon[i + di, j + dj], lat[i + di, j + dj]]]
+                    features.append({"type": "Feature", "properties": {"railway": "rail"},
+                                     "geometry": {"type": "LineString", "coordinates": line}})
+    path = tmp_path_factory.mktemp("tracks") / "grid.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return rail_graph(path, use_cache=False)
+
+
+def _brute_force_km(rail, a, b):
+    """Shortest station -> track -> station km over all candidate node pairs."""
+    from scipy.sparse.csgraph import dijkstra
+
+    s_km, s_ids = (np.ravel(x) for x in rail.index.nearest(*a, k=CANDIDATES, max_km=SNAP_KM))
+    t_km, t_ids = (np.ravel(x) for x in rail.index.nearest(*b, k=CANDIDATES, max_km=SNAP_KM))
+    s, t = s_ids >= 0, t_ids >= 0
+    dist = dijkstra(rail.graph, indices=s_ids[s])[:, t_ids[t]]
+    return (s_km[s][:, None] + dist + t_km[t][None, :]).min()
+
+
+def test_snapped_paths_are_shortest(grid):
+    rng = np.random.default_rng(1)
+    m = 40
+    a_lat, a_lon = rng.uniform(25, 25.28, m), rng.uniform(75, 75.28, m)
+    b_lat, b_lon = rng.uniform(25, 25.28, m), rng.uniform(75, 75.28, m)
+    offsets, lon, lat, snapped = snap_segments(grid, a_lat, a_lon, b_lat, b_lon, workers=1,
+                                               use_cache=False)
+    assert snapped.all()
+    for i in range(m):
+        x, y = lon[offsets[i]:offsets[i + 1]], lat[offsets[i]:offsets[i + 1]]
+        assert (y[0], x[0]) == (a_lat[i], a_lon[i]) and (y[-1], x[-1]) == (b_lat[i], b_lon[i])
+        km = haversine_km(y[:-1], x[:-1], y[1:], x[1:]).sum()
+        expected = _brute_force_km(grid, ([a_lat[i]], [a_lon[i]]), ([b_lat[i]], [b_lon[i]]))
+        assert km == pytest.approx(expected, rel=1e-9)
+
+
+def test_pairs_snap_in_either_direction(grid):
+    a, b = (25.05, 75.05), (25.2, 75.22)
+    forward = snap_segments(grid, [a[0]], [a[1]], [b[0]], [b[1]], workers=1, use_cache=False)
+    backward = snap_segments(grid, [b[0]], [b[1]], [a[0]], [a[1]], workers=1, use_cache=False)
+    np.testing.assert_array_equal(forward[1], backward[1][::-1])
+    np.testing.assert_array_equal(forward[2], backward[2][::-1])
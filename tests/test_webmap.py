@@ -0,0 +1,62 @@
+import dataclasses
+import json
+import re
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from railnet.webmap import QUANTUM_DEG, encode, export_html
+
+# Just enough of Leaflet to run the page script and record what it draws
+FAKE_LEAFLET = """
+const out={markers:[]};
+const layer={addTo(){return this}};
+globalThis.innerWidth=1024;
+globalThis.L={
+  map:()=>({fitBounds(b){out.bounds=b;return this}}),
+  tileLayer:()=>layer, polyline:()=>layer, layerGroup:()=>layer,
+  control:{layers:()=>layer},
+  circleMarker:()=>{const m={bindPopup(f){m.popup=f;return m}};out.markers.push(m);return m},
+};
+"""
+
+
+def test_encoded_stations_decode_within_half_a_quantum(network):
+    data = encode(network)
+    lon0, lat0 = data["transform"]["translate"]
+    lon = lon0 + np.cumsum(data["stations"]["x"]) * QUANTUM_DEG
+    lat = lat0 + np.cumsum(data["stations"]["y"]) * QUANTUM_DEG
+    idx = np.searchsorted(network.station_name, data["stations"]["name"])
+    assert np.abs(lon - network.station_lon[idx]).max() <= QUANTUM_DEG / 2 + 1e-9
+    assert np.abs(lat - network.station_lat[idx]).max() <= QUANTUM_DEG / 2 + 1e-9
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_page_fits_bounds_and_escapes_popups(network, tmp_path):
+    evil = "<img src=x onerror=alert(1)>"
+    names = network.name.astype(object)
+    names[0] = evil
+    network = dataclasses.replace(network, name=names.astype(str))
+    path = export_html(network, tmp_path / "map.html", title="A & B")
+    html = path.read_text(encoding="utf-8")
+    assert "<title>A &amp; B</title>" in html
+    script = re.search(r"<script>\n(.*)</script>", html, re.S).group(1)
+    first = network.route_station_ids(0)[0]
+    js = (FAKE_LEAFLET + script
+          + "const popups=out.markers.map(m=>m.popup());"
+          + "console.log(JSON.stringify({bounds:out.bounds,popups}));")
+    result = json.loads(subprocess.run(["node", "-e", js], capture_output=True, text=True,
+                                       check=True).stdout)
+
+    (lat0, lon0), (lat1, lon1) = result["bounds"]
+    tol = QUANTUM_DEG / 2 + 1e-9
+    assert abs(lat0 - network.station_lat.min()) <= tol
+    assert abs(lon1 - network.station_lon.max()) <= tol
+    assert abs(lat1 - network.station_lat.max()) <= tol
+    assert abs(lon0 - network.station_lon.min()) <= tol
+    popups = result["popups"]
+    assert not any(evil in p for p in popups)
+    station = encode(network)["stations"]["name"].index(network.station_name[first])
+    assert "&#60;img src=x onerror=alert(1)&#62;" in popups[station]